@@ -0,0 +1,642 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmarks for the sheet sync and Hit List pipelines.
+
+Each benchmark generates a synthetic workload, seeds it into the local Sheets
+emulator (physical_stores/sheets_emulator.py) and runs a real entry point
+against it in its own subprocess:
+
+  generate_shop_list       generate_shop_list.main on a 10k-row Hit List
+  process_dapp_remarks     process_dapp_remarks.process_remarks on 5k remarks (full, then incremental)
+  content_schedule         ContentScheduleSyncer.run on a 5k-row schedule (initial sync, 1% edits, appends to a full sheet)
+  blog_schedule            sync_blog_schedule on a 5k-row blog schedule (initial sync, then re-sync)
+  feedback_status          FeedbackSyncer.upload_status_updates on 1k feedback rows
+  followup_events          create_followup_events.main on the 10k-row Hit List (first run, then no-op rerun)
+
+For every measured phase it records wall time, Sheets/Calendar API calls by
+method, bytes sent and received, the latency those calls would have cost
+(``--latency`` seconds each, accounted but not slept) and the process's peak
+RSS. Results are written as JSON to benchmarks/results/ so runs can be diffed,
+and ``--baseline`` fails the run when API calls or wall time regress.
+
+Usage:
+    python3 benchmarks/run_benchmarks.py                          # everything, full size
+    python3 benchmarks/run_benchmarks.py --scale 0.1 --only process_dapp_remarks
+    python3 benchmarks/run_benchmarks.py --baseline benchmarks/results/baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PHYSICAL_STORES_DIR = REPO_ROOT / "physical_stores"
+SOCIAL_MEDIA_DIR = REPO_ROOT / "online_content" / "agroverse_shop" / "social_media"
+BLOG_POST_DIR = REPO_ROOT / "online_content" / "agroverse_shop" / "blog_post"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Workload sizes at --scale 1
+HIT_LIST_ROWS = 10_000
+REMARK_ROWS = 5_000
+SCHEDULE_ROWS = 5_000
+FEEDBACK_ROWS = 1_000
+FOLLOW_UP_SHARE = 0.2  # share of Hit List rows with a Follow Up Date
+
+DEFAULT_LATENCY = 0.25  # seconds charged per emulated API call
+DEFAULT_TOLERANCE = 0.25  # allowed wall-time / bytes growth against a baseline
+
+HIT_LIST_SPREADSHEET_ID = "1eiqZr3LW-qEI6Hmy0Vrur_8flbRwxwA7jXVrbUnHbvc"
+CONTENT_SPREADSHEET_ID = "1ghZXeMqFq97Vl6yLKrtDmMQdQkd-4EN5yQs34NA_sBQ"
+CONTENT_SPREADSHEET_TITLE = "20250924 - Instagram Content Marketing Schedule"
+
+HIT_LIST_HEADERS = [
+    "Shop Name", "Status", "Priority", "Address", "City", "State", "Shop Type", "Phone", "Website",
+    "Email", "Instagram", "Notes", "Contact Date", "Contact Method", "Follow Up Date", "Contact Person",
+    "Owner Name", "Referral", "Product Interest", "Follow Up Event Link", "Visit Date", "Outcome",
+    "Sales Process Notes", "Latitude", "Longitude", "Status Updated By", "Status Updated Date",
+]
+REMARK_HEADERS = [
+    "Submission ID", "Shop Name", "Status", "Remarks", "Submitted By", "Submitted At", "Processed", "Processed At",
+]
+SCHEDULE_HEADERS = [
+    "primary_key", "status", "Week", "Date Range", "Theme Focus", "Post Day", "Day of Week", "Post Type",
+    "Theme", "Description", "Caption", "Hashtags", "CTA", "Tool Suggestions",
+]
+BLOG_HEADERS = [
+    "Wix Draft ID", "status", "Week", "Date Range", "Publish Date", "Day of Week", "Blog Title", "Theme",
+    "Target Word Count", "SEO Keywords", "Content Outline", "Instagram Tie-In", "CTA", "Internal Links",
+    "Tool Suggestions",
+]
+
+CITIES = [
+    ("San Francisco", "CA", 37.7749, -122.4194),
+    ("Oakland", "CA", 37.8044, -122.2712),
+    ("San Jose", "CA", 37.3382, -121.8863),
+    ("Santa Cruz", "CA", 36.9741, -122.0308),
+    ("San Luis Obispo", "CA", 35.2828, -120.6596),
+    ("Los Angeles", "CA", 34.0522, -118.2437),
+    ("Palm Springs", "CA", 33.8303, -116.5453),
+    ("Quartzsite", "AZ", 33.6639, -114.2299),
+]
+SHOP_TYPES = ["Metaphysical/Spiritual", "Tea House", "Chocolate Shop", "Health Food Store", "Cafe", "Farmers Market"]
+STATUSES = ["Research", "Shortlisted", "Contacted", "Follow Up", "Partnered", "Rejected"]
+POST_TYPES = ["Reel", "Carousel", "Story"]
+
+
+def scaled(count: int, scale: float) -> int:
+    return max(1, int(round(count * scale)))
+
+
+# ---------------------------------------------------------------------------
+# Synthetic workloads
+# ---------------------------------------------------------------------------
+
+def synthetic_shops(count: int, rng: random.Random) -> List[Dict]:
+    """Shops in the shop_catalog record format published by generate_shop_list."""
+    shops = []
+    for i in range(count):
+        city, state, _, _ = CITIES[i % len(CITIES)]
+        shops.append({
+            "name": f"Synthetic Shop {i:05d}",
+            "address": f"{rng.randint(1, 9999)} {rng.choice(['Main', 'Market', 'Oak', 'Pine', 'Ocean'])} St",
+            "city": city,
+            "state": state,
+            "type": rng.choice(SHOP_TYPES),
+            "notes": " ".join(rng.choice(["cacao", "tea", "crystals", "local", "organic", "gifts"]) for _ in range(12)),
+            "priority": rng.choice(["High", "Medium", "Low"]),
+            "status": rng.choice(STATUSES),
+        })
+    return shops
+
+
+def hit_list_grid(shops: List[Dict], rng: random.Random, follow_up_share: float = FOLLOW_UP_SHARE) -> List[List[str]]:
+    """Hit List worksheet values (header + one row per shop) with coordinates and follow-up dates."""
+    coords = {city: (lat, lng) for city, _, lat, lng in CITIES}
+    rows = [list(HIT_LIST_HEADERS)]
+    for shop in shops:
+        lat, lng = coords[shop["city"]]
+        values = {
+            "Shop Name": shop["name"],
+            "Status": shop["status"],
+            "Priority": shop["priority"],
+            "Address": shop["address"],
+            "City": shop["city"],
+            "State": shop["state"],
+            "Shop Type": shop["type"],
+            "Notes": shop["notes"],
+            "Latitude": f"{lat + rng.uniform(-0.2, 0.2):.6f}",
+            "Longitude": f"{lng + rng.uniform(-0.2, 0.2):.6f}",
+        }
+        if rng.random() < follow_up_share:
+            day = date(2026, 11, 1) + timedelta(days=rng.randint(0, 60))
+            values["Follow Up Date"] = f"{day.isoformat()} {rng.randint(9, 16)}:00"
+            values["Contact Person"] = f"Owner {rng.randint(1, 500)}"
+        rows.append([values.get(header, "") for header in HIT_LIST_HEADERS])
+    return rows
+
+
+def remark_rows(count: int, shop_names: List[str], rng: random.Random, start: int = 0) -> List[List[str]]:
+    """DApp Remarks submissions; roughly one in ten names a shop that isn't on the Hit List."""
+    rows = []
+    submitted = datetime(2026, 9, 1, tzinfo=timezone.utc)
+    for i in range(start, start + count):
+        name = rng.choice(shop_names) if rng.random() < 0.9 else f"Unlisted Shop {i:05d}"
+        rows.append([
+            f"SUB-{i:06d}",
+            name,
+            rng.choice(STATUSES),
+            f"Visited, spoke with staff about {rng.choice(['ceremonial cacao', 'cacao nibs', 'wholesale terms'])}.",
+            f"field-agent-{rng.randint(1, 20)}@truesight.me",
+            (submitted + timedelta(minutes=i)).isoformat(),
+            "",
+            "",
+        ])
+    return rows
+
+
+def schedule_rows(count: int, rng: random.Random, start: int = 0) -> List[Dict[str, str]]:
+    """Instagram content schedule rows; (Post Day, Post Type) is unique like the real schedule."""
+    rows = []
+    first_day = date(2025, 9, 28)
+    for i in range(start, start + count):
+        day = first_day + timedelta(days=i // len(POST_TYPES))
+        week = (day - first_day).days // 7 + 1
+        rows.append({
+            "primary_key": "",
+            "status": rng.choice(["", "SCHEDULED", "POSTED"]),
+            "Week": f"Week {week}",
+            "Date Range": f"{day:%b %d}-{day + timedelta(days=6):%b %d, %Y}",
+            "Theme Focus": rng.choice(["Fall Harvest", "Farmer Stories", "Recipes", "Ceremony"]),
+            "Post Day": day.strftime("%Y%m%d"),
+            "Day of Week": day.strftime("%A"),
+            "Post Type": POST_TYPES[i % len(POST_TYPES)],
+            "Theme": rng.choice(["Behind-the-Scenes", "Education", "Community", "Product"]),
+            "Description": f"Synthetic post {i} about the cacao farm and our partner shops.",
+            "Caption": f"Caption {i}: " + " ".join(rng.choice(["cacao", "farm", "harvest", "ritual"]) for _ in range(30)),
+            "Hashtags": " ".join(f"#{tag}" for tag in rng.sample(["cacao", "agroverse", "regenerative", "bahia", "amazon", "chocolate"], 4)),
+            "CTA": "Shop ceremonial cacao at agroverse.shop",
+            "Tool Suggestions": "Canva; CapCut",
+        })
+    return rows
+
+
+def blog_rows(count: int, rng: random.Random) -> List[Dict[str, str]]:
+    rows = []
+    first_day = date(2025, 10, 6)
+    for i in range(count):
+        day = first_day + timedelta(days=i)
+        rows.append({
+            "Wix Draft ID": f"{rng.getrandbits(128):032x}",
+            "status": rng.choice(["", "DRAFTED", "SCHEDULED"]),
+            "Week": f"Week {i // 7 + 1}",
+            "Date Range": f"{day:%b %d, %Y}",
+            "Publish Date": day.strftime("%Y%m%d"),
+            "Day of Week": day.strftime("%A"),
+            "Blog Title": f"Synthetic Blog Post {i}: Notes From the Cacao Farm",
+            "Theme": rng.choice(["Cacao Education", "Farmer Stories", "Recipes"]),
+            "Target Word Count": "1800-2000",
+            "SEO Keywords": "ceremonial cacao, fine flavor cacao, regenerative farming",
+            "Content Outline": " / ".join(f"{n}. Section {n}" for n in range(1, 9)),
+            "Instagram Tie-In": "Reel from the farm walk",
+            "CTA": "Shop our fine flavor collection",
+            "Internal Links": "Bahia cacao products; About Our Farmers",
+            "Tool Suggestions": "Wix; Wix SEO Wiz",
+        })
+    return rows
+
+
+def write_csv(path: Path, headers: List[str], rows: List[Dict[str, str]]) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=headers)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+# ---------------------------------------------------------------------------
+# Child-process harness
+# ---------------------------------------------------------------------------
+
+def peak_rss_kb() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes
+
+
+class FakeCalendarService:
+    """Calendar v3 stand-in: answers batched events.update/insert and charges them to the emulator stats."""
+
+    def __init__(self, client):
+        self.client = client
+        self.events_by_id: Dict[str, dict] = {}
+
+    def events(self) -> "FakeCalendarService":
+        return self
+
+    def update(self, calendarId: str, eventId: str, body: dict):
+        return ("update", eventId, body)
+
+    def insert(self, calendarId: str, body: dict):
+        return ("insert", body["id"], body)
+
+    def new_batch_http_request(self, callback: Callable) -> "_FakeBatch":
+        return _FakeBatch(self, callback)
+
+
+class _FakeBatch:
+    def __init__(self, service: FakeCalendarService, callback: Callable):
+        self.service = service
+        self.callback = callback
+        self.requests: List = []
+
+    def add(self, request, request_id: str) -> None:
+        self.requests.append((request_id, request))
+
+    def execute(self) -> None:
+        import httplib2
+        from googleapiclient.errors import HttpError
+
+        stats = self.service.client.stats
+        stats.calls["calendar.batch"] += 1
+        stats.bytes_sent += len(json.dumps([body for _, (_, _, body) in self.requests]))
+        stats.simulated_seconds += self.service.client.latency
+        for request_id, (kind, event_id, body) in self.requests:
+            if kind == "update" and event_id not in self.service.events_by_id:
+                self.callback(request_id, None, HttpError(httplib2.Response({"status": "404"}), b"Not Found"))
+                continue
+            self.service.events_by_id[event_id] = body
+            response = {"id": event_id, "htmlLink": f"https://calendar.google.com/event?eid={event_id}"}
+            stats.bytes_received += len(json.dumps(response))
+            self.callback(request_id, response, None)
+
+
+class BenchContext:
+    """Workspace, seeded emulator and per-phase measurements for one benchmark run."""
+
+    def __init__(self, workspace: Path, scale: float, latency: float, seed: int):
+        sys.path[:0] = [str(PHYSICAL_STORES_DIR), str(SOCIAL_MEDIA_DIR), str(BLOG_POST_DIR)]
+        from sheets_emulator import EmulatedClient
+
+        self.workspace = workspace
+        self.scale = scale
+        self.rng = random.Random(seed)
+        self.client = EmulatedClient(workspace / "sheets.sqlite", latency=latency)
+        # State files and caches (snapshots, geocodes, clusters, drive times) go to the workspace
+        os.environ["PHYSICAL_STORES_CACHE_DIR"] = str(workspace)
+        os.environ["SHEET_SNAPSHOT_CACHE"] = "1"
+        self.phases: Dict[str, Dict] = {}
+        self.workload: Dict[str, int] = {}
+        (workspace / "google_credentials.json").write_text("{}")
+
+    def use_emulator_for_physical_stores(self) -> None:
+        """Point google_clients at this run's emulator before any script is imported."""
+        import google_clients
+
+        google_clients.get_sheets_client = lambda *args, **kwargs: self.client
+        calendar = FakeCalendarService(self.client)
+        google_clients.get_calendar_service = lambda *args, **kwargs: calendar
+
+    @contextlib.contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Time one phase; only API calls made inside the block are counted."""
+        self.client.stats.reset()
+        output = io.StringIO()
+        rss_before = peak_rss_kb()
+        error = None
+        start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(output):
+                yield
+        except SystemExit as exc:
+            error = f"SystemExit({exc.code})"
+        wall = time.perf_counter() - start
+        error_lines = [line.strip() for line in output.getvalue().splitlines() if "❌" in line]
+        stats = self.client.stats.as_dict()
+        self.phases[phase] = {
+            "wall_seconds": round(wall, 3),
+            "api_calls": stats["total_calls"],
+            "calls": stats["calls"],
+            "bytes_sent": stats["bytes_sent"],
+            "bytes_received": stats["bytes_received"],
+            "simulated_api_seconds": stats["simulated_seconds"],
+            "projected_seconds": round(wall + stats["simulated_seconds"], 3),
+            "peak_rss_kb": peak_rss_kb(),
+            "peak_rss_before_kb": rss_before,
+            "error": error or (error_lines[0] if error_lines else None),
+        }
+
+
+def bench_generate_shop_list(ctx: BenchContext) -> None:
+    ctx.use_emulator_for_physical_stores()
+    import generate_shop_list as gsl
+
+    shops = synthetic_shops(scaled(HIT_LIST_ROWS, ctx.scale), ctx.rng)
+    ctx.workload["hit_list_rows"] = len(shops)
+    ctx.client.seed(HIT_LIST_SPREADSHEET_ID, {"Hit List": hit_list_grid(shops, ctx.rng), "DApp Remarks": [REMARK_HEADERS]})
+    catalog_path = ctx.workspace / "shops.jsonl"
+    with open(catalog_path, "w", encoding="utf-8") as handle:
+        handle.writelines(json.dumps(shop) + "\n" for shop in shops)
+    sys.argv = ["generate_shop_list.py", "--offline", "--geocoders", "local", "--catalog", str(catalog_path)]
+    with ctx.measure("regenerate"):
+        gsl.main()
+
+
+def bench_process_dapp_remarks(ctx: BenchContext) -> None:
+    ctx.use_emulator_for_physical_stores()
+    import process_dapp_remarks as pdr
+
+    shops = synthetic_shops(scaled(HIT_LIST_ROWS, ctx.scale), ctx.rng)
+    remarks = remark_rows(scaled(REMARK_ROWS, ctx.scale), [shop["name"] for shop in shops], ctx.rng)
+    ctx.workload.update(hit_list_rows=len(shops), remark_rows=len(remarks))
+    ctx.client.seed(HIT_LIST_SPREADSHEET_ID, {
+        "Hit List": hit_list_grid(shops, ctx.rng),
+        "DApp Remarks": [REMARK_HEADERS] + remarks,
+    })
+
+    with ctx.measure("full"):
+        pdr.process_remarks()
+
+    # A typical follow-up run: a handful of new submissions since the last one
+    from google_clients import open_worksheet
+
+    new_remarks = remark_rows(50, [shop["name"] for shop in shops], ctx.rng, start=len(remarks))
+    open_worksheet(ctx.client, HIT_LIST_SPREADSHEET_ID, "DApp Remarks").append_rows(new_remarks)
+    with ctx.measure("incremental"):
+        pdr.process_remarks()
+
+
+def seed_empty_worksheet(ctx: BenchContext, title: str, rows: int) -> None:
+    """Seed an empty content worksheet with room for the schedule (new sheets start at 1000 rows)."""
+    spreadsheet = ctx.client.seed(CONTENT_SPREADSHEET_ID, {title: []}, title=CONTENT_SPREADSHEET_TITLE)
+    spreadsheet.worksheet(title).resize(rows=max(rows, 1000))
+
+
+def bench_content_schedule(ctx: BenchContext) -> None:
+    from sheets_emulator import emulate_gspread
+
+    rows = schedule_rows(scaled(SCHEDULE_ROWS, ctx.scale), ctx.rng)
+    ctx.workload["schedule_rows"] = len(rows)
+    csv_path = ctx.workspace / "agroverse_schedule_till_easter_cleaned.csv"
+    write_csv(csv_path, SCHEDULE_HEADERS, rows)
+    seed_empty_worksheet(ctx, "Instagram Content Schedule", rows=len(rows) * 2)
+
+    with emulate_gspread(ctx.client):
+        import sync_content_schedule
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            syncer = sync_content_schedule.ContentScheduleSyncer()
+        with ctx.measure("initial_sync"):
+            syncer.run()
+
+        # Edit ~1% of rows, drop a few and schedule a few new ones
+        for row in ctx.rng.sample(rows, max(1, len(rows) // 100)):
+            row["Caption"] += " (edited)"
+        for _ in range(min(5, len(rows) - 1)):
+            rows.pop(ctx.rng.randrange(len(rows)))
+        rows.extend(schedule_rows(10, ctx.rng, start=SCHEDULE_ROWS * 3))
+        write_csv(csv_path, SCHEDULE_HEADERS, rows)
+        with ctx.measure("resync_1pct"):
+            syncer.run()
+
+        # A sheet sized exactly to its data (deleteDimension leaves it so) gets new trailing rows
+        worksheet = ctx.client.open_by_key(CONTENT_SPREADSHEET_ID).worksheet("Instagram Content Schedule")
+        worksheet.resize(rows=len(rows) + 1)
+        rows.extend(schedule_rows(25, ctx.rng, start=SCHEDULE_ROWS * 4))
+        write_csv(csv_path, SCHEDULE_HEADERS, rows)
+        with ctx.measure("append_full_sheet"):
+            syncer.run()
+        synced = len(worksheet.get_all_values()) - 1
+        if synced != len(rows) and not ctx.phases["append_full_sheet"]["error"]:
+            ctx.phases["append_full_sheet"]["error"] = f"{synced} of {len(rows)} rows in the sheet"
+
+
+def bench_blog_schedule(ctx: BenchContext) -> None:
+    from sheets_emulator import emulate_gspread
+
+    rows = blog_rows(scaled(SCHEDULE_ROWS, ctx.scale), ctx.rng)
+    ctx.workload["blog_rows"] = len(rows)
+    write_csv(ctx.workspace / "blog_schedule.csv", BLOG_HEADERS, rows)
+    seed_empty_worksheet(ctx, "Agroverse Blog Content Schedule", rows=len(rows) * 2)
+
+    with emulate_gspread(ctx.client):
+        import sync_blog_schedule
+
+        with ctx.measure("initial_sync"):
+            sync_blog_schedule.sync_blog_schedule()
+        with ctx.measure("resync"):
+            sync_blog_schedule.sync_blog_schedule()
+
+
+def bench_feedback_status(ctx: BenchContext) -> None:
+    from sheets_emulator import emulate_gspread
+
+    count = scaled(FEEDBACK_ROWS, ctx.scale)
+    ctx.workload["feedback_rows"] = count
+    feedback = [f"Feedback {i}: loved the {ctx.rng.choice(['reel', 'carousel', 'story'])} about the farm" for i in range(count)]
+    ctx.client.seed(CONTENT_SPREADSHEET_ID, {
+        "Feedback on Content": [["feedback", "status", "submitted_at"]]
+        + [[text, "", f"2026-09-{i % 28 + 1:02d}"] for i, text in enumerate(feedback)],
+    }, title=CONTENT_SPREADSHEET_TITLE)
+    csv_path = ctx.workspace / "community_feedback.csv"
+    write_csv(csv_path, ["feedback", "status"], [
+        {"feedback": text, "status": ctx.rng.choice(["Reviewed", "Actioned", "Ignored"])} for text in feedback
+    ])
+
+    with emulate_gspread(ctx.client):
+        import sync_feedback
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            syncer = sync_feedback.FeedbackSyncer()
+        with ctx.measure("upload_status"):
+            if not syncer.upload_status_updates(str(csv_path)):
+                print("❌ upload_status_updates returned False")
+
+
+def bench_followup_events(ctx: BenchContext) -> None:
+    ctx.use_emulator_for_physical_stores()
+    import create_followup_events as cfe
+
+    os.environ["GOOGLE_CALENDAR_ID"] = "benchmark@group.calendar.google.com"
+
+    shops = synthetic_shops(scaled(HIT_LIST_ROWS, ctx.scale), ctx.rng)
+    grid = hit_list_grid(shops, ctx.rng)
+    ctx.workload.update(hit_list_rows=len(shops), follow_ups=sum(1 for row in grid[1:] if row[14]))
+    ctx.client.seed(HIT_LIST_SPREADSHEET_ID, {"Hit List": grid})
+
+    sys.argv = ["create_followup_events.py"]
+    with ctx.measure("first_run"):
+        cfe.main()
+    with ctx.measure("unchanged_rerun"):
+        cfe.main()
+
+
+BENCHMARKS: Dict[str, Callable[[BenchContext], None]] = {
+    "generate_shop_list": bench_generate_shop_list,
+    "process_dapp_remarks": bench_process_dapp_remarks,
+    "content_schedule": bench_content_schedule,
+    "blog_schedule": bench_blog_schedule,
+    "feedback_status": bench_feedback_status,
+    "followup_events": bench_followup_events,
+}
+
+
+def run_child(name: str, result_file: Path, scale: float, latency: float, seed: int) -> None:
+    """Run one benchmark in this (fresh) process and write its result as JSON."""
+    workspace = Path(tempfile.mkdtemp(prefix=f"bench_{name}_"))
+    os.chdir(workspace)
+    result: Dict = {"name": name, "status": "ok"}
+    try:
+        ctx = BenchContext(workspace, scale, latency, seed)
+        try:
+            BENCHMARKS[name](ctx)
+        finally:
+            result.update(workload=ctx.workload, phases=ctx.phases)
+        errors = [phase for phase, metrics in ctx.phases.items() if metrics["error"]]
+        if errors:
+            result["status"] = "error"
+            result["error"] = "; ".join(f"{phase}: {ctx.phases[phase]['error']}" for phase in errors)
+    except Exception as exc:  # reported in the results file, not raised
+        result["status"] = "error"
+        result["error"] = f"{type(exc).__name__}: {exc}"
+    finally:
+        result["peak_rss_kb"] = peak_rss_kb()
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workspace, ignore_errors=True)
+    result_file.write_text(json.dumps(result, indent=2))
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(name: str, args: argparse.Namespace) -> Dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        result_file = Path(tmp) / "result.json"
+        command = [
+            sys.executable, str(Path(__file__).resolve()), "--child", name, "--result-file", str(result_file),
+            "--scale", str(args.scale), "--latency", str(args.latency), "--seed", str(args.seed),
+        ]
+        try:
+            completed = subprocess.run(command, capture_output=True, text=True, timeout=args.timeout)
+        except subprocess.TimeoutExpired:
+            return {"name": name, "status": "error", "error": f"timed out after {args.timeout}s"}
+        if not result_file.exists():
+            return {"name": name, "status": "error", "error": completed.stderr.strip()[-2000:] or "no result"}
+        return json.loads(result_file.read_text())
+
+
+def compare_to_baseline(results: List[Dict], baseline: Dict, tolerance: float) -> List[str]:
+    """Return human-readable regressions: any extra API call, or wall time / bytes beyond ``tolerance``."""
+    previous = {result["name"]: result for result in baseline.get("benchmarks", [])}
+    regressions = []
+    for result in results:
+        before = previous.get(result["name"])
+        if not before or before.get("status") != "ok":
+            continue
+        if result.get("status") != "ok":
+            regressions.append(f"{result['name']}: {result.get('error')}")
+            continue
+        for phase, now in result["phases"].items():
+            then = before.get("phases", {}).get(phase)
+            if not then:
+                continue
+            label = f"{result['name']}/{phase}"
+            if now["api_calls"] > then["api_calls"]:
+                regressions.append(f"{label}: API calls {then['api_calls']} -> {now['api_calls']}")
+            for metric in ("wall_seconds", "bytes_sent", "bytes_received"):
+                if then[metric] and now[metric] > then[metric] * (1 + tolerance):
+                    regressions.append(f"{label}: {metric} {then[metric]} -> {now[metric]}")
+    return regressions
+
+
+def print_table(results: List[Dict]) -> None:
+    print(f"{'benchmark/phase':<40} {'wall s':>8} {'calls':>7} {'sent KB':>9} {'recv KB':>9} {'API s':>8} {'RSS MB':>8}")
+    for result in results:
+        if result.get("status") != "ok":
+            print(f"{result['name']:<40} ❌ {result.get('error')}")
+            continue
+        for phase, metrics in result["phases"].items():
+            print(
+                f"{result['name'] + '/' + phase:<40} {metrics['wall_seconds']:>8.2f} {metrics['api_calls']:>7} "
+                f"{metrics['bytes_sent'] / 1024:>9.1f} {metrics['bytes_received'] / 1024:>9.1f} "
+                f"{metrics['simulated_api_seconds']:>8.1f} {metrics['peak_rss_kb'] / 1024:>8.1f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the sheet sync and Hit List pipelines against the Sheets emulator.")
+    parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS), help="Run only this benchmark (repeatable).")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every workload size (default: 1.0).")
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY, help="Seconds charged per API call (default: 0.25).")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the synthetic workloads (default: 1).")
+    parser.add_argument("--output", type=Path, help="Results file (default: benchmarks/results/benchmark-<timestamp>.json).")
+    parser.add_argument("--baseline", type=Path, help="Earlier results file; exit 1 if this run regresses against it.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed wall-time/bytes growth (default: 0.25).")
+    parser.add_argument("--timeout", type=int, default=1800, help="Per-benchmark timeout in seconds.")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.result_file, args.scale, args.latency, args.seed)
+        return
+
+    started_at = datetime.now(timezone.utc)
+    results = []
+    for name in args.only or list(BENCHMARKS):
+        print(f"⏱️  {name} ...", flush=True)
+        results.append(run_benchmark(name, args))
+
+    report = {
+        "started_at": started_at.isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {"scale": args.scale, "latency": args.latency, "seed": args.seed},
+        "benchmarks": results,
+    }
+    output = args.output or RESULTS_DIR / f"benchmark-{started_at:%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+
+    print()
+    print_table(results)
+    print(f"\n💾 Results written to {output}")
+
+    failed = [result["name"] for result in results if result.get("status") != "ok"]
+    regressions = []
+    if args.baseline:
+        regressions = compare_to_baseline(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"⚠️  Regression: {regression}")
+        if not regressions:
+            print(f"✅ No regressions against {args.baseline}")
+    if failed or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
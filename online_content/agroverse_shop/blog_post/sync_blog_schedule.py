@@ -6,7 +6,7 @@ Based on the Instagram content schedule sync system
 """
 
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from google.oauth2.service_account import Credentials
 import pandas as pd
 import hashlib
 import json
@@ -22,7 +22,7 @@ CSV_FILE = 'blog_schedule.csv'
 def connect_to_sheets():
     """Connect to Google Sheets"""
     try:
-        creds = ServiceAccountCredentials.from_json_keyfile_name(CREDS_FILE, SCOPE)
+        creds = Credentials.from_service_account_file(CREDS_FILE, scopes=SCOPE)
         client = gspread.authorize(creds)
         spreadsheet = client.open(SPREADSHEET_NAME)
         print(f"✅ Successfully connected to Google Sheets: {SPREADSHEET_NAME}")
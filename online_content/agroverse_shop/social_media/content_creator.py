@@ -4,11 +4,14 @@ Content Creator Interface - Easy access to hybrid content generation
 Combines systematic planning with Grok's creative ideation
 """
 
+import argparse
 import sys
 import json
 import os
 from datetime import datetime
 from dotenv import load_dotenv
+from grok_cache import CACHE_ENABLED
+from grok_client import OFFLINE
 from grok_content_generator import GrokContentGenerator
 from hybrid_content_workflow import HybridContentWorkflow
 
@@ -16,12 +19,12 @@ from hybrid_content_workflow import HybridContentWorkflow
 load_dotenv()
 
 class ContentCreator:
-    def __init__(self):
+    def __init__(self, use_cache=CACHE_ENABLED, refresh=False, offline=OFFLINE):
         self.api_key = os.getenv("GROK_API_KEY")
-        if not self.api_key:
+        if not self.api_key and not offline:
             raise ValueError("GROK_API_KEY not found in environment variables. Please set it in your .env file.")
-        self.grok = GrokContentGenerator(self.api_key)
-        self.workflow = HybridContentWorkflow(self.api_key)
+        self.grok = GrokContentGenerator(self.api_key, use_cache=use_cache, refresh=refresh, offline=offline)
+        self.workflow = HybridContentWorkflow(self.api_key, grok=self.grok)
     
     def show_menu(self):
         """Display the main menu"""
@@ -64,19 +67,18 @@ class ContentCreator:
                 context = input("Additional context (optional): ").strip()
                 
                 print(f"\n🤖 Generating creative ideas for '{theme}' {post_type}...")
-                ideas = self.grok.generate_content_ideas(theme, post_type, context)
+                print("\n✅ CREATIVE IDEAS:")
+                print("=" * 40)
+                
+                # Stream to the terminal and the file as tokens arrive
+                filename = f"creative_ideas_{theme.lower().replace('-', '_')}_{datetime.now().strftime('%Y%m%d_%H%M')}.txt"
+                ideas = self._stream_to_file(
+                    filename,
+                    f"Creative Ideas for {theme} {post_type}\n" + "=" * 50 + "\n\n",
+                    lambda on_token: self.grok.generate_content_ideas(theme, post_type, context, on_token=on_token)
+                )
                 
                 if ideas:
-                    print("\n✅ CREATIVE IDEAS GENERATED:")
-                    print("=" * 40)
-                    print(ideas)
-                    
-                    # Save to file
-                    filename = f"creative_ideas_{theme.lower().replace('-', '_')}_{datetime.now().strftime('%Y%m%d_%H%M')}.txt"
-                    with open(filename, 'w') as f:
-                        f.write(f"Creative Ideas for {theme} {post_type}\n")
-                        f.write("=" * 50 + "\n\n")
-                        f.write(ideas)
                     print(f"\n💾 Ideas saved to: {filename}")
                 else:
                     print("❌ Failed to generate ideas")
@@ -95,19 +97,17 @@ class ContentCreator:
             trends = "sustainability, farm-to-table, authentic storytelling, regenerative agriculture"
         
         print(f"\n🤖 Generating trending content ideas...")
-        trending = self.grok.generate_trending_content(trends)
+        print("\n✅ TRENDING IDEAS:")
+        print("=" * 40)
+        
+        filename = f"trending_ideas_{datetime.now().strftime('%Y%m%d_%H%M')}.txt"
+        trending = self._stream_to_file(
+            filename,
+            "Trending Content Ideas\n" + "=" * 30 + "\n\n",
+            lambda on_token: self.grok.generate_trending_content(trends, on_token=on_token)
+        )
         
         if trending:
-            print("\n✅ TRENDING IDEAS GENERATED:")
-            print("=" * 40)
-            print(trending)
-            
-            # Save to file
-            filename = f"trending_ideas_{datetime.now().strftime('%Y%m%d_%H%M')}.txt"
-            with open(filename, 'w') as f:
-                f.write("Trending Content Ideas\n")
-                f.write("=" * 30 + "\n\n")
-                f.write(trending)
             print(f"\n💾 Ideas saved to: {filename}")
         else:
             print("❌ Failed to generate trending ideas")
@@ -129,24 +129,22 @@ class ContentCreator:
         
         if content.strip():
             print(f"\n🤖 Enhancing content with Grok...")
-            enhancement = self.grok.enhance_existing_content(content)
+            print("\n✅ CONTENT ENHANCEMENT:")
+            print("=" * 40)
+            
+            filename = f"content_enhancement_{datetime.now().strftime('%Y%m%d_%H%M')}.txt"
+            header = (
+                "Content Enhancement\n" + "=" * 25 + "\n\n" +
+                "Original Content:\n" + "-" * 20 + "\n" + content + "\n\n" +
+                "Enhanced Content:\n" + "-" * 20 + "\n"
+            )
+            enhancement = self._stream_to_file(
+                filename,
+                header,
+                lambda on_token: self.grok.enhance_existing_content(content, on_token=on_token)
+            )
             
             if enhancement:
-                print("\n✅ CONTENT ENHANCEMENT:")
-                print("=" * 40)
-                print(enhancement)
-                
-                # Save to file
-                filename = f"content_enhancement_{datetime.now().strftime('%Y%m%d_%H%M')}.txt"
-                with open(filename, 'w') as f:
-                    f.write("Content Enhancement\n")
-                    f.write("=" * 25 + "\n\n")
-                    f.write("Original Content:\n")
-                    f.write("-" * 20 + "\n")
-                    f.write(content + "\n\n")
-                    f.write("Enhanced Content:\n")
-                    f.write("-" * 20 + "\n")
-                    f.write(enhancement)
                 print(f"\n💾 Enhancement saved to: {filename}")
             else:
                 print("❌ Failed to enhance content")
@@ -163,19 +161,17 @@ class ContentCreator:
             season = input("Season (fall/spring/summer/winter): ").strip() or "fall"
             
             print(f"\n🤖 Generating themes for Week {week}...")
-            themes = self.grok.generate_week_themes(week, season)
+            print(f"\n✅ WEEK {week} THEMES:")
+            print("=" * 40)
+            
+            filename = f"weekly_themes_week_{week}_{datetime.now().strftime('%Y%m%d_%H%M')}.txt"
+            themes = self._stream_to_file(
+                filename,
+                f"Week {week} Themes ({season.title()})\n" + "=" * 40 + "\n\n",
+                lambda on_token: self.grok.generate_week_themes(week, season, on_token=on_token)
+            )
             
             if themes:
-                print(f"\n✅ WEEK {week} THEMES:")
-                print("=" * 40)
-                print(themes)
-                
-                # Save to file
-                filename = f"weekly_themes_week_{week}_{datetime.now().strftime('%Y%m%d_%H%M')}.txt"
-                with open(filename, 'w') as f:
-                    f.write(f"Week {week} Themes ({season.title()})\n")
-                    f.write("=" * 40 + "\n\n")
-                    f.write(themes)
                 print(f"\n💾 Themes saved to: {filename}")
             else:
                 print("❌ Failed to generate themes")
@@ -234,29 +230,71 @@ class ContentCreator:
         # Generate ideas for each core theme
         themes = ["Behind-the-Scenes", "Community Impact", "Regenerative Farming", "Cacao Education"]
         
-        all_ideas = []
-        for theme in themes:
-            print(f"\n🤖 Generating quick ideas for {theme}...")
-            ideas = self.grok.generate_content_ideas(theme, "Reel", "Quick, engaging content")
-            if ideas:
-                all_ideas.append(f"\n=== {theme.upper()} ===\n{ideas}")
+        print(f"\n🤖 Generating quick ideas for {', '.join(themes)}...")
+        requests = [self.grok.content_ideas_request(theme, "Reel", "Quick, engaging content") for theme in themes]
         
-        if all_ideas:
-            combined_ideas = "\n".join(all_ideas)
-            print("\n✅ QUICK CONTENT IDEAS:")
-            print("=" * 40)
-            print(combined_ideas)
-            
-            # Save to file
-            filename = f"quick_ideas_{datetime.now().strftime('%Y%m%d_%H%M')}.txt"
-            with open(filename, 'w') as f:
-                f.write("Quick Content Ideas\n")
-                f.write("=" * 25 + "\n\n")
-                f.write(combined_ideas)
-            print(f"\n💾 Ideas saved to: {filename}")
+        # Themes run concurrently; each section is printed and saved as soon as it is ready
+        filename = f"quick_ideas_{datetime.now().strftime('%Y%m%d_%H%M')}.txt"
+        generated = 0
+        with open(filename, 'w') as f:
+            f.write("Quick Content Ideas\n")
+            f.write("=" * 25 + "\n\n")
+            f.flush()
+            try:
+                for theme, ideas in zip(themes, self.grok.iter_batch(requests)):
+                    if not ideas:
+                        print(f"❌ Failed to generate quick ideas for {theme}")
+                        continue
+                    section = f"\n=== {theme.upper()} ===\n{ideas}\n"
+                    print(section)
+                    f.write(section)
+                    f.flush()
+                    generated += 1
+            except KeyboardInterrupt:
+                print("\n⚠️  Interrupted")
+        
+        if generated:
+            print(f"\n💾 {generated} of {len(themes)} themes saved to: {filename}")
         else:
+            os.remove(filename)
             print("❌ Failed to generate quick ideas")
     
+    def _stream_to_file(self, filename, header, generate):
+        """Run generate(on_token), echoing each token to the terminal and appending it to filename.
+        
+        The file is flushed after every token, so an interrupted or failed run
+        keeps whatever had arrived. Returns the text received, or None (and no
+        file) when nothing arrived.
+        """
+        received = []
+        
+        with open(filename, 'w') as f:
+            f.write(header)
+            f.flush()
+            
+            def on_token(token):
+                received.append(token)
+                print(token, end='', flush=True)
+                f.write(token)
+                f.flush()
+            
+            try:
+                generate(on_token)
+            except KeyboardInterrupt:
+                print("\n\n⚠️  Interrupted - keeping the partial output")
+        
+        if not received:
+            os.remove(filename)
+            return None
+        print()
+        return ''.join(received)
+    
+    def report_cache(self):
+        """Print this session's Grok response cache hit rate"""
+        summary = self.grok.cache_summary()
+        if summary:
+            print(f"\n📦 {summary}")
+    
     def run(self):
         """Main application loop"""
         while True:
@@ -280,6 +318,7 @@ class ContentCreator:
                 elif choice == "7":
                     self.quick_content_ideas()
                 elif choice == "8":
+                    self.report_cache()
                     print("\n👋 Goodbye! Happy content creating!")
                     break
                 else:
@@ -288,6 +327,7 @@ class ContentCreator:
                 input("\nPress Enter to continue...")
                 
             except KeyboardInterrupt:
+                self.report_cache()
                 print("\n\n👋 Goodbye! Happy content creating!")
                 break
             except Exception as e:
@@ -296,7 +336,17 @@ class ContentCreator:
 
 def main():
     """Main function"""
-    creator = ContentCreator()
+    parser = argparse.ArgumentParser(description="Agroverse hybrid content creator")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached Grok responses and fetch fresh ones (they still replace the cached copies)")
+    parser.add_argument("--no-cache", action="store_true", help="Don't read or write the Grok response cache")
+    parser.add_argument("--offline", action="store_true", help="Answer with the local Grok stand-in instead of the API (cached responses are still used)")
+    args = parser.parse_args()
+    
+    creator = ContentCreator(
+        use_cache=CACHE_ENABLED and not args.no_cache,
+        refresh=args.refresh,
+        offline=OFFLINE or args.offline
+    )
     creator.run()
 
 if __name__ == "__main__":
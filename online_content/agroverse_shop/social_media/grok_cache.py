@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Grok Response Cache
+
+Content-addressed SQLite cache for Grok completions. Each entry is keyed by a
+SHA-256 of the request that shapes the output: model, system prompt, user
+prompt, temperature and max_tokens. Re-running a content_creator.py menu or
+the hybrid workflow with the same theme, post type and context is then
+answered from disk instead of paying LLM latency and cost again.
+
+The cache is bounded by entry count and total response size. When it
+overflows, the least recently used entries are evicted first. Hit/miss counts
+are kept per process and also accumulated in the database.
+
+Usage:
+    python grok_cache.py stats     # entries, size and lifetime hit rate
+    python grok_cache.py clear     # drop every cached response
+
+Set GROK_CACHE=0 to disable the cache, or GROK_CACHE_PATH to move it.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_PATH = Path(os.getenv("GROK_CACHE_PATH", Path(__file__).parent / ".cache" / "grok_responses.sqlite"))
+CACHE_ENABLED = os.getenv("GROK_CACHE", "1") != "0"
+
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+def request_key(payload):
+    """SHA-256 of the parts of a chat-completions payload that determine the response"""
+    messages = {message['role']: message['content'] for message in payload.get('messages', [])}
+    identity = {
+        'model': payload.get('model'),
+        'system': messages.get('system', ''),
+        'prompt': messages.get('user', ''),
+        'temperature': payload.get('temperature'),
+        'max_tokens': payload.get('max_tokens')
+    }
+    return hashlib.sha256(json.dumps(identity, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class GrokResponseCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        # complete_many() reads and writes from worker threads
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                prompt_preview TEXT,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+            CREATE TABLE IF NOT EXISTS counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            """
+        )
+        self.conn.commit()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'refreshed': 0,
+            'stored': 0,
+            'evicted': 0
+        }
+
+    def get(self, key):
+        """Return the cached response text, or None on a miss"""
+        with self._lock:
+            row = self.conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._count('misses')
+                self.conn.commit()
+                return None
+            # Touch the entry so eviction sees it as recently used
+            self.conn.execute(
+                "UPDATE responses SET last_used = ?, hits = hits + 1 WHERE key = ?", (time.time(), key)
+            )
+            self._count('hits')
+            self.conn.commit()
+            return row[0]
+
+    def skip(self):
+        """Record a lookup bypassed by --refresh"""
+        with self._lock:
+            self._count('refreshed')
+            self.conn.commit()
+
+    def put(self, key, payload, response):
+        """Store a response, evicting least recently used entries beyond the size bounds"""
+        messages = {message['role']: message['content'] for message in payload.get('messages', [])}
+        preview = ' '.join(messages.get('user', '').split())[:120]
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, prompt_preview, response, size, created_at, last_used, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+                (key, payload.get('model'), preview, response, len(response.encode('utf-8')), now, now)
+            )
+            self._count('stored')
+            self._evict()
+
+    def _evict(self):
+        entries, total_bytes = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if entries <= self.max_entries and total_bytes <= self.max_bytes:
+            self.conn.commit()
+            return
+
+        doomed = []
+        for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+            if entries <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            doomed.append((key,))
+            entries -= 1
+            total_bytes -= size
+        self.conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        self._count('evicted', len(doomed))
+        self.conn.commit()
+
+    def _count(self, name, amount=1):
+        self.stats[name] += amount
+        self.conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount)
+        )
+
+    def hit_rate(self, stats=None):
+        stats = stats or self.stats
+        lookups = stats.get('hits', 0) + stats.get('misses', 0)
+        return stats.get('hits', 0) / lookups * 100 if lookups else 0.0
+
+    def stats_summary(self):
+        s = self.stats
+        return (
+            f"Grok cache: {s['hits']} hit(s), {s['misses']} miss(es), {s['refreshed']} refreshed, "
+            f"{s['stored']} stored, {s['evicted']} evicted ({self.hit_rate():.0f}% hit rate)"
+        )
+
+    def lifetime_stats(self):
+        """Entry count, size and counters accumulated across every run"""
+        with self._lock:
+            self.conn.commit()
+            entries, total_bytes = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            counters = dict(self.conn.execute("SELECT name, value FROM counters").fetchall())
+        return {'entries': entries, 'bytes': total_bytes, **counters}
+
+    def clear(self):
+        with self._lock:
+            self.conn.execute("DELETE FROM responses")
+            self.conn.execute("DELETE FROM counters")
+            self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
+
+
+def main():
+    """Show cache statistics or clear the cache"""
+    command = sys.argv[1] if len(sys.argv) > 1 else 'stats'
+    if command not in ('stats', 'clear'):
+        print("Usage: python grok_cache.py [stats|clear]")
+        sys.exit(1)
+
+    cache = GrokResponseCache()
+    if command == 'clear':
+        cache.clear()
+        print(f"🗑️  Cleared {cache.path}")
+    else:
+        stats = cache.lifetime_stats()
+        print(f"📦 Grok cache: {cache.path}")
+        print(f"  Entries: {stats['entries']} / {cache.max_entries}")
+        print(f"  Size: {stats['bytes'] / 1024:.1f} KB / {cache.max_bytes / 1024 / 1024:.0f} MB")
+        print(f"  Lifetime: {stats.get('hits', 0)} hit(s), {stats.get('misses', 0)} miss(es), "
+              f"{stats.get('refreshed', 0)} refreshed, {stats.get('evicted', 0)} evicted "
+              f"({cache.hit_rate(stats):.0f}% hit rate)")
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Grok API Client
+
+Shared chat-completions client for the Grok content tools. All calls go
+through one keep-alive requests.Session, and every request has a timeout.
+Rate limits (429) and server errors (5xx) are retried with exponential
+backoff. Batches of prompts fan out over a bounded thread pool, and results
+come back in the same order as the prompts. stream() uses the API's streaming
+mode and hands each token to a callback as it arrives.
+
+Usage:
+    from grok_client import GrokClient
+
+    client = GrokClient(api_key, max_concurrency=4)
+    text = client.complete(system_prompt, prompt, max_tokens=2000, temperature=0.8)
+    texts = client.complete_many([
+        {'system_prompt': system_prompt, 'prompt': p, 'max_tokens': 1500, 'temperature': 0.7}
+        for p in prompts
+    ])
+    text = client.stream(system_prompt, prompt, on_token=lambda token: print(token, end='', flush=True))
+
+    # Cached, or fully offline
+    client = GrokClient(api_key, cache=GrokResponseCache())
+    client = GrokClient(None, cache=GrokResponseCache(), transport=LocalGrokStandIn())
+
+Completions can be served from a GrokResponseCache (see grok_cache.py), and
+the HTTP session can be swapped for any object with a requests-style post().
+LocalGrokStandIn is one such transport. It answers deterministically without
+network access, so runs are reproducible offline.
+
+Environment overrides (all optional):
+    GROK_MAX_CONCURRENCY   parallel requests per client (default 4)
+    GROK_TIMEOUT           read timeout in seconds (default 120)
+    GROK_MAX_RETRIES       retries after the first attempt (default 4)
+    GROK_OFFLINE           set to 1 to use the local stand-in instead of the API
+"""
+
+import json
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from grok_cache import request_key
+
+GROK_API_URL = "https://api.x.ai/v1/chat/completions"
+DEFAULT_MODEL = "grok-3"
+
+# Responses worth retrying: rate limiting and transient server failures
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+OFFLINE = os.getenv("GROK_OFFLINE", "0") == "1"
+
+
+class StandInResponse:
+    """Just enough of requests.Response for GrokClient"""
+
+    def __init__(self, body, status_code=200, chunks=None):
+        self.status_code = status_code
+        self.headers = {}
+        self._body = body
+        self._chunks = chunks or []
+        self.text = json.dumps(body)
+
+    def json(self):
+        return self._body
+
+    def iter_lines(self, chunk_size=None):
+        """Server-sent events in the shape of the streaming chat-completions API"""
+        for chunk in self._chunks:
+            event = {'choices': [{'index': 0, 'delta': {'content': chunk}, 'finish_reason': None}]}
+            yield f"data: {json.dumps(event)}".encode('utf-8')
+            yield b""
+        yield b"data: [DONE]"
+
+    def close(self):
+        pass
+
+
+class LocalGrokStandIn:
+    """Offline transport that answers chat completions deterministically.
+
+    The reply is derived from a hash of the request, so the same prompt
+    always gets the same text. Its responses are never written to the
+    response cache, but cached real responses are still served when offline.
+    """
+
+    cacheable = False
+
+    def __init__(self):
+        self.calls = 0
+
+    def post(self, url, json=None, timeout=None, **kwargs):
+        self.calls += 1
+        messages = {message['role']: message['content'] for message in json.get('messages', [])}
+        lines = [line.strip() for line in messages.get('user', '').splitlines() if line.strip()]
+        digest = request_key(json)[:8]
+        heading = lines[0] if lines else 'Grok request'
+        points = [line for line in lines[1:] if line[:1].isdigit() or line.startswith('-')]
+        content = "\n".join(
+            [f"[offline stand-in {digest}] {heading}", ""] +
+            [f"{point} -> placeholder ({json.get('model')}, temperature {json.get('temperature')})" for point in points]
+        )
+        return StandInResponse({
+            'id': f"stand-in-{digest}",
+            'model': json.get('model'),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}]
+        }, chunks=re.findall(r"\S+\s*|\s+", content) if json.get('stream') else None)
+
+    def close(self):
+        pass
+
+
+class GrokClient:
+    def __init__(self, api_key, base_url=GROK_API_URL, model=DEFAULT_MODEL,
+                 max_concurrency=None, timeout=None, connect_timeout=10,
+                 max_retries=None, backoff=1.0, max_backoff=30.0,
+                 cache=None, refresh=False, transport=None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model = model
+        self.max_concurrency = max(1, int(max_concurrency or os.getenv("GROK_MAX_CONCURRENCY", 4)))
+        self.timeout = (connect_timeout, float(timeout or os.getenv("GROK_TIMEOUT", 120)))
+        self.max_retries = int(max_retries if max_retries is not None else os.getenv("GROK_MAX_RETRIES", 4))
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        # Optional GrokResponseCache; refresh skips lookups but still stores fresh responses
+        self.cache = cache
+        self.refresh = refresh
+
+        if transport is not None:
+            self.session = transport
+        else:
+            # One pooled keep-alive session shared by every call and worker thread
+            self.session = requests.Session()
+            self.session.headers.update({
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json"
+            })
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+        self.cacheable = getattr(self.session, 'cacheable', True)
+
+        # Caps in-flight requests across complete() and complete_many() callers
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release pooled connections and the cache"""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def build_payload(self, system_prompt, prompt, max_tokens=2000, temperature=0.8, model=None):
+        """Chat-completions request body for one system + user prompt"""
+        return {
+            "model": model or self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": max_tokens,
+            "temperature": temperature
+        }
+
+    def complete(self, system_prompt, prompt, max_tokens=2000, temperature=0.8, model=None, timeout=None):
+        """Return the completion text, or None once retries are exhausted"""
+        payload = self.build_payload(system_prompt, prompt, max_tokens, temperature, model)
+        key = request_key(payload) if self.cache is not None else None
+        if key:
+            if self.refresh:
+                self.cache.skip()
+            else:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    return cached
+
+        try:
+            result = self.post(payload, timeout=timeout)
+        except Exception as e:
+            print(f"Error calling Grok API: {e}")
+            return None
+        if result is None:
+            return None
+
+        content = result['choices'][0]['message']['content']
+        if key and self.cacheable:
+            self.cache.put(key, payload, content)
+        return content
+
+    def stream(self, system_prompt, prompt, max_tokens=2000, temperature=0.8, model=None, timeout=None, on_token=None):
+        """Like complete(), but passes each token to on_token as it arrives.
+
+        Returns the full text. If the stream breaks part-way, the text received
+        so far is returned and is not cached. A cache hit is delivered to
+        on_token in one piece.
+        """
+        payload = self.build_payload(system_prompt, prompt, max_tokens, temperature, model)
+        key = request_key(payload) if self.cache is not None else None
+        if key:
+            if self.refresh:
+                self.cache.skip()
+            else:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    if on_token:
+                        on_token(cached)
+                    return cached
+
+        payload["stream"] = True
+        try:
+            response = self.send(payload, timeout=timeout, stream=True)
+        except Exception as e:
+            print(f"Error calling Grok API: {e}")
+            return None
+        if response is None:
+            return None
+
+        parts = []
+        finished = False
+        try:
+            # Small reads so each event is handed over as soon as it arrives, even without chunked encoding
+            for line in response.iter_lines(chunk_size=64):
+                line = line.decode('utf-8') if isinstance(line, bytes) else line
+                if not line.startswith('data:'):
+                    continue
+                data = line[len('data:'):].strip()
+                if data == '[DONE]':
+                    finished = True
+                    break
+                delta = json.loads(data)['choices'][0].get('delta', {}).get('content')
+                if delta:
+                    parts.append(delta)
+                    if on_token:
+                        on_token(delta)
+            else:
+                # Some servers close the stream without a [DONE] marker
+                finished = True
+        except (requests.RequestException, ValueError) as e:
+            print(f"\n⚠️  Grok stream interrupted ({e.__class__.__name__}); keeping {len(parts)} chunk(s) received so far")
+        finally:
+            response.close()
+
+        content = ''.join(parts)
+        if finished and content and key and self.cacheable:
+            self.cache.put(key, payload, content)
+        return content or None
+
+    def complete_many(self, calls):
+        """Run many complete() calls concurrently; results keep the order of `calls`.
+
+        Each call is a dict of complete() keyword arguments. Failed calls come
+        back as None without cancelling the rest of the batch.
+        """
+        return list(self.iter_many(calls))
+
+    def iter_many(self, calls):
+        """Yield complete() results in the order of `calls`, each as soon as it and every earlier call has finished"""
+        calls = list(calls)
+        if not calls:
+            return
+        workers = min(self.max_concurrency, len(calls))
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="grok")
+        try:
+            futures = [pool.submit(self.complete, **call) for call in calls]
+            for future in futures:
+                yield future.result()
+        finally:
+            # Closed early (Ctrl+C, break): drop queued calls and don't wait for in-flight ones
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def post(self, payload, timeout=None):
+        """POST a payload with retries; returns the decoded JSON, or None on a non-retryable error"""
+        response = self.send(payload, timeout=timeout)
+        return response.json() if response is not None else None
+
+    def send(self, payload, timeout=None, stream=False):
+        """POST with retries; returns the 200 response, or None on a non-retryable error"""
+        attempt = 0
+        while True:
+            try:
+                with self._slots:
+                    response = self.session.post(self.base_url, json=payload, timeout=timeout or self.timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._delay(attempt)
+                print(f"⚠️  Grok request failed ({e.__class__.__name__}), retrying in {delay:.1f}s...")
+            else:
+                if response.status_code == 200:
+                    return response
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    print(f"Error: {response.status_code} - {response.text}")
+                    return None
+                delay = self._delay(attempt, response.headers.get("Retry-After"))
+                print(f"⚠️  Grok returned {response.status_code}, retrying in {delay:.1f}s...")
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def _delay(self, attempt, retry_after=None):
+        """Seconds to wait before the next attempt: Retry-After if given, else jittered exponential backoff"""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+        delay = min(self.backoff * (2 ** attempt), self.max_backoff)
+        return delay * random.uniform(0.5, 1.0)
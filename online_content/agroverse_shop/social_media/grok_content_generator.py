@@ -4,24 +4,33 @@ Grok Content Generator for Agroverse Instagram Content
 Hybrid approach combining systematic planning with creative ideation
 """
 
-import requests
 import json
 import pandas as pd
 from datetime import datetime
 import hashlib
 
+from grok_cache import CACHE_ENABLED, GrokResponseCache
+from grok_client import OFFLINE, GrokClient, LocalGrokStandIn
+from hashtag_engine import get_hashtag_engine
+
 class GrokContentGenerator:
-    def __init__(self, api_key):
+    def __init__(self, api_key, max_concurrency=None, timeout=None, max_retries=None,
+                 use_cache=CACHE_ENABLED, refresh=False, offline=OFFLINE):
         self.api_key = api_key
-        self.base_url = "https://api.x.ai/v1/chat/completions"
-        self.headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
+        self.client = GrokClient(
+            api_key,
+            max_concurrency=max_concurrency,
+            timeout=timeout,
+            max_retries=max_retries,
+            cache=GrokResponseCache() if use_cache else None,
+            refresh=refresh,
+            transport=LocalGrokStandIn() if offline else None
+        )
+        self.base_url = self.client.base_url
         
         # Load existing content patterns for context
         self.content_schedule = pd.read_csv('agroverse_schedule_till_easter.csv')
-        self.hashtags_db = pd.read_csv('instagram_hashtags.csv')
+        self.hashtags = get_hashtag_engine()
         
     def get_system_prompt(self):
         """System prompt that defines Grok's role in our hybrid approach"""
@@ -46,8 +55,14 @@ Current Date: September 2025
 
 Your creative ideas should complement our systematic content planning while adding fresh, engaging angles."""
 
-    def generate_content_ideas(self, theme, post_type, context=""):
+    def generate_content_ideas(self, theme, post_type, context="", on_token=None):
         """Generate creative content ideas using Grok"""
+        return self.run_request(self.content_ideas_request(theme, post_type, context), on_token)
+
+    def content_ideas_request(self, theme, post_type, context=""):
+        """Request for creative content ideas; pass a list of these to generate_batch()"""
+        
+        suggested = self.hashtags.recommend(theme=theme, text=context)
         
         prompt = f"""
         Generate 3 creative content ideas for Agroverse.shop Instagram {post_type} focusing on "{theme}".
@@ -58,41 +73,28 @@ Your creative ideas should complement our systematic content planning while addi
         1. Creative Hook/Title
         2. Detailed Description (2-3 sentences)
         3. Engaging Caption (with emojis, line breaks, and strong CTA)
-        4. 15-20 relevant hashtags (mix of general and targeted)
+        4. 15-20 relevant hashtags (mix of general and targeted), starting from these picks from our database:
+           General: {' '.join(suggested['General'])}
+           Targeted: {' '.join(suggested['Targeted'])}
         5. Suggested CTA
         6. Why this idea is engaging/unique
         
         Make it authentic, educational, and community-focused. Think about what would make someone stop scrolling and engage.
         """
         
-        try:
-            response = requests.post(
-                self.base_url,
-                headers=self.headers,
-                json={
-                    "model": "grok-3",
-                    "messages": [
-                        {"role": "system", "content": self.get_system_prompt()},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "max_tokens": 2000,
-                    "temperature": 0.8
-                }
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result['choices'][0]['message']['content']
-            else:
-                print(f"Error: {response.status_code} - {response.text}")
-                return None
-                
-        except Exception as e:
-            print(f"Error calling Grok API: {e}")
-            return None
+        return {
+            'system_prompt': self.get_system_prompt(),
+            'prompt': prompt,
+            'max_tokens': 2000,
+            'temperature': 0.8
+        }
 
-    def generate_trending_content(self, current_trends=""):
+    def generate_trending_content(self, current_trends="", on_token=None):
         """Generate content ideas based on current trends"""
+        return self.run_request(self.trending_content_request(current_trends), on_token)
+
+    def trending_content_request(self, current_trends=""):
+        """Request for trend-based content ideas; pass a list of these to generate_batch()"""
         
         prompt = f"""
         Generate 5 trending content ideas for Agroverse.shop that could go viral on Instagram.
@@ -117,34 +119,19 @@ Your creative ideas should complement our systematic content planning while addi
         Make it authentic to our brand while leveraging trending formats and topics.
         """
         
-        try:
-            response = requests.post(
-                self.base_url,
-                headers=self.headers,
-                json={
-                    "model": "grok-3",
-                    "messages": [
-                        {"role": "system", "content": self.get_system_prompt()},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "max_tokens": 2500,
-                    "temperature": 0.9
-                }
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result['choices'][0]['message']['content']
-            else:
-                print(f"Error: {response.status_code} - {response.text}")
-                return None
-                
-        except Exception as e:
-            print(f"Error calling Grok API: {e}")
-            return None
+        return {
+            'system_prompt': self.get_system_prompt(),
+            'prompt': prompt,
+            'max_tokens': 2500,
+            'temperature': 0.9
+        }
 
-    def enhance_existing_content(self, current_content):
+    def enhance_existing_content(self, current_content, on_token=None):
         """Enhance existing content with creative improvements"""
+        return self.run_request(self.enhance_content_request(current_content), on_token)
+
+    def enhance_content_request(self, current_content):
+        """Request for creative improvements to existing content; pass a list of these to generate_batch()"""
         
         prompt = f"""
         Review and enhance this existing Instagram content for Agroverse.shop:
@@ -162,34 +149,19 @@ Your creative ideas should complement our systematic content planning while addi
         Maintain the authentic, educational tone while making it more engaging and shareable.
         """
         
-        try:
-            response = requests.post(
-                self.base_url,
-                headers=self.headers,
-                json={
-                    "model": "grok-3",
-                    "messages": [
-                        {"role": "system", "content": self.get_system_prompt()},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "max_tokens": 1500,
-                    "temperature": 0.7
-                }
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result['choices'][0]['message']['content']
-            else:
-                print(f"Error: {response.status_code} - {response.text}")
-                return None
-                
-        except Exception as e:
-            print(f"Error calling Grok API: {e}")
-            return None
+        return {
+            'system_prompt': self.get_system_prompt(),
+            'prompt': prompt,
+            'max_tokens': 1500,
+            'temperature': 0.7
+        }
 
-    def generate_week_themes(self, week_number, season="fall"):
+    def generate_week_themes(self, week_number, season="fall", on_token=None):
         """Generate creative themes for a specific week"""
+        return self.run_request(self.week_themes_request(week_number, season), on_token)
+
+    def week_themes_request(self, week_number, season="fall"):
+        """Request for creative themes for a specific week; pass a list of these to generate_batch()"""
         
         prompt = f"""
         Generate creative weekly themes for Week {week_number} of Agroverse.shop's Instagram content (Fall 2025).
@@ -207,31 +179,30 @@ Your creative ideas should complement our systematic content planning while addi
         Make each theme unique but cohesive with our overall brand narrative.
         """
         
-        try:
-            response = requests.post(
-                self.base_url,
-                headers=self.headers,
-                json={
-                    "model": "grok-3",
-                    "messages": [
-                        {"role": "system", "content": self.get_system_prompt()},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "max_tokens": 2000,
-                    "temperature": 0.8
-                }
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result['choices'][0]['message']['content']
-            else:
-                print(f"Error: {response.status_code} - {response.text}")
-                return None
-                
-        except Exception as e:
-            print(f"Error calling Grok API: {e}")
-            return None
+        return {
+            'system_prompt': self.get_system_prompt(),
+            'prompt': prompt,
+            'max_tokens': 2000,
+            'temperature': 0.8
+        }
+
+    def run_request(self, request, on_token=None):
+        """Send one *_request(); with on_token the response is streamed token by token"""
+        if on_token:
+            return self.client.stream(**request, on_token=on_token)
+        return self.client.complete(**request)
+
+    def generate_batch(self, requests):
+        """Run many *_request() calls concurrently; results come back in the same order"""
+        return self.client.complete_many(requests)
+
+    def iter_batch(self, requests):
+        """generate_batch() that yields each result in order as soon as it is ready"""
+        return self.client.iter_many(requests)
+
+    def cache_summary(self):
+        """One-line response cache report, or None when caching is off"""
+        return self.client.cache.stats_summary() if self.client.cache is not None else None
 
 def main():
     """Test the Grok integration"""
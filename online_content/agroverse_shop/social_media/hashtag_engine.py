@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Hashtag Recommendation Engine
+
+Loads instagram_hashtags.csv once into an inverted index (by Type, Usage
+Category and word token) and mines a sparse co-occurrence matrix from the
+Hashtags column of the content schedule. Recommendations for a theme or post
+are then a few vector operations over ~500 tags instead of re-reading and
+filtering the CSV with pandas.
+
+Hashtags are written as one run of words (#cacaofarmlife), so each tag is split
+into words found in the schedule's own text and the category names; a theme
+like "Regenerative Farming" then matches #regenerativefarming, #farmlife, and so
+on. Tags that often appear together in past posts boost each other.
+
+Every recommended set respects the General/Targeted bounds in HASHTAG_LIMITS
+(the same guidelines FeedbackProcessor uses).
+
+Usage:
+    python hashtag_engine.py "Regenerative Farming"
+    python hashtag_engine.py "Recipes & Rituals" --existing "#cacao #cacaoceremony"
+    python hashtag_engine.py --related "#ceremonialcacao"
+"""
+
+import argparse
+import csv
+import math
+import os
+import re
+import sys
+import time
+import unicodedata
+from collections import Counter
+
+import numpy as np
+
+HASHTAGS_CSV = "instagram_hashtags.csv"
+SCHEDULE_CSV = "agroverse_schedule_till_easter_cleaned.csv"
+
+# Hashtag usage guidelines (see README "Hashtag Usage Guidelines")
+HASHTAG_LIMITS = {
+    'General': {'min': 3, 'max': 5},
+    'Targeted': {'min': 7, 'max': 10}
+}
+
+# Prior weight of the Notes column: how often a tag is meant to be used
+FREQUENCY_PRIOR = {
+    'core set': 0.3,
+    'high frequency': 0.2,
+    'medium frequency': 0.1
+}
+
+MATCH_WEIGHT = 2.0
+CATEGORY_WEIGHT = 0.25  # a theme word matching a Usage Category lifts the whole category a little
+COOCCURRENCE_WEIGHT = 1.0
+MIN_WORD_LENGTH = 3
+STOPWORDS = {
+    'the', 'and', 'for', 'with', 'our', 'from', 'that', 'this', 'your', 'you', 'are', 'how',
+    'what', 'why', 'who', 'about', 'into', 'all', 'its', 'their', 'his', 'her', 'was', 'will'
+}
+
+WORD_PATTERN = re.compile(r"[^\W\d_]+", re.UNICODE)
+TAG_PATTERN = re.compile(r"#[^\s#]+", re.UNICODE)
+
+
+def normalize_tag(tag):
+    """'#CacaoFarm' / 'cacaofarm' -> '#cacaofarm'"""
+    tag = unicodedata.normalize("NFC", str(tag).strip().lower())
+    if not tag:
+        return ""
+    return tag if tag.startswith('#') else f"#{tag}"
+
+
+def extract_tags(text):
+    """All hashtags in a Hashtags cell or caption, normalized, in order."""
+    return [normalize_tag(tag.rstrip('.,!?;:')) for tag in TAG_PATTERN.findall(str(text or ""))]
+
+
+STEM_SUFFIXES = ('ings', 'ing', 'ers', 'er', 'es', 's')
+
+
+def _stem(word):
+    """Crude suffix stripping so 'farming', 'farmers' and 'farms' all index as 'farm'."""
+    for suffix in STEM_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_WORD_LENGTH and not word.endswith('ss'):
+            return word[:-len(suffix)]
+    return word
+
+
+def text_words(text, stem=True):
+    """Lowercase content words of free text (stopwords dropped, suffixes stripped unless stem=False)."""
+    words = []
+    for word in WORD_PATTERN.findall(unicodedata.normalize("NFC", str(text or "")).lower()):
+        if len(word) >= MIN_WORD_LENGTH and word not in STOPWORDS:
+            words.append(_stem(word) if stem else word)
+    return words
+
+
+def segment(body, vocabulary):
+    """Split a hashtag body into known words, preferring long words ('cacaofarmlife' -> cacao, farm, life)."""
+    n = len(body)
+    best = [0] * (n + 1)
+    back = [None] * (n + 1)
+    for end in range(1, n + 1):
+        best[end], back[end] = best[end - 1], None  # skip one character
+        for start in range(max(0, end - 20), end - MIN_WORD_LENGTH + 1):
+            word = body[start:end]
+            if word in vocabulary and best[start] + len(word) ** 2 > best[end]:
+                best[end], back[end] = best[start] + len(word) ** 2, start
+    words = []
+    end = n
+    while end > 0:
+        if back[end] is None:
+            end -= 1
+        else:
+            words.append(body[back[end]:end])
+            end = back[end]
+    return words[::-1]
+
+
+class SparseMatrix:
+    """Minimal CSR matrix (numpy arrays) for the symmetric tag co-occurrence weights."""
+
+    def __init__(self, size, pairs):
+        rows = sorted(pairs.items())
+        self.indptr = np.zeros(size + 1, dtype=np.int64)
+        for (i, _), _ in rows:
+            self.indptr[i + 1] += 1
+        np.cumsum(self.indptr, out=self.indptr)
+        self.indices = np.array([j for (_, j), _ in rows], dtype=np.int64)
+        self.data = np.array([value for _, value in rows], dtype=float)
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def row(self, i):
+        """(column indices, values) of row i."""
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def add_rows_into(self, rows, out, scale=1.0):
+        """out += scale * sum of the given rows."""
+        for i in rows:
+            columns, values = self.row(i)
+            out[columns] += scale * values
+        return out
+
+
+class HashtagEngine:
+    def __init__(self, hashtags_csv=HASHTAGS_CSV, schedule_csv=SCHEDULE_CSV, limits=None):
+        self.limits = limits or HASHTAG_LIMITS
+        self.tags = []          # position -> '#tag'
+        self.types = []         # position -> 'General' / 'Targeted'
+        self.categories = []    # position -> Usage Category
+        self.notes = []
+        self.position = {}
+        self.by_type = {}
+        self.by_category = {}
+        self.by_token = {}      # token -> [positions]
+        self.token_weights = {} # token -> share of each tag's text the token covers (same order)
+        self._recommendations = {}
+
+        self._load_hashtags(hashtags_csv)
+        posts = self._load_posts(schedule_csv)
+        self._build_token_index(posts)
+        self._build_cooccurrence(posts)
+
+    def _load_hashtags(self, path):
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                tag = normalize_tag(row.get('Hashtag', ''))
+                if not tag or tag in self.position:
+                    continue  # first row wins on duplicates
+                tag_type = (row.get('Type') or '').strip()
+                category = (row.get('Usage Category') or '').strip()
+                self.position[tag] = len(self.tags)
+                self.tags.append(tag)
+                self.types.append(tag_type)
+                self.categories.append(category)
+                self.notes.append((row.get('Notes') or '').strip())
+                self.by_type.setdefault(tag_type, []).append(tag)
+                self.by_category.setdefault(category, []).append(tag)
+        self.type_masks = {
+            tag_type: np.array([t == tag_type for t in self.types], dtype=bool) for tag_type in self.by_type
+        }
+
+    def _load_posts(self, path):
+        """[(post words, [tag positions])] from the content schedule; empty if the file is missing."""
+        posts = []
+        if not path or not os.path.exists(path):
+            return posts
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                text = " ".join(str(row.get(column) or "") for column in ('Theme', 'Theme Focus', 'Description', 'Caption'))
+                text = TAG_PATTERN.sub(" ", text)  # words only; hashtags would segment as themselves
+                tags = [self.position[tag] for tag in dict.fromkeys(extract_tags(row.get('Hashtags')))
+                        if tag in self.position]
+                posts.append((text_words(text, stem=False), tags))
+        return posts
+
+    def _build_token_index(self, posts):
+        vocabulary = set()
+        for words, _ in posts:
+            vocabulary.update(words)
+        for category in self.by_category:
+            vocabulary.update(text_words(category, stem=False))
+        vocabulary.update([_stem(word) for word in vocabulary])
+
+        self.tokens = []
+        for position, tag in enumerate(self.tags):
+            body = tag[1:]
+            tokens = {body, _stem(body)}
+            tokens.update(_stem(word) for word in segment(body, vocabulary))
+            self.tokens.append(tokens)
+            for token in tokens:
+                self.by_token.setdefault(token, []).append(position)
+                # '#farmlife' is more about "life" than '#pastrycheflife' is
+                self.token_weights.setdefault(token, []).append(math.sqrt(min(1.0, len(token) / len(body))))
+        self.vocabulary = vocabulary
+        count = len(self.tags)
+        self.idf = {token: math.log(1 + count / len(positions)) for token, positions in self.by_token.items()}
+        self.token_weights = {token: np.array(weights) for token, weights in self.token_weights.items()}
+
+        # Category word -> positions of every tag in a category using that word
+        self.by_category_token = {}
+        for category, tags in self.by_category.items():
+            positions = [self.position[tag] for tag in tags]
+            for word in set(text_words(category)):
+                self.by_category_token.setdefault(word, []).extend(positions)
+
+    def _build_cooccurrence(self, posts):
+        size = len(self.tags)
+        frequency = np.zeros(size)
+        pairs = Counter()
+        for _, tags in posts:
+            for i in tags:
+                frequency[i] += 1
+            for a in range(len(tags)):
+                for b in range(a + 1, len(tags)):
+                    pairs[(tags[a], tags[b])] += 1
+                    pairs[(tags[b], tags[a])] += 1
+        # Cosine-normalized counts, so ubiquitous tags don't dominate every row
+        weights = {(i, j): count / math.sqrt(frequency[i] * frequency[j]) for (i, j), count in pairs.items()}
+        self.cooccurrence = SparseMatrix(size, weights)
+        self.frequency = frequency
+        usage = np.log1p(frequency) / (np.log1p(frequency.max()) or 1.0)
+        self.prior = np.array([FREQUENCY_PRIOR.get(note.lower(), 0.0) for note in self.notes]) + 0.1 * usage
+
+    def lookup(self, token):
+        """Tags indexed under a word token ('farm' -> #cacaofarm, #farmlife, ...)."""
+        return [self.tags[i] for i in self.by_token.get(_stem(token.lower()), ())]
+
+    def related(self, tag, limit=10):
+        """Tags most often used alongside ``tag`` in the schedule, with their weights."""
+        position = self.position.get(normalize_tag(tag))
+        if position is None:
+            return []
+        columns, values = self.cooccurrence.row(position)
+        order = np.argsort(-values)[:limit]
+        return [(self.tags[columns[i]], round(float(values[i]), 3)) for i in order]
+
+    def match_scores(self, text):
+        """Relevance of every tag to ``text`` (idf-weighted token matches, plus literal hashtags in it)."""
+        scores = np.zeros(len(self.tags))
+        words = set()
+        for word in text_words(text, stem=False):
+            words.add(_stem(word))
+            words.update(_stem(part) for part in segment(word, self.vocabulary))
+        for word in words:
+            positions = self.by_token.get(word)
+            if positions:
+                scores[positions] += self.idf[word] * self.token_weights[word]
+            positions = self.by_category_token.get(word)
+            if positions:
+                scores[positions] += CATEGORY_WEIGHT
+        for tag in extract_tags(text):
+            if tag in self.position:
+                scores[self.position[tag]] += 1.0
+        return scores
+
+    def recommend(self, theme="", text="", existing=None, limits=None, fill='max'):
+        """
+        Ranked hashtag set for a theme/post.
+
+        ``existing`` tags count toward the limits. Each type is filled to at least its
+        minimum, and with ``fill='max'`` also with relevant tags up to its maximum
+        (``fill='min'`` stops at the minimum). When existing tags of a type already
+        exceed its maximum, only the best-ranked ``max`` are kept and the rest are
+        reported in 'removed'. Existing tags not in the database are always kept.
+        Returns {'hashtags': kept existing + added, 'added': [...], 'removed': [...],
+        'General': [...], 'Targeted': [...]}.
+        """
+        limits = limits or self.limits
+        existing = list(dict.fromkeys(normalize_tag(tag) for tag in (existing or []) if normalize_tag(tag)))
+        key = (theme, text, tuple(existing), tuple((t, v['min'], v['max']) for t, v in sorted(limits.items())), fill)
+        if key not in self._recommendations:
+            self._recommendations[key] = self._recommend(f"{theme} {text}", existing, limits, fill)
+        cached = self._recommendations[key]
+        return {name: list(tags) for name, tags in cached.items()}
+
+    def _recommend(self, text, existing, limits, fill='max'):
+        relevance = MATCH_WEIGHT * self.match_scores(text)
+        chosen = [self.position[tag] for tag in existing if tag in self.position]
+        affinity = self.cooccurrence.add_rows_into(chosen, np.zeros(len(self.tags)))
+        if not relevance.any() and not chosen:
+            # Nothing to go on: fall back to the most-used tags
+            relevance = self.prior.copy()
+
+        # Enforce the maximums on existing tags: keep the best-ranked per type
+        removed = []
+        for tag_type, bounds in limits.items():
+            of_type = [i for i in chosen if self.types[i] == tag_type]
+            if len(of_type) <= bounds['max']:
+                continue
+            # Rank by theme relevance and affinity to the other existing tags (no self-pairs in the matrix)
+            seeds = max(1, len(chosen) - 1)
+            score = relevance[of_type] + COOCCURRENCE_WEIGHT * affinity[of_type] / seeds + self.prior[of_type]
+            ranked = [of_type[j] for j in np.argsort(-score, kind='stable')]
+            removed.extend(ranked[bounds['max']:])
+        if removed:
+            dropped = set(removed)
+            chosen = [i for i in chosen if i not in dropped]
+            existing = [tag for tag in existing if self.position.get(tag) not in dropped]
+            affinity = self.cooccurrence.add_rows_into(chosen, np.zeros(len(self.tags)))
+
+        taken = np.zeros(len(self.tags), dtype=bool)
+        taken[chosen] = True
+        taken[removed] = True
+        counts = Counter(self.types[i] for i in chosen)
+        added = []
+        for tag_type, bounds in limits.items():
+            mask = self.type_masks.get(tag_type)
+            if mask is None:
+                continue
+            while counts[tag_type] < bounds['max' if fill == 'max' else 'min']:
+                seeds = max(1, len(chosen))
+                score = relevance + COOCCURRENCE_WEIGHT * affinity / seeds + self.prior
+                score[~mask | taken] = -np.inf
+                best = int(np.argmax(score))
+                if not np.isfinite(score[best]):
+                    break
+                # Past the minimum, only add tags that relate to the theme or the set
+                if counts[tag_type] >= bounds['min'] and relevance[best] <= 0 and affinity[best] <= 0:
+                    break
+                taken[best] = True
+                chosen.append(best)
+                added.append(self.tags[best])
+                counts[tag_type] += 1
+                self.cooccurrence.add_rows_into([best], affinity)
+
+        hashtags = existing + added
+        return {
+            'hashtags': hashtags,
+            'added': added,
+            'removed': [self.tags[i] for i in removed],
+            'General': [tag for tag in hashtags if self._type_of(tag) == 'General'],
+            'Targeted': [tag for tag in hashtags if self._type_of(tag) == 'Targeted'],
+        }
+
+    def _type_of(self, tag):
+        position = self.position.get(tag)
+        return self.types[position] if position is not None else None
+
+    def stats(self):
+        return {
+            'hashtags': len(self.tags),
+            'tokens': len(self.by_token),
+            'categories': len(self.by_category),
+            'cooccurrence_pairs': self.cooccurrence.nnz // 2,
+        }
+
+
+_engines = {}
+
+
+def get_hashtag_engine(hashtags_csv=HASHTAGS_CSV, schedule_csv=SCHEDULE_CSV):
+    """Engine for these files, built once per process and rebuilt only if either file changes."""
+    def stamp(path):
+        return os.path.getmtime(path) if path and os.path.exists(path) else None
+
+    key = (os.path.abspath(hashtags_csv), os.path.abspath(schedule_csv) if schedule_csv else None)
+    version = (stamp(hashtags_csv), stamp(schedule_csv))
+    cached = _engines.get(key)
+    if cached is None or cached[0] != version:
+        _engines[key] = (version, HashtagEngine(hashtags_csv, schedule_csv))
+    return _engines[key][1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recommend hashtags from instagram_hashtags.csv")
+    parser.add_argument("theme", nargs="?", default="", help="Theme or post text")
+    parser.add_argument("--existing", default="", help="Hashtags the post already has")
+    parser.add_argument("--related", help="Show tags most often used with this one")
+    parser.add_argument("--hashtags-csv", default=HASHTAGS_CSV)
+    parser.add_argument("--schedule-csv", default=SCHEDULE_CSV)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.hashtags_csv):
+        print(f"❌ Error: {args.hashtags_csv} not found!")
+        sys.exit(1)
+
+    t0 = time.perf_counter()
+    engine = get_hashtag_engine(args.hashtags_csv, args.schedule_csv)
+    build_ms = (time.perf_counter() - t0) * 1000
+    stats = engine.stats()
+    print(f"📚 Indexed {stats['hashtags']} hashtags, {stats['tokens']} tokens, "
+          f"{stats['cooccurrence_pairs']} co-occurring pairs in {build_ms:.0f} ms")
+
+    if args.related:
+        for tag, weight in engine.related(args.related):
+            print(f"  {tag}  {weight}")
+        return
+
+    t0 = time.perf_counter()
+    result = engine.recommend(theme=args.theme, existing=extract_tags(args.existing))
+    elapsed_us = (time.perf_counter() - t0) * 1e6
+    print(f"\n🏷️  General ({len(result['General'])}): {' '.join(result['General'])}")
+    print(f"🎯 Targeted ({len(result['Targeted'])}): {' '.join(result['Targeted'])}")
+    if result['removed']:
+        print(f"✂️  Over the limit, dropped: {' '.join(result['removed'])}")
+    print(f"\n{' '.join(result['hashtags'])}")
+    print(f"\n⚡ Recommended in {elapsed_us:.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,16 +4,20 @@ Hybrid Content Workflow: Systematic Planning + Creative Ideation
 Combines our structured approach with Grok's creative content generation
 """
 
+import argparse
 import pandas as pd
 import json
 from datetime import datetime, timedelta
+from grok_cache import CACHE_ENABLED
+from grok_client import OFFLINE
 from grok_content_generator import GrokContentGenerator
 
 class HybridContentWorkflow:
-    def __init__(self, grok_api_key):
-        self.grok = GrokContentGenerator(grok_api_key)
+    def __init__(self, grok_api_key, grok=None):
+        # Reuse an existing generator (and its pooled connections) when one is passed in
+        self.grok = grok or GrokContentGenerator(grok_api_key)
         self.content_schedule = pd.read_csv('agroverse_schedule_till_easter.csv')
-        self.hashtags_db = pd.read_csv('instagram_hashtags.csv')
+        self.hashtags = self.grok.hashtags
         
         # Define our systematic themes and patterns
         self.core_themes = [
@@ -45,10 +49,10 @@ class HybridContentWorkflow:
         print("🎨 Generating creative enhancements with Grok...")
         
         enhanced_content = []
+        rows = list(content_gaps.head(10).iterrows())  # Process first 10 for testing
         
-        for idx, row in content_gaps.head(10).iterrows():  # Process first 10 for testing
-            print(f"\n📝 Enhancing content for {row['Post Day']} - {row['Theme']}")
-            
+        requests = []
+        for idx, row in rows:
             # Prepare context for Grok
             context = f"""
             Date: {row['Post Day']}
@@ -57,10 +61,13 @@ class HybridContentWorkflow:
             Current Description: {row['Description']}
             Week: {row['Week']}
             """
-            
-            # Get creative enhancement from Grok
-            enhancement = self.grok.enhance_existing_content(context)
-            
+            requests.append(self.grok.enhance_content_request(context))
+        
+        # Get creative enhancements from Grok concurrently, in row order
+        print(f"📝 Enhancing {len(rows)} entries ({self.grok.client.max_concurrency} at a time)...")
+        enhancements = self.grok.generate_batch(requests)
+        
+        for (idx, row), enhancement in zip(rows, enhancements):
             if enhancement:
                 enhanced_content.append({
                     'original_row': idx,
@@ -68,7 +75,7 @@ class HybridContentWorkflow:
                     'post_day': row['Post Day'],
                     'theme': row['Theme']
                 })
-                print(f"✅ Enhanced content for {row['Post Day']}")
+                print(f"✅ Enhanced content for {row['Post Day']} - {row['Theme']}")
             else:
                 print(f"❌ Failed to enhance content for {row['Post Day']}")
         
@@ -100,6 +107,24 @@ class HybridContentWorkflow:
             print(f"❌ Failed to generate themes for Week {week_number}")
             return None
     
+    def generate_weekly_themes_batch(self, week_numbers, season="fall"):
+        """Generate creative themes for several weeks concurrently"""
+        week_numbers = list(week_numbers)
+        print(f"📅 Generating creative themes for weeks {', '.join(str(week) for week in week_numbers)}...")
+        
+        results = self.grok.generate_batch(
+            [self.grok.week_themes_request(week, season) for week in week_numbers]
+        )
+        
+        weekly_themes = {}
+        for week, themes in zip(week_numbers, results):
+            if themes:
+                weekly_themes[f'Week {week}'] = themes
+                print(f"✅ Generated themes for Week {week}")
+            else:
+                print(f"❌ Failed to generate themes for Week {week}")
+        return weekly_themes
+    
     def systematic_content_planning(self, start_week=1, num_weeks=4):
         """Our systematic approach to content planning"""
         print(f"📊 Systematic content planning for weeks {start_week}-{start_week + num_weeks - 1}")
@@ -145,11 +170,7 @@ class HybridContentWorkflow:
         
         # Step 4: Weekly Theme Generation
         print("\n📅 Step 4: Creative Weekly Themes")
-        weekly_themes = {}
-        for week in range(1, min(weeks_ahead + 1, 5)):  # Generate themes for first 4 weeks
-            themes = self.generate_weekly_themes(week, "fall")
-            if themes:
-                weekly_themes[f'Week {week}'] = themes
+        weekly_themes = self.generate_weekly_themes_batch(range(1, min(weeks_ahead + 1, 5)), "fall")  # First 4 weeks
         
         # Compile results
         results = {
@@ -206,15 +227,23 @@ def main():
     import os
     from dotenv import load_dotenv
     
+    parser = argparse.ArgumentParser(description="Run the hybrid content workflow")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached Grok responses and fetch fresh ones (they still replace the cached copies)")
+    parser.add_argument("--no-cache", action="store_true", help="Don't read or write the Grok response cache")
+    parser.add_argument("--offline", action="store_true", help="Answer with the local Grok stand-in instead of the API (cached responses are still used)")
+    args = parser.parse_args()
+    offline = OFFLINE or args.offline
+    
     load_dotenv()
     api_key = os.getenv("GROK_API_KEY")
     
-    if not api_key:
+    if not api_key and not offline:
         print("❌ Error: GROK_API_KEY not found in environment variables.")
         print("Please set GROK_API_KEY in your .env file.")
         return
     
-    workflow = HybridContentWorkflow(api_key)
+    grok = GrokContentGenerator(api_key, use_cache=CACHE_ENABLED and not args.no_cache, refresh=args.refresh, offline=offline)
+    workflow = HybridContentWorkflow(api_key, grok=grok)
     
     print("🚀 Testing Hybrid Content Workflow")
     print("=" * 50)
@@ -235,6 +264,9 @@ def main():
     print(f"Weekly Themes: {len(results['weekly_themes'])} weeks planned")
     print(f"Recommendations: {len(results['recommendations'])} actionable items")
     
+    if grok.cache_summary():
+        print(f"\n📦 {grok.cache_summary()}")
+    
     # Save results
     workflow.save_results(results)
     
@@ -15,11 +15,129 @@ Requirements:
 """
 
 import os
+import re
 import sys
+import numpy as np
 import pandas as pd
 import hashlib
 from datetime import datetime
 
+from hashtag_engine import HASHTAG_LIMITS, get_hashtag_engine, normalize_tag
+
+# Insight types in priority order; ties between equally scored types go to the earlier one
+INSIGHT_PATTERNS = {
+    'hashtag_suggestion': {
+        'keywords': ['hashtag', '#', 'tag', 'trending'],
+        'action': 'add_hashtag'
+    },
+    'content_improvement': {
+        'keywords': ['better', 'improve', 'suggest', 'recommend', 'instead', 'should'],
+        'action': 'improve_content'
+    },
+    'timing_feedback': {
+        'keywords': ['time', 'schedule', 'post', 'when', 'day', 'morning', 'evening'],
+        'action': 'adjust_timing'
+    },
+    'theme_feedback': {
+        'keywords': ['theme', 'topic', 'focus', 'about', 'subject'],
+        'action': 'adjust_theme'
+    },
+    'audience_feedback': {
+        'keywords': ['audience', 'people', 'followers', 'community', 'target'],
+        'action': 'adjust_audience'
+    }
+}
+
+GENERAL_INSIGHT = {
+    'type': 'general_feedback',
+    'action': 'review_content',
+    'description': 'General content feedback received',
+    'confidence': 0.5
+}
+
+
+class FeedbackClassifier:
+    """Score feedback against every insight type with one compiled regex.
+
+    Each keyword group becomes a named alternative of one combined pattern,
+    so a single left-to-right scan finds every keyword occurrence and reports
+    which insight type it belongs to. Keywords keep the original substring
+    semantics ('post' still matches inside 'posting'), but a keyword nested in
+    a longer one of the same type ('tag' in 'hashtag') counts once.
+    """
+    
+    def __init__(self, patterns=None):
+        self.patterns = patterns or INSIGHT_PATTERNS
+        self.types = list(self.patterns)
+        alternatives = []
+        for position, insight_type in enumerate(self.types):
+            # Longest keyword first so the reported match is the most specific one
+            keywords = sorted(self.patterns[insight_type]['keywords'], key=len, reverse=True)
+            alternatives.append(f"(?P<t{position}>{'|'.join(re.escape(k.lower()) for k in keywords)})")
+        self.regex = re.compile('|'.join(alternatives))
+    
+    def score(self, text):
+        """Keyword hit counts per insight type for a single feedback text"""
+        counts = np.zeros(len(self.types), dtype=np.int32)
+        for match in self.regex.finditer(str(text).lower()):
+            counts[match.lastindex - 1] += 1
+        return counts
+    
+    def score_series(self, texts):
+        """Hit counts for a whole Series: one regex scan over the joined, lower-cased corpus"""
+        texts = pd.Series(texts).fillna('').astype(str).str.lower()
+        counts = np.zeros((len(texts), len(self.types)), dtype=np.int32)
+        if len(texts) == 0:
+            return pd.DataFrame(counts, index=texts.index, columns=self.types)
+        
+        # A newline separator can't be part of any keyword, so no match spans two entries
+        lengths = texts.str.len().to_numpy() + 1
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        hits = [(match.start(), match.lastindex - 1) for match in self.regex.finditer('\n'.join(texts))]
+        if hits:
+            positions, type_columns = np.array(hits).T
+            rows = np.searchsorted(starts, positions, side='right') - 1
+            np.add.at(counts, (rows, type_columns), 1)
+        return pd.DataFrame(counts, index=texts.index, columns=self.types)
+    
+    def classify_series(self, texts):
+        """Classify every entry at once; returns a DataFrame with type, action, confidence and per-type scores"""
+        scores = self.score_series(texts)
+        values = scores.to_numpy()
+        best = values.argmax(axis=1) if len(values) else np.zeros(0, dtype=int)
+        best_hits = values[np.arange(len(values)), best] if len(values) else np.zeros(0, dtype=int)
+        matched = best_hits > 0
+        
+        types = np.array(self.types, dtype=object)[best]
+        actions = np.array([self.patterns[t]['action'] for t in self.types], dtype=object)[best]
+        result = pd.DataFrame({
+            'type': np.where(matched, types, GENERAL_INSIGHT['type']),
+            'action': np.where(matched, actions, GENERAL_INSIGHT['action']),
+            # Base 0.7 for a match, nudged up by repeated evidence for the winning type
+            'confidence': np.where(matched, np.minimum(0.7 + 0.05 * (best_hits - 1), 0.95), GENERAL_INSIGHT['confidence']),
+            'matched_types': (values > 0).sum(axis=1)
+        }, index=scores.index)
+        return pd.concat([result, scores], axis=1)
+    
+    def classify(self, text):
+        """Classify a single feedback text into an insight dict"""
+        return self.to_insight(self.classify_series([text]).iloc[0])
+    
+    def to_insight(self, row):
+        """Insight dict for one row of classify_series output"""
+        if row['type'] == GENERAL_INSIGHT['type']:
+            insight = dict(GENERAL_INSIGHT)
+        else:
+            insight = {
+                'type': row['type'],
+                'action': row['action'],
+                'description': f"Feedback suggests {row['type'].replace('_', ' ')}",
+                'confidence': round(float(row['confidence']), 2)
+            }
+        insight['scores'] = {insight_type: int(row[insight_type]) for insight_type in self.types}
+        return insight
+
+
 class FeedbackProcessor:
     def __init__(self):
         self.feedback_csv = "community_feedback.csv"
@@ -29,10 +147,11 @@ class FeedbackProcessor:
         self.updated_feedback_csv = "community_feedback.csv"
         
         # Hashtag usage guidelines
-        self.hashtag_limits = {
-            'General': {'min': 3, 'max': 5},
-            'Targeted': {'min': 7, 'max': 10}
-        }
+        self.hashtag_limits = HASHTAG_LIMITS
+        
+        # Feedback insight matcher
+        self.classifier = FeedbackClassifier()
+        self.max_printed_feedback = 20
     
     def load_data(self):
         """Load all required CSV files"""
@@ -56,13 +175,13 @@ class FeedbackProcessor:
             # Load data
             feedback_df = pd.read_csv(self.feedback_csv)
             content_df = pd.read_csv(self.content_schedule_csv)
-            hashtags_df = pd.read_csv(self.hashtags_csv)
+            hashtags = get_hashtag_engine(self.hashtags_csv, self.content_schedule_csv)
             
             print(f"✅ Loaded {len(feedback_df)} feedback entries")
             print(f"✅ Loaded {len(content_df)} content schedule entries")
-            print(f"✅ Loaded {len(hashtags_df)} hashtag entries")
+            print(f"✅ Indexed {len(hashtags.tags)} hashtags")
             
-            return True, feedback_df, content_df, hashtags_df
+            return True, feedback_df, content_df, hashtags
             
         except Exception as e:
             print(f"❌ Error loading data: {str(e)}")
@@ -72,109 +191,79 @@ class FeedbackProcessor:
         """Analyze feedback and extract actionable insights"""
         print("\n🔍 Analyzing community feedback...")
         
-        insights = []
+        feedback_text = feedback_df['feedback'].fillna('').astype(str).str.strip()
+        status = feedback_df['status'].fillna('').astype(str).str.strip().str.upper()
         
-        for idx, row in feedback_df.iterrows():
-            feedback_text = str(row['feedback']).strip()
-            status = str(row['status']).strip()
-            
-            # Skip already processed feedback
-            if status.upper() == 'INCORPORATED':
-                continue
-            
-            # Skip empty feedback
-            if not feedback_text:
-                continue
-            
-            print(f"\n📝 Processing feedback {idx + 1}: {feedback_text[:100]}...")
+        # Skip already processed and empty feedback
+        pending = feedback_text[(status != 'INCORPORATED') & (feedback_text != '')]
+        
+        # Classify all pending feedback in one pass
+        classified = self.classifier.classify_series(pending)
+        
+        insights = []
+        for position, (idx, row) in enumerate(zip(classified.index, classified.to_dict('records'))):
+            insight = self.classifier.to_insight(row)
+            insight['original_feedback'] = pending[idx]
+            insight['feedback_index'] = idx
+            insights.append(insight)
             
-            # Extract insights based on common feedback patterns
-            insight = self._extract_insight(feedback_text)
-            if insight:
-                insight['original_feedback'] = feedback_text
-                insight['feedback_index'] = idx
-                insights.append(insight)
+            if position < self.max_printed_feedback:
+                print(f"\n📝 Processing feedback {idx + 1}: {pending[idx][:100]}...")
                 print(f"  💡 Insight: {insight['type']} - {insight['description']}")
         
+        if len(insights) > self.max_printed_feedback:
+            print(f"\n  … and {len(insights) - self.max_printed_feedback} more")
+        
+        if insights:
+            summary = classified['type'].value_counts()
+            print("\n📊 Insight types:")
+            for insight_type, count in summary.items():
+                print(f"  {insight_type}: {count}")
+        
         print(f"\n✅ Extracted {len(insights)} actionable insights")
         return insights
     
     def _extract_insight(self, feedback_text):
         """Extract actionable insights from feedback text"""
-        feedback_lower = feedback_text.lower()
-        
-        # Define insight patterns
-        patterns = {
-            'hashtag_suggestion': {
-                'keywords': ['hashtag', '#', 'tag', 'trending'],
-                'action': 'add_hashtag'
-            },
-            'content_improvement': {
-                'keywords': ['better', 'improve', 'suggest', 'recommend', 'instead', 'should'],
-                'action': 'improve_content'
-            },
-            'timing_feedback': {
-                'keywords': ['time', 'schedule', 'post', 'when', 'day', 'morning', 'evening'],
-                'action': 'adjust_timing'
-            },
-            'theme_feedback': {
-                'keywords': ['theme', 'topic', 'focus', 'about', 'subject'],
-                'action': 'adjust_theme'
-            },
-            'audience_feedback': {
-                'keywords': ['audience', 'people', 'followers', 'community', 'target'],
-                'action': 'adjust_audience'
-            }
-        }
-        
-        # Find matching patterns
-        for insight_type, pattern in patterns.items():
-            if any(keyword in feedback_lower for keyword in pattern['keywords']):
-                return {
-                    'type': insight_type,
-                    'action': pattern['action'],
-                    'description': f"Feedback suggests {insight_type.replace('_', ' ')}",
-                    'confidence': 0.7  # Base confidence
-                }
-        
-        # Default insight for general feedback
-        return {
-            'type': 'general_feedback',
-            'action': 'review_content',
-            'description': 'General content feedback received',
-            'confidence': 0.5
-        }
+        return self.classifier.classify(feedback_text)
     
-    def apply_insights(self, insights, content_df, hashtags_df):
+    def apply_insights(self, insights, content_df, hashtags):
         """Apply insights to improve the content schedule"""
         print("\n🔧 Applying insights to content schedule...")
         
         updated_content_df = content_df.copy()
         changes_made = 0
         
+        # Insights with the same action are applied together: one filter and one sample per action
+        by_action = {}
         for insight in insights:
-            print(f"\n🔄 Processing insight: {insight['type']}")
+            by_action.setdefault(insight['action'], []).append(insight)
+        
+        for action, group in by_action.items():
+            types = pd.Series([insight['type'] for insight in group]).value_counts()
+            print(f"\n🔄 Processing {len(group)} insight(s) → {action}: "
+                  + ', '.join(f"{insight_type} ({count})" for insight_type, count in types.items()))
             
-            if insight['action'] == 'add_hashtag':
-                changes_made += self._add_hashtag_improvements(insight, updated_content_df, hashtags_df)
+            if action == 'add_hashtag':
+                changes_made += self._add_hashtag_improvements(group, updated_content_df, hashtags)
             
-            elif insight['action'] == 'improve_content':
-                changes_made += self._improve_content(insight, updated_content_df)
+            elif action == 'improve_content':
+                changes_made += self._improve_content(group, updated_content_df)
             
-            elif insight['action'] == 'adjust_timing':
-                changes_made += self._adjust_timing(insight, updated_content_df)
+            elif action == 'adjust_timing':
+                changes_made += self._adjust_timing(group, updated_content_df)
             
-            elif insight['action'] == 'adjust_theme':
-                changes_made += self._adjust_theme(insight, updated_content_df)
+            elif action == 'adjust_theme':
+                changes_made += self._adjust_theme(group, updated_content_df)
             
-            elif insight['action'] == 'review_content':
-                changes_made += self._review_content(insight, updated_content_df)
+            elif action == 'review_content':
+                changes_made += self._review_content(group, updated_content_df)
         
         print(f"\n✅ Made {changes_made} improvements to content schedule")
         return updated_content_df
     
-    def _add_hashtag_improvements(self, insight, content_df, hashtags_df):
-        """Add hashtag improvements based on feedback"""
+    def _add_hashtag_improvements(self, insights, content_df, hashtags):
+        """Top up hashtags to the General/Targeted minimums and trim any type over its maximum"""
         changes = 0
         
         # Find content entries with empty status (need improvement)
@@ -183,42 +272,34 @@ class FeedbackProcessor:
         if len(empty_status_rows) == 0:
             return 0
         
-        # Get relevant hashtags
-        general_hashtags = hashtags_df[hashtags_df['Type'] == 'General']['Hashtag'].tolist()
-        targeted_hashtags = hashtags_df[hashtags_df['Type'] == 'Targeted']['Hashtag'].tolist()
-        
-        # Apply hashtag improvements to a few random empty status rows
-        sample_rows = empty_status_rows.sample(min(3, len(empty_status_rows)))
+        # Apply hashtag improvements to a few random empty status rows per insight
+        sample_rows = empty_status_rows.sample(min(3 * len(insights), len(empty_status_rows)))
         
         for idx in sample_rows.index:
-            current_hashtags = str(content_df.loc[idx, 'Hashtags']).split()
-            
-            # Count current hashtags
-            general_count = sum(1 for tag in current_hashtags if tag in general_hashtags)
-            targeted_count = sum(1 for tag in current_hashtags if tag in targeted_hashtags)
-            
-            # Improve hashtag mix based on guidelines
-            improved_hashtags = current_hashtags.copy()
-            
-            # Add general hashtags if needed
-            if general_count < self.hashtag_limits['General']['min']:
-                needed = self.hashtag_limits['General']['min'] - general_count
-                available = [tag for tag in general_hashtags if tag not in improved_hashtags]
-                improved_hashtags.extend(available[:needed])
+            row = content_df.loc[idx]
+            current_hashtags = str(row['Hashtags']).split() if pd.notna(row['Hashtags']) else []
+            theme = ' '.join(str(row.get(column, '')) for column in ('Theme', 'Theme Focus') if pd.notna(row.get(column)))
+            description = row.get('Description', '')
             
-            # Add targeted hashtags if needed
-            if targeted_count < self.hashtag_limits['Targeted']['min']:
-                needed = self.hashtag_limits['Targeted']['min'] - targeted_count
-                available = [tag for tag in targeted_hashtags if tag not in improved_hashtags]
-                improved_hashtags.extend(available[:needed])
+            # Existing tags count toward the limits; only the shortfall to each minimum is
+            # added, and tags beyond a type's maximum are dropped
+            recommendation = hashtags.recommend(
+                theme=theme,
+                text=str(description) if pd.notna(description) else '',
+                existing=current_hashtags,
+                limits=self.hashtag_limits,
+                fill='min'
+            )
             
-            # Update the row
-            content_df.loc[idx, 'Hashtags'] = ' '.join(improved_hashtags)
+            # Update the row, keeping the original spelling of retained tags
+            removed = set(recommendation['removed'])
+            kept = [tag for tag in current_hashtags if normalize_tag(tag) not in removed]
+            content_df.loc[idx, 'Hashtags'] = ' '.join(kept + recommendation['added'])
             changes += 1
         
         return changes
     
-    def _improve_content(self, insight, content_df):
+    def _improve_content(self, insights, content_df):
         """Improve content based on feedback"""
         changes = 0
         
@@ -228,8 +309,8 @@ class FeedbackProcessor:
         if len(empty_status_rows) == 0:
             return 0
         
-        # Improve descriptions for a few random rows
-        sample_rows = empty_status_rows.sample(min(2, len(empty_status_rows)))
+        # Improve descriptions for a few random rows per insight
+        sample_rows = empty_status_rows.sample(min(2 * len(insights), len(empty_status_rows)))
         
         for idx in sample_rows.index:
             current_desc = str(content_df.loc[idx, 'Description'])
@@ -241,24 +322,24 @@ class FeedbackProcessor:
         
         return changes
     
-    def _adjust_timing(self, insight, content_df):
+    def _adjust_timing(self, insights, content_df):
         """Adjust timing based on feedback"""
         # This is a placeholder - timing adjustments would require more complex logic
         return 0
     
-    def _adjust_theme(self, insight, content_df):
+    def _adjust_theme(self, insights, content_df):
         """Adjust themes based on feedback"""
         # This is a placeholder - theme adjustments would require more complex logic
         return 0
     
-    def _review_content(self, insight, content_df):
+    def _review_content(self, insights, content_df):
         """Review content based on general feedback"""
         changes = 0
         
-        # Mark a few random empty status rows as reviewed
+        # Mark one random empty status row per insight as reviewed
         empty_status_rows = content_df[content_df['status'].fillna('').str.strip() == '']
         if len(empty_status_rows) > 0:
-            sample_rows = empty_status_rows.sample(min(1, len(empty_status_rows)))
+            sample_rows = empty_status_rows.sample(min(len(insights), len(empty_status_rows)))
             for idx in sample_rows.index:
                 content_df.loc[idx, 'status'] = 'REVIEWED'
                 changes += 1
@@ -271,9 +352,10 @@ class FeedbackProcessor:
         
         updated_feedback_df = feedback_df.copy()
         
-        for insight in processed_insights:
-            feedback_idx = insight['feedback_index']
-            updated_feedback_df.loc[feedback_idx, 'status'] = 'INCORPORATED'
+        # An all-empty status column is read as float; make room for the text status
+        updated_feedback_df['status'] = updated_feedback_df['status'].astype(object)
+        feedback_indices = [insight['feedback_index'] for insight in processed_insights]
+        updated_feedback_df.loc[feedback_indices, 'status'] = 'INCORPORATED'
         
         return updated_feedback_df
     
@@ -302,7 +384,7 @@ class FeedbackProcessor:
         print("=" * 60)
         
         # Load data
-        success, feedback_df, content_df, hashtags_df = self.load_data()
+        success, feedback_df, content_df, hashtags = self.load_data()
         if not success:
             return
         
@@ -313,7 +395,7 @@ class FeedbackProcessor:
             return
         
         # Apply insights
-        updated_content_df = self.apply_insights(insights, content_df, hashtags_df)
+        updated_content_df = self.apply_insights(insights, content_df, hashtags)
         
         # Update feedback status
         updated_feedback_df = self.update_feedback_status(feedback_df, insights)
@@ -8,8 +8,12 @@ This script syncs the agroverse_schedule_till_easter.csv file with the
 The script preserves existing status values in Column B and uses primary keys
 for row matching to avoid overwriting manual status updates.
 
+Rows are diffed against the live sheet by primary key, so only inserted, deleted
+and changed rows are written. Use --full to clear and rewrite the whole sheet.
+
 Usage:
     python sync_content_schedule.py
+    python sync_content_schedule.py --full
 
 Requirements:
     - google_credentials.json file with proper Google Sheets API permissions
@@ -124,11 +128,12 @@ class ContentScheduleSyncer:
             print(f"❌ Error reading CSV file: {str(e)}")
             sys.exit(1)
     
-    def get_existing_status_values(self, worksheet):
+    def get_existing_status_values(self, worksheet, all_values=None):
         """Get existing status values from Column B, indexed by primary key from Column A"""
         try:
-            # Get all data from the worksheet
-            all_values = worksheet.get_all_values()
+            # Get all data from the worksheet (reuse a snapshot if the caller already has one)
+            if all_values is None:
+                all_values = worksheet.get_all_values()
             
             if len(all_values) <= 1:  # No data rows (only header or empty)
                 print("📊 No existing data found in sheet")
@@ -161,7 +166,6 @@ class ContentScheduleSyncer:
                     status_value = row[status_col] if len(row) > status_col else ""
                     if primary_key and primary_key.strip():  # Only store non-empty primary keys
                         status_dict[primary_key.strip()] = status_value.strip()
-                        print(f"  🔍 Found: {primary_key.strip()} -> '{status_value.strip()}'")
             
             print(f"📊 Retrieved {len(status_dict)} existing status values")
             return status_dict
@@ -170,104 +174,230 @@ class ContentScheduleSyncer:
             print(f"⚠️  Warning: Could not retrieve existing status values: {e}")
             return {}
     
-    def sync_to_sheets(self, data, df):
-        """Sync data to Google Sheets while preserving existing status values"""
+    def prepare_rows(self, data, df, existing_status):
+        """Apply preserved status values and clean cells for JSON serialization"""
+        data_with_status = [list(row) for row in data]
+        
+        # Update status values in data if they exist in the sheet
+        if 'status' in df.columns:
+            status_col_idx = data_with_status[0].index('status')
+            preserved_count = 0
+            
+            for row in data_with_status[1:]:  # Skip header
+                primary_key = row[0].strip() if row[0] else ""  # Primary key is in column A
+                existing_status_value = existing_status.get(primary_key, "")
+                # Only preserve if there's an existing status value
+                if existing_status_value and existing_status_value.strip():
+                    row[status_col_idx] = existing_status_value
+                    preserved_count += 1
+            
+            print(f"✅ Preserved {preserved_count} status values")
+        
+        cleaned_data = []
+        for row in data_with_status:
+            cleaned_row = []
+            for cell in row:
+                if cell is None:
+                    cleaned_row.append("")
+                elif isinstance(cell, float) and (cell != cell):  # Check for NaN
+                    cleaned_row.append("")
+                elif isinstance(cell, float) and (cell == float('inf') or cell == float('-inf')):
+                    cleaned_row.append("")
+                else:
+                    cleaned_row.append(str(cell))
+            cleaned_data.append(cleaned_row)
+        return cleaned_data
+    
+    @staticmethod
+    def _changed_ranges(row_number, old_row, new_row):
+        """Return A1 ranges covering the runs of cells that differ between two rows"""
+        padded_old = list(old_row) + [""] * (len(new_row) - len(old_row))
+        ranges = []
+        run_start = None
+        for col_idx in range(len(new_row) + 1):
+            changed = col_idx < len(new_row) and padded_old[col_idx] != new_row[col_idx]
+            if changed and run_start is None:
+                run_start = col_idx
+            elif not changed and run_start is not None:
+                start_a1 = gspread.utils.rowcol_to_a1(row_number, run_start + 1)
+                end_a1 = gspread.utils.rowcol_to_a1(row_number, col_idx)
+                ranges.append({
+                    'range': start_a1 if start_a1 == end_a1 else f"{start_a1}:{end_a1}",
+                    'values': [new_row[run_start:col_idx]],
+                })
+                run_start = None
+        return ranges
+    
+    @staticmethod
+    def _dimension_requests(kind, sheet_id, indices):
+        """Collapse 0-based grid row indices into contiguous insert/delete requests"""
+        requests = []
+        for index in indices:
+            if requests and requests[-1][kind]['range']['endIndex'] == index:
+                requests[-1][kind]['range']['endIndex'] += 1
+                continue
+            request = {'range': {'sheetId': sheet_id, 'dimension': 'ROWS', 'startIndex': index, 'endIndex': index + 1}}
+            if kind == 'insertDimension':
+                # Inherit validation/formatting from the data row above, never from the header
+                request['inheritFromBefore'] = index > 1
+            requests.append({kind: request})
+        return requests
+    
+    def compute_row_diff(self, sheet_values, cleaned_data):
+        """
+        Diff the desired rows against the live sheet, keyed on primary_key (Column A).
+        
+        Returns a dict of 0-based body indices to delete, final body indices to insert
+        and (final body index, old row, new row) pairs that changed. Returns None when
+        a diff can't be applied in place (header change, duplicate keys, reordered rows).
+        """
+        if not sheet_values or sheet_values[0] != cleaned_data[0]:
+            return None
+        
+        desired_keys = [row[0] for row in cleaned_data[1:]]
+        if len(set(desired_keys)) != len(desired_keys) or "" in desired_keys:
+            return None
+        desired_set = set(desired_keys)
+        
+        existing_rows = {}
+        deletes = []
+        kept_order = []
+        for body_idx, row in enumerate(sheet_values[1:]):
+            key = row[0].strip() if row else ""
+            if key not in desired_set or key in existing_rows:
+                deletes.append(body_idx)
+                continue
+            existing_rows[key] = row
+            kept_order.append(key)
+        
+        if kept_order != [key for key in desired_keys if key in existing_rows]:
+            return None
+        
+        inserts = []
+        changes = []
+        for body_idx, (key, new_row) in enumerate(zip(desired_keys, cleaned_data[1:])):
+            if key not in existing_rows:
+                inserts.append(body_idx)
+            elif self._changed_ranges(body_idx + 2, existing_rows[key], new_row):
+                changes.append((body_idx, existing_rows[key], new_row))
+        
+        return {'deletes': deletes, 'inserts': inserts, 'changes': changes}
+    
+    def apply_row_diff(self, worksheet, diff, cleaned_data):
+        """Apply a diff with one structural batch_update and one values batch_update"""
+        # Deletes run bottom-up so earlier indices stay valid; inserts then run top-down
+        # at their final positions.
+        structural = self._dimension_requests(
+            'deleteDimension', worksheet.id, [idx + 1 for idx in sorted(diff['deletes'])]
+        )
+        structural.reverse()
+        # An insert at final index idx has (idx - j) kept rows above it, j being its rank.
+        # Rows after the last kept row land below the data and only need grid room.
+        kept_count = len(cleaned_data) - 1 - len(diff['inserts'])
+        body_inserts = [idx for j, idx in enumerate(diff['inserts']) if idx - j < kept_count]
+        structural += self._dimension_requests(
+            'insertDimension', worksheet.id, [idx + 1 for idx in body_inserts]
+        )
+        # A values write never grows the grid, so append rows the sheet doesn't have yet
+        grid_rows = worksheet.row_count - len(diff['deletes']) + len(body_inserts)
+        if len(cleaned_data) > grid_rows:
+            structural.append({'appendDimension': {
+                'sheetId': worksheet.id, 'dimension': 'ROWS', 'length': len(cleaned_data) - grid_rows
+            }})
+        if structural:
+            self.spreadsheet.batch_update({'requests': structural})
+        
+        value_ranges = []
+        for body_idx in diff['inserts']:
+            new_row = cleaned_data[body_idx + 1]
+            value_ranges.append({
+                'range': f"A{body_idx + 2}:{gspread.utils.rowcol_to_a1(body_idx + 2, len(new_row))}",
+                'values': [new_row],
+            })
+        for body_idx, old_row, new_row in diff['changes']:
+            value_ranges += self._changed_ranges(body_idx + 2, old_row, new_row)
+        if value_ranges:
+            worksheet.batch_update(value_ranges, value_input_option='RAW')
+        
+        cells = sum(len(r['values'][0]) for r in value_ranges)
+        print(
+            f"🔁 Diff sync: {len(diff['inserts'])} inserted, {len(diff['deletes'])} deleted, "
+            f"{len(diff['changes'])} changed row(s); {len(value_ranges)} range(s) / {cells} cell(s) written "
+            f"in {int(bool(structural)) + int(bool(value_ranges))} API call(s)"
+        )
+    
+    def rewrite_in_place(self, worksheet, sheet_values, cleaned_data):
+        """Overwrite values without clearing, so Status validation survives, and trim leftovers"""
+        worksheet.update('A1', cleaned_data)
+        if len(sheet_values) > len(cleaned_data):
+            worksheet.delete_rows(len(cleaned_data) + 1, len(sheet_values))
+        print(f"📝 Rewrote {len(cleaned_data) - 1} rows in place")
+    
+    def format_headers(self, worksheet, cleaned_data):
+        """Format header cells (excluding Status column B to preserve data validation)"""
+        if len(cleaned_data[0]) > 1:  # Ensure we have at least 2 columns
+            # Format Column A header
+            worksheet.format('A1', {
+                'backgroundColor': {'red': 0.2, 'green': 0.4, 'blue': 0.8},
+                'textFormat': {'bold': True, 'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}}
+            })
+            
+            # Format Column C onwards (skip Column B - status)
+            if len(cleaned_data[0]) > 2:
+                worksheet.format('C1:Z1', {
+                    'backgroundColor': {'red': 0.2, 'green': 0.4, 'blue': 0.8},
+                    'textFormat': {'bold': True, 'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}}
+                })
+    
+    def sync_to_sheets(self, data, df, mode="diff"):
+        """
+        Sync data to Google Sheets while preserving existing status values.
+        
+        mode="diff" (default) writes only inserted, deleted and changed rows;
+        mode="full" clears the sheet and rewrites everything.
+        """
         try:
-            print(f"🔄 Syncing to worksheet: {self.worksheet_name}")
+            print(f"🔄 Syncing to worksheet: {self.worksheet_name} (mode: {mode})")
             
             # Get the worksheet
             worksheet = self.spreadsheet.worksheet(self.worksheet_name)
             
-            # Get existing status values before clearing
-            print("📖 Retrieving existing status values...")
-            existing_status = self.get_existing_status_values(worksheet)
-            
-            # Clear existing content
-            print("🧹 Clearing existing content...")
-            worksheet.clear()
+            # Read the live sheet once; status values and the diff both use this snapshot
+            print("📖 Retrieving existing sheet data...")
+            sheet_values = worksheet.get_all_values()
+            existing_status = self.get_existing_status_values(worksheet, sheet_values)
             
-            # Prepare data with preserved status values
             print("🔧 Preparing data with preserved status values...")
-            data_with_status = data.copy()
-            
-            # Update status values in data if they exist in the sheet
-            if 'status' in df.columns:
-                status_col_idx = data_with_status[0].index('status')
-                preserved_count = 0
-                
-                for row_idx, row in enumerate(data_with_status[1:], start=1):  # Skip header
-                    primary_key = row[0].strip() if row[0] else ""  # Primary key is in column A
-                    
-                    if primary_key in existing_status:
-                        existing_status_value = existing_status[primary_key]
-                        # Only preserve if there's an existing status value
-                        if existing_status_value and existing_status_value.strip():  # Check if status is not empty
-                            row[status_col_idx] = existing_status_value
-                            preserved_count += 1
-                            print(f"  📌 Preserved status for {primary_key}: '{existing_status_value}'")
-                        else:
-                            print(f"  📝 Keeping empty status for {primary_key}")
-                    else:
-                        print(f"  🆕 New row {primary_key} - keeping empty status")
-                
-                print(f"✅ Successfully preserved {preserved_count} status values")
-            
-            # Clean data for JSON serialization
-            print("🧹 Cleaning data for JSON serialization...")
-            cleaned_data = []
-            for row in data_with_status:
-                cleaned_row = []
-                for cell in row:
-                    if cell is None:
-                        cleaned_row.append("")
-                    elif isinstance(cell, float) and (cell != cell):  # Check for NaN
-                        cleaned_row.append("")
-                    elif isinstance(cell, float) and (cell == float('inf') or cell == float('-inf')):
-                        cleaned_row.append("")
-                    else:
-                        cleaned_row.append(str(cell))
-                cleaned_data.append(cleaned_row)
-            
-            # Update with new data (preserving data validation on Status column)
-            print("📝 Writing new data...")
-            
-            # Use a more targeted approach to preserve data validation
-            # First, clear the sheet completely
-            worksheet.clear()
-            
-            # Update all data
-            worksheet.update('A1', cleaned_data)
-            
-            print("📌 Data updated - data validation rules may need to be recreated if lost")
-            
-            # Format header cells (excluding Status column B to preserve data validation)
-            # Format Column A (primary_key) and Column C onwards, but skip Column B (status)
-            if len(cleaned_data[0]) > 1:  # Ensure we have at least 2 columns
-                # Format Column A header
-                worksheet.format('A1', {
-                    'backgroundColor': {'red': 0.2, 'green': 0.4, 'blue': 0.8},
-                    'textFormat': {'bold': True, 'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}}
-                })
-                
-                # Format Column C onwards (skip Column B - status)
-                if len(cleaned_data[0]) > 2:
-                    worksheet.format('C1:Z1', {
-                        'backgroundColor': {'red': 0.2, 'green': 0.4, 'blue': 0.8},
-                        'textFormat': {'bold': True, 'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}}
-                    })
-            
-            # Note: Status column (B) formatting and data validation are completely preserved
+            cleaned_data = self.prepare_rows(data, df, existing_status)
+            
+            if mode == "full":
+                print("🧹 Clearing existing content...")
+                worksheet.clear()
+                worksheet.update('A1', cleaned_data)
+                print("📌 Data updated - data validation rules may need to be recreated if lost")
+                self.format_headers(worksheet, cleaned_data)
+            else:
+                diff = self.compute_row_diff(sheet_values, cleaned_data)
+                if diff is None:
+                    print("ℹ️  Headers or row order changed - rewriting values in place")
+                    self.rewrite_in_place(worksheet, sheet_values, cleaned_data)
+                    if not sheet_values or sheet_values[0] != cleaned_data[0]:
+                        self.format_headers(worksheet, cleaned_data)
+                elif not (diff['inserts'] or diff['deletes'] or diff['changes']):
+                    print("✅ Sheet already up to date - nothing to write")
+                else:
+                    self.apply_row_diff(worksheet, diff, cleaned_data)
             
             # Note: Column widths are preserved to maintain user's formatting preferences
             
-            print(f"✅ Successfully synced {len(data_with_status)-1} rows to Google Sheets!")
+            print(f"✅ Successfully synced {len(cleaned_data)-1} rows to Google Sheets!")
             print(f"🔒 Preserved {len(existing_status)} existing status values")
             
         except Exception as e:
             print(f"❌ Error syncing to Google Sheets: {str(e)}")
             sys.exit(1)
     
-    def run(self):
+    def run(self, mode="diff"):
         """Main execution method"""
         print("🚀 Starting Content Schedule Sync...")
         print("=" * 50)
@@ -276,7 +406,7 @@ class ContentScheduleSyncer:
         data, df = self.load_csv_data()
         
         # Sync to Google Sheets
-        self.sync_to_sheets(data, df)
+        self.sync_to_sheets(data, df, mode=mode)
         
         print("=" * 50)
         print("🎉 Content Schedule sync completed successfully!")
@@ -285,9 +415,17 @@ class ContentScheduleSyncer:
 
 def main():
     """Main function"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Sync the content schedule CSV to Google Sheets')
+    parser.add_argument('--full', action='store_true',
+                       help='Clear the sheet and rewrite every row instead of syncing only changed rows')
+    
+    args = parser.parse_args()
+    
     try:
         syncer = ContentScheduleSyncer()
-        syncer.run()
+        syncer.run(mode="full" if args.full else "diff")
     except KeyboardInterrupt:
         print("\n⚠️  Sync interrupted by user")
         sys.exit(1)
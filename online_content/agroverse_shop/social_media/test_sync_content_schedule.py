@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Regression tests for ContentScheduleSyncer's diff sync (run with ``python3 -m pytest``)."""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "physical_stores"))
+
+from sheets_emulator import EmulatedClient
+from sync_content_schedule import ContentScheduleSyncer
+
+HEADERS = ["primary_key", "status", "Post Day", "Caption"]
+
+
+def schedule(keys):
+    return [HEADERS] + [[key, "", f"day {key}", f"caption {key}"] for key in keys]
+
+
+@pytest.fixture
+def syncer(tmp_path):
+    client = EmulatedClient(tmp_path / "sheets.sqlite")
+    syncer = ContentScheduleSyncer.__new__(ContentScheduleSyncer)
+    syncer.worksheet_name = "Instagram Content Schedule"
+    syncer.client = client
+    return syncer
+
+
+def seed_exact(syncer, rows):
+    """Seed the sheet sized exactly to its data, as deleteDimension leaves it after a sync"""
+    spreadsheet = syncer.client.seed("sheet", {syncer.worksheet_name: rows})
+    spreadsheet.worksheet(syncer.worksheet_name).resize(rows=len(rows))
+    syncer.spreadsheet = spreadsheet
+    return spreadsheet.worksheet(syncer.worksheet_name)
+
+
+def sync(syncer, data):
+    syncer.sync_to_sheets(data, pd.DataFrame(data[1:], columns=data[0]))
+
+
+@pytest.mark.parametrize(
+    "before, after",
+    [
+        (["a", "b", "c", "d", "e"], ["a", "b", "c", "d", "e", "f", "g"]),
+        (["a", "b", "c", "d", "e"], ["a", "c", "d", "e", "f", "g", "h"]),
+        (["a", "b", "c", "d", "e"], ["a", "x", "b", "c", "d", "e", "f"]),
+        (["a", "b"], ["c", "d", "e"]),
+    ],
+)
+def test_appends_past_exactly_sized_sheet(syncer, before, after):
+    worksheet = seed_exact(syncer, schedule(before))
+
+    sync(syncer, schedule(after))
+
+    assert worksheet.get_all_values() == schedule(after)
+    assert worksheet.row_count == len(after) + 1
+
+
+def test_status_survives_appended_rows(syncer):
+    rows = schedule(["a", "b", "c"])
+    rows[2][1] = "Posted"
+    worksheet = seed_exact(syncer, rows)
+
+    sync(syncer, schedule(["a", "b", "c", "d"]))
+
+    values = worksheet.get_all_values()
+    assert [row[1] for row in values[1:]] == ["", "Posted", "", ""]
+    assert values[4] == ["d", "", "day d", "caption d"]
+
+
+def test_compute_row_diff(syncer):
+    diff = syncer.compute_row_diff(schedule(["a", "b", "c"]), schedule(["a", "c", "d"]))
+    assert diff["deletes"] == [1]
+    assert diff["inserts"] == [2]
+    assert diff["changes"] == []
+    assert syncer.compute_row_diff(schedule(["a", "b"]), schedule(["b", "a"])) is None
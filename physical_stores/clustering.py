@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Geographic clustering of Hit List cities into route regions and day trips.
+
+Replaces the hand-maintained ``route_segments`` table in generate_shop_list.py.
+City points (the centroid of each city's shops, weighted by shop count) are
+grouped with a radius-constrained k-means, vectorized in NumPy:
+
+  * regions: every city within ``REGION_RADIUS_MILES`` of its region centre
+  * days: within a region, every city within ``DAY_RADIUS_MILES`` of the day
+    centre and at most ``MAX_SHOPS_PER_DAY`` shops per day (a single city with
+    more shops than that still gets one day)
+
+k starts at 1 and grows only by the number of clusters that break a
+constraint, so the result is the fewest clusters k-means finds that satisfy it.
+Regions, days and the cities in each day are then put in driving order with the
+route solver in routing.py, starting from the northernmost region.
+
+Assignments are cached in ``.cache/route_clusters.json``. On the next run,
+cities that haven't moved keep their region and day. New or moved cities join
+the nearest region within the radius, and only the regions that changed are
+re-clustered. Cities that fit no region form new ones.
+
+Usage:
+    python3 clustering.py                        # cluster data/hit_list.csv (run pull_hit_list.py first)
+    python3 clustering.py --region-radius 40 --day-radius 15 --recompute
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from routing import HIT_LIST_CSV, haversine_matrix, load_hit_list_stops, solve_visit_order
+
+REGION_RADIUS_MILES = 60.0
+DAY_RADIUS_MILES = 20.0
+MAX_SHOPS_PER_DAY = 12
+
+MILES_PER_DEGREE_LAT = 69.0
+CLUSTER_STATE_PATH = Path(os.environ.get("PHYSICAL_STORES_CACHE_DIR", Path(__file__).parent / ".cache")) / "route_clusters.json"
+
+# key -> (lat, lng, shop count)
+CityPoints = Dict[str, Tuple[float, float, int]]
+
+
+def project_miles(lats: Sequence[float], lngs: Sequence[float]) -> np.ndarray:
+    """Equirectangular projection to (x, y) miles around the points' mean latitude."""
+    lat = np.asarray(lats, dtype=float)
+    lng = np.asarray(lngs, dtype=float)
+    scale = np.cos(np.radians(lat.mean())) if len(lat) else 1.0
+    return np.column_stack([lng * MILES_PER_DEGREE_LAT * scale, lat * MILES_PER_DEGREE_LAT])
+
+
+def kmeans(
+    points: np.ndarray,
+    k: int,
+    weights: np.ndarray,
+    rng: np.random.Generator,
+    max_iter: int = 100,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Weighted Lloyd's k-means with k-means++ seeding. Returns (labels, centers), labels compacted to 0..k'-1."""
+    n = len(points)
+    k = min(k, n)
+    centers = np.empty((k, 2))
+    centers[0] = points[rng.choice(n, p=weights / weights.sum())]
+    d2 = ((points - centers[0]) ** 2).sum(axis=1)
+    for c in range(1, k):
+        probs = d2 * weights
+        total = probs.sum()
+        centers[c] = points[rng.choice(n, p=probs / total) if total > 0 else int(np.argmax(d2))]
+        d2 = np.minimum(d2, ((points - centers[c]) ** 2).sum(axis=1))
+
+    for _ in range(max_iter):
+        labels = ((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+        mass = np.bincount(labels, weights, minlength=k)
+        moved = centers.copy()
+        filled = mass > 0
+        for axis in (0, 1):
+            sums = np.bincount(labels, weights * points[:, axis], minlength=k)
+            moved[filled, axis] = sums[filled] / mass[filled]
+        if np.allclose(moved, centers):
+            break
+        centers = moved
+    labels = ((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+
+    used, labels = np.unique(labels, return_inverse=True)
+    return labels, centers[used]
+
+
+def cluster_within_radius(
+    lats: Sequence[float],
+    lngs: Sequence[float],
+    radius_miles: float,
+    weights: Optional[Sequence[float]] = None,
+    max_weight: Optional[float] = None,
+    seed: int = 0,
+) -> np.ndarray:
+    """
+    Label points so every point is within ``radius_miles`` of its cluster centre.
+
+    With ``max_weight``, clusters of more than one location also stay at or under
+    that total weight. Points at identical coordinates always share a cluster.
+    Deterministic for a given seed.
+    """
+    n = len(lats)
+    if n == 0:
+        return np.zeros(0, dtype=int)
+    w = np.ones(n) if weights is None else np.maximum(np.asarray(weights, dtype=float), 1e-9)
+
+    # k-means can never separate coincident points (e.g. cities sharing a centroid),
+    # so cluster each distinct location once with the combined weight of its points.
+    coords, location = np.unique(
+        np.column_stack([np.asarray(lats, dtype=float), np.asarray(lngs, dtype=float)]),
+        axis=0,
+        return_inverse=True,
+    )
+    location = location.reshape(-1)
+    w = np.bincount(location, w)
+    m = len(coords)
+    points = project_miles(coords[:, 0], coords[:, 1])
+
+    rng = np.random.default_rng(seed)
+    k = 1
+    while True:
+        labels, centers = kmeans(points, k, w, rng)
+        spread = np.sqrt(((points - centers[labels]) ** 2).sum(axis=1))
+        bad = set(np.unique(labels[spread > radius_miles]).tolist())
+        if max_weight is not None:
+            mass = np.bincount(labels, w)
+            size = np.bincount(labels)
+            bad.update(np.flatnonzero((mass > max_weight) & (size > 1)).tolist())
+        if not bad or k >= m:
+            return labels[location]
+        # k must strictly grow: k-means may return fewer distinct centres than asked for
+        k = min(m, max(k + 1, len(centers) + len(bad)))
+
+
+def _groups(keys: Sequence[str], labels: np.ndarray) -> List[List[str]]:
+    groups: Dict[int, List[str]] = {}
+    for key, label in zip(keys, labels):
+        groups.setdefault(int(label), []).append(key)
+    return list(groups.values())
+
+
+def _centroid(keys: Sequence[str], points: CityPoints) -> Tuple[float, float]:
+    w = np.array([max(points[k][2], 1) for k in keys], dtype=float)
+    lat = np.array([points[k][0] for k in keys])
+    lng = np.array([points[k][1] for k in keys])
+    return float((lat * w).sum() / w.sum()), float((lng * w).sum() / w.sum())
+
+
+def _split(keys: Sequence[str], points: CityPoints, params: Dict) -> List[List[List[str]]]:
+    """Cluster cities into regions, then each region into days. Returns [region][day][key]."""
+    if not keys:
+        return []
+    keys = sorted(keys)
+    lats = [points[k][0] for k in keys]
+    lngs = [points[k][1] for k in keys]
+    weights = [max(points[k][2], 1) for k in keys]
+    regions = []
+    for region_keys in _groups(keys, cluster_within_radius(lats, lngs, params["region_radius"], weights)):
+        labels = cluster_within_radius(
+            [points[k][0] for k in region_keys],
+            [points[k][1] for k in region_keys],
+            params["day_radius"],
+            [max(points[k][2], 1) for k in region_keys],
+            max_weight=params["max_shops_per_day"],
+        )
+        regions.append(_groups(region_keys, labels))
+    return regions
+
+
+def _route_order(coords: Sequence[Tuple[float, float]], entry: Optional[Tuple[float, float]]) -> List[int]:
+    """Visit order for ``coords``, starting nearest ``entry`` (or at the northernmost point)."""
+    if len(coords) < 2:
+        return list(range(len(coords)))
+    lats, lngs = zip(*coords)
+    if entry is None:
+        start = int(np.argmax(lats))
+    else:
+        start = int(haversine_matrix((entry[0],) + lats, (entry[1],) + lngs)[0, 1:].argmin())
+    order, _ = solve_visit_order(haversine_matrix(lats, lngs), start=start)
+    return order
+
+
+def _region_name(keys: Sequence[str], points: CityPoints) -> str:
+    anchor = sorted(keys, key=lambda k: (-points[k][2], k))[0]
+    city, _, _ = anchor.rpartition(", ")
+    states = sorted({k.rpartition(", ")[2] for k in keys} - {""})
+    return f"{city or anchor} area ({'/'.join(states)})" if states else f"{anchor} area"
+
+
+def load_cluster_state(path: Path = CLUSTER_STATE_PATH) -> Dict:
+    """Return the cached cluster assignments, or an empty state."""
+    try:
+        with path.open(encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cluster_state(state: Dict, path: Path = CLUSTER_STATE_PATH) -> None:
+    """Persist cluster assignments atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    with tmp_path.open("w", encoding="utf-8") as handle:
+        json.dump(state, handle, indent=1)
+    tmp_path.replace(path)
+
+
+def plan_route_clusters(
+    points: CityPoints,
+    region_radius: float = REGION_RADIUS_MILES,
+    day_radius: float = DAY_RADIUS_MILES,
+    max_shops_per_day: int = MAX_SHOPS_PER_DAY,
+    recompute: bool = False,
+    use_cache: bool = True,
+) -> Dict:
+    """
+    Group city points into ordered regions and day clusters.
+
+    ``points`` maps a city key (e.g. "Oakland, CA") to (lat, lng, shop count).
+    Returns {"regions": [{"name", "days": [[key, ...], ...]}], "reused", "added",
+    "removed", "reclustered"}, with regions, days and cities in driving order.
+    """
+    params = {"region_radius": region_radius, "day_radius": day_radius, "max_shops_per_day": max_shops_per_day}
+    state = load_cluster_state() if use_cache and not recompute else {}
+    if state.get("params") != params:
+        state = {}
+    cached_points = {key: tuple(value) for key, value in state.get("points", {}).items()}
+    current = {key: (float(lat), float(lng), int(shops)) for key, (lat, lng, shops) in points.items()}
+
+    changed = sorted(key for key, value in current.items() if cached_points.get(key) != value)
+    removed = set(cached_points) - set(current)
+    stale = set(changed) | removed
+
+    # Drop moved and removed cities from their cached days; those regions need re-clustering
+    regions: List[List[List[str]]] = []
+    dirty = set()
+    for region in state.get("regions", []):
+        days = [[key for key in day if key not in stale] for day in region.get("days", [])]
+        if days != region.get("days", []):
+            dirty.add(len(regions))
+        regions.append([day for day in days if day])
+
+    # New and moved cities join the nearest region whose centre is within the radius
+    pending = []
+    live = [i for i, region in enumerate(regions) if region]
+    if live and changed:
+        centres = [_centroid([key for day in regions[i] for key in day], current) for i in live]
+        lats = [current[key][0] for key in changed] + [c[0] for c in centres]
+        lngs = [current[key][1] for key in changed] + [c[1] for c in centres]
+        dist = haversine_matrix(lats, lngs)[:len(changed), len(changed):]
+        for row, key in enumerate(changed):
+            nearest = int(dist[row].argmin())
+            if dist[row, nearest] <= region_radius:
+                regions[live[nearest]].append([key])
+                dirty.add(live[nearest])
+            else:
+                pending.append(key)
+    else:
+        pending = list(changed)
+
+    clustered: List[List[List[str]]] = []
+    reclustered = 0
+    for i, region in enumerate(regions):
+        if not region:
+            continue
+        if i in dirty:
+            split = _split([key for day in region for key in day], current, params)
+            reclustered += len(split)
+            clustered.extend(split)
+        else:
+            clustered.append(region)
+    split = _split(pending, current, params)
+    reclustered += len(split)
+    clustered.extend(split)
+
+    # Driving order: regions from the north, then days and cities from wherever the route arrives
+    ordered = []
+    entry = None
+    for r in _route_order([_centroid([k for day in region for k in day], current) for region in clustered], None):
+        days = clustered[r]
+        ordered_days = []
+        for d in _route_order([_centroid(day, current) for day in days], entry):
+            day = days[d]
+            cities = [day[c] for c in _route_order([current[k][:2] for k in day], entry)]
+            entry = current[cities[-1]][:2]
+            ordered_days.append(cities)
+        ordered.append(ordered_days)
+
+    if use_cache:
+        save_cluster_state({
+            "version": 1,
+            "params": params,
+            "points": {key: list(value) for key, value in current.items()},
+            "regions": [{"days": days} for days in ordered],
+        })
+
+    return {
+        "regions": [
+            {"name": _region_name([k for day in days for k in day], current), "days": days}
+            for days in ordered
+        ],
+        "reused": len(current) - len(changed),
+        "added": len(changed),
+        "removed": len(removed),
+        "reclustered": reclustered,
+    }
+
+
+def city_points_from_rows(rows: Sequence[Dict]) -> CityPoints:
+    """Centroid and shop count per "City, ST" from Hit List rows with ``lat``/``lng``."""
+    sums: Dict[str, List[float]] = {}
+    for row in rows:
+        city = (row.get("City") or "").strip()
+        if not city:
+            continue
+        key = f"{city}, {(row.get('State') or '').strip()}"
+        acc = sums.setdefault(key, [0.0, 0.0, 0])
+        acc[0] += row["lat"]
+        acc[1] += row["lng"]
+        acc[2] += 1
+    return {key: (acc[0] / acc[2], acc[1] / acc[2], int(acc[2])) for key, acc in sums.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cluster Hit List cities into route regions and day trips.")
+    parser.add_argument("--csv", type=Path, default=HIT_LIST_CSV, help="Hit List CSV (from pull_hit_list.py).")
+    parser.add_argument("--region-radius", type=float, default=REGION_RADIUS_MILES, help="Max miles from a region centre.")
+    parser.add_argument("--day-radius", type=float, default=DAY_RADIUS_MILES, help="Max miles from a day's centre.")
+    parser.add_argument("--max-shops-per-day", type=int, default=MAX_SHOPS_PER_DAY)
+    parser.add_argument("--recompute", action="store_true", help="Ignore cached assignments and cluster from scratch.")
+    args = parser.parse_args()
+
+    stops = [s for s in load_hit_list_stops(args.csv) if s.get("Status", "") not in ("Partnered", "Rejected")]
+    points = city_points_from_rows(stops)
+    if not points:
+        print("No shops with coordinates found.")
+        return
+
+    t0 = time.perf_counter()
+    plan = plan_route_clusters(
+        points, args.region_radius, args.day_radius, args.max_shops_per_day, recompute=args.recompute
+    )
+    elapsed = (time.perf_counter() - t0) * 1000
+
+    for region in plan["regions"]:
+        print(f"\n🗺️  {region['name']}")
+        for number, day in enumerate(region["days"], start=1):
+            shops = sum(points[key][2] for key in day)
+            print(f"   Day {number}: {' → '.join(key.rpartition(', ')[0] for key in day)} ({shops} shops)")
+    days = sum(len(region["days"]) for region in plan["regions"])
+    print(
+        f"\n✅ {len(points)} cities → {len(plan['regions'])} regions, {days} days in {elapsed:.0f} ms "
+        f"({plan['reused']} cached, {plan['added']} new/moved, {plan['reclustered']} regions re-clustered)"
+    )
+
+
+if __name__ == "__main__":
+    main()
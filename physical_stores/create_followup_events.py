@@ -10,24 +10,39 @@ Usage:
 
 Events are created/updated for rows that have a "Follow Up Date" value. The script
 generates deterministic event IDs so it can be re-run without creating duplicates.
+
+Upserts are sent through the Calendar batch endpoint (up to 50 per HTTP round
+trip) and changed event links are written back in one sheet batch update.
+Events whose body hash matches what was last pushed (kept in
+``.cache/followup_events_state.json``) are skipped; pass ``--force`` to push
+everything again.
+
+Each description carries the shop's hours that day (opening_hours.py, from the
+Opening Hours column or the notes) and flags follow-ups that land on a closed
+day or outside opening hours, with the next day the shop is open. The dates
+themselves are left as entered, since event IDs are derived from them.
 """
 
 from __future__ import annotations
 
+import argparse
+import json
 import os
 import re
 from datetime import datetime, time, timedelta
 from pathlib import Path
 import hashlib
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
-import gspread
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from zoneinfo import ZoneInfo
 
+from google_clients import get_calendar_service, get_sheets_client, open_worksheet
+from opening_hours import format_hours, format_intervals, hours_from_row, next_open_day
+from sheet_cache import get_snapshot_cache
+from sheet_writes import SheetWriteBuffer
+
 
 SPREADSHEET_ID = "1eiqZr3LW-qEI6Hmy0Vrur_8flbRwxwA7jXVrbUnHbvc"
 SHEET_NAME = "Hit List"
@@ -41,6 +56,9 @@ SCOPES = [
     "https://www.googleapis.com/auth/calendar"
 ]
 
+STATE_PATH = Path(os.environ.get("PHYSICAL_STORES_CACHE_DIR", Path(__file__).parent / ".cache")) / "followup_events_state.json"
+CALENDAR_BATCH_SIZE = 50  # Calendar API limit per batch request
+
 # Default timezone for events (can be overridden with DEFAULT_TIMEZONE env var)
 DEFAULT_TIMEZONE = os.environ.get("DEFAULT_TIMEZONE", "America/Los_Angeles")
 
@@ -108,6 +126,25 @@ def parse_followup(value: str) -> Optional[Tuple[str, Optional[datetime], Option
         return None
 
 
+def hours_note(shop: dict, date_str: str, start_dt: Optional[datetime], end_dt: Optional[datetime]) -> str:
+    """Opening-hours line for the event description, warning when the shop is closed at the follow-up."""
+    weekly = hours_from_row(shop)
+    if weekly is None:
+        return ""
+    day = datetime.fromisoformat(date_str).date()
+    intervals = weekly.get(day.weekday(), [])
+    if not intervals:
+        reopen = next_open_day(weekly, day)
+        suggestion = f"; next open {reopen:%a %Y-%m-%d}" if reopen else ""
+        return f"⚠️ Closed on {day:%A}s{suggestion} (hours: {format_hours(weekly)})"
+    if start_dt and end_dt:
+        start = start_dt.hour * 60 + start_dt.minute
+        end = end_dt.hour * 60 + end_dt.minute
+        if not any(open_ <= start and end <= close for open_, close in intervals):
+            return f"⚠️ Outside opening hours (open {format_intervals(intervals)} that day)"
+    return f"Open {format_intervals(intervals)} that day"
+
+
 def build_event(shop: dict) -> Optional[dict]:
     followup_value = (
         shop.get("Follow Up Date")
@@ -143,6 +180,9 @@ def build_event(shop: dict) -> Optional[dict]:
         description_lines.append(f"Referral: {referral}")
     if product_interest:
         description_lines.append(f"Product Interest: {product_interest}")
+    hours = hours_note(shop, date_str, start_dt, end_dt)
+    if hours:
+        description_lines.append(hours)
     if notes:
         description_lines.append("\nNotes:\n" + notes)
 
@@ -182,7 +222,54 @@ def build_event(shop: dict) -> Optional[dict]:
     return event
 
 
+def event_hash(event: dict) -> str:
+    """Stable hash of an event body, used to skip unchanged upserts."""
+    return hashlib.sha256(json.dumps(event, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def load_event_state(calendar_id: str, path: Path = STATE_PATH) -> Dict[str, dict]:
+    """Return {event_id: {"hash", "link"}} last pushed to this calendar."""
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            return json.load(handle).get(calendar_id, {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_event_state(calendar_id: str, events: Dict[str, dict], path: Path = STATE_PATH) -> None:
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            state = json.load(handle)
+    except (OSError, ValueError):
+        state = {}
+    state[calendar_id] = events
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    with tmp_path.open("w", encoding="utf-8") as handle:
+        json.dump(state, handle, indent=2)
+    tmp_path.replace(path)
+
+
+def execute_batched(calendar_service, requests: List[Tuple[str, object]]) -> Dict[str, Tuple[Optional[dict], Optional[Exception]]]:
+    """Run (request_id, HttpRequest) pairs through BatchHttpRequest, CALENDAR_BATCH_SIZE at a time."""
+    results: Dict[str, Tuple[Optional[dict], Optional[Exception]]] = {}
+
+    def callback(request_id, response, exception):
+        results[request_id] = (response, exception)
+
+    for start in range(0, len(requests), CALENDAR_BATCH_SIZE):
+        batch = calendar_service.new_batch_http_request(callback=callback)
+        for request_id, request in requests[start:start + CALENDAR_BATCH_SIZE]:
+            batch.add(request, request_id=request_id)
+        batch.execute()
+    return results
+
+
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Create Google Calendar follow-up events from the Hit List.")
+    parser.add_argument("--force", action="store_true", help="Push every event, even if unchanged since the last run.")
+    args = parser.parse_args()
+
     load_dotenv()
     load_dotenv(".env.local", override=True)
 
@@ -190,14 +277,10 @@ def main() -> None:
     if not calendar_id:
         raise RuntimeError("GOOGLE_CALENDAR_ID environment variable is required")
 
-    credentials = Credentials.from_service_account_file(
-        SERVICE_ACCOUNT_FILE,
-        scopes=SCOPES
-    )
-
-    gc = gspread.authorize(credentials)
-    worksheet = gc.open_by_key(SPREADSHEET_ID).worksheet(SHEET_NAME)
-    values = worksheet.get_all_values()
+    # Sheets and Calendar share one set of credentials (and one token exchange)
+    gc = get_sheets_client(SERVICE_ACCOUNT_FILE, SCOPES)
+    snapshots = get_snapshot_cache(gc)
+    values = snapshots.get_all_values(SPREADSHEET_ID, SHEET_NAME)
 
     if not values or len(values) < 2:
         print("No data rows with follow-up information found.")
@@ -207,11 +290,15 @@ def main() -> None:
     index_map = {header: idx for idx, header in enumerate(headers)}
     follow_up_link_idx = index_map.get("Follow Up Event Link")
 
-    calendar_service = build("calendar", "v3", credentials=credentials)
+    calendar_service = get_calendar_service(SERVICE_ACCOUNT_FILE, SCOPES)
 
     created = 0
     updated = 0
     skipped = 0
+    unchanged = 0
+
+    pushed = {} if args.force else load_event_state(calendar_id)
+    pending: Dict[str, Tuple[int, List[str], dict, str]] = {}  # request id -> (row, values, event, hash)
 
     for row_number, row in enumerate(values[1:], start=2):
         row_data = {
@@ -229,36 +316,66 @@ def main() -> None:
             skipped += 1
             continue
 
-        try:
-            event_response = calendar_service.events().update(
-                calendarId=calendar_id,
-                eventId=event["id"],
-                body=event
-            ).execute()
+        body_hash = event_hash(event)
+        previous = pushed.get(event["id"])
+        existing_link = row[follow_up_link_idx] if follow_up_link_idx is not None and follow_up_link_idx < len(row) else ""
+        link_current = follow_up_link_idx is None or not previous or existing_link == previous.get("link", "")
+        if previous and previous.get("hash") == body_hash and link_current:
+            unchanged += 1
+            continue
+
+        pending[str(row_number)] = (row_number, row, event, body_hash)
+
+    events_api = calendar_service.events()
+    responses = execute_batched(calendar_service, [
+        (request_id, events_api.update(calendarId=calendar_id, eventId=event["id"], body=event))
+        for request_id, (_, _, event, _) in pending.items()
+    ])
+
+    missing = [
+        request_id for request_id, (_, error) in responses.items()
+        if isinstance(error, HttpError) and error.resp.status == 404
+    ]
+    inserted = execute_batched(calendar_service, [
+        (request_id, events_api.insert(calendarId=calendar_id, body=pending[request_id][2]))
+        for request_id in missing
+    ])
+    responses.update(inserted)
+
+    link_buffer = None
+    for request_id, (row_number, row, event, body_hash) in pending.items():
+        event_response, error = responses.get(request_id, (None, None))
+        if error is not None or event_response is None:
+            print(f"⚠️  Failed processing {event['summary']}: {error}")
+            skipped += 1
+            continue
+        if request_id in inserted:
+            created += 1
+            print(f"Created calendar event for {event['summary']}")
+        else:
             updated += 1
             print(f"Updated calendar event for {event['summary']}")
-        except HttpError as err:
-            if err.resp.status == 404:
-                event_response = calendar_service.events().insert(
-                    calendarId=calendar_id,
-                    body=event
-                ).execute()
-                created += 1
-                print(f"Created calendar event for {event['summary']}")
-            else:
-                print(f"⚠️  Failed processing {event['summary']}: {err}")
-                skipped += 1
-                continue
 
         event_link = event_response.get("htmlLink", "")
+        pushed[event["id"]] = {"hash": body_hash, "link": event_link}
         if follow_up_link_idx is not None and event_link:
             existing_link = row[follow_up_link_idx] if follow_up_link_idx < len(row) else ""
             if existing_link != event_link:
-                worksheet.update_cell(row_number, follow_up_link_idx + 1, event_link)
+                if link_buffer is None:
+                    worksheet = open_worksheet(gc, SPREADSHEET_ID, SHEET_NAME)
+                    link_buffer = SheetWriteBuffer(worksheet)
+                link_buffer.set(row_number, follow_up_link_idx + 1, event_link)
+
+    if link_buffer is not None:
+        link_buffer.flush()
+        snapshots.invalidate(SPREADSHEET_ID, SHEET_NAME)
+        print(f"Wrote {link_buffer.cell_writes} event link(s) back in {link_buffer.api_calls} batched update(s)")
+    save_event_state(calendar_id, pushed)
 
     print("\nSummary:")
     print(f"  Created events: {created}")
     print(f"  Updated events: {updated}")
+    print(f"  Unchanged events: {unchanged}")
     print(f"  Skipped rows: {skipped}")
 
 
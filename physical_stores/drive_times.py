@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Drive-time estimates between Hit List shops and cities.
+
+Replaces the ~35 hand-typed ``CITY_DRIVE_TIMES`` pairs in route_optimizer.py,
+which left most itinerary legs without an estimate. A leg's time comes from its
+straight-line (haversine) distance:
+
+  * road miles = straight-line miles x ``CIRCUITY`` (roads aren't straight)
+  * speed by distance band, so the first miles of any leg are at town speed and
+    only the long stretch runs at highway speed (see ``SPEED_BANDS``)
+  * a fixed ``LEG_OVERHEAD_MINUTES`` for parking and getting back on the road
+  * a single scale factor least-squares fitted to ``REFERENCE_DRIVE_TIMES`` for
+    the pairs whose cities are in the Hit List; those known pairs are used as-is
+
+Every shop and city in the Hit List goes into one all-pairs matrix of whole
+minutes (uint16), stored at ``.cache/drive_times.npz``. Later runs reuse the
+stored rows and compute only rows and columns for new or moved points, so the
+matrix stays current as shops are added. Lookups are O(1):
+
+    matrix, stats = build_drive_times(hit_list_points(rows))
+    matrix.minutes(city_key("Oakland", "CA"), city_key("Berkeley", "CA"))
+    matrix.submatrix([shop_key(name) for name in names])   # for routing.solve_visit_order
+
+Usage:
+    python3 drive_times.py "Oakland, CA" "Santa Cruz, CA"    # from data/hit_list.csv
+    python3 drive_times.py --rebuild
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from routing import EARTH_RADIUS_MILES, HIT_LIST_CSV, load_hit_list_stops
+
+DRIVE_TIME_PATH = Path(os.environ.get("PHYSICAL_STORES_CACHE_DIR", Path(__file__).parent / ".cache")) / "drive_times.npz"
+
+CIRCUITY = 1.3
+LEG_OVERHEAD_MINUTES = 5.0
+# (road miles up to, mph) - each band's speed applies only to the miles inside it
+SPEED_BANDS = ((3.0, 20.0), (15.0, 32.0), (50.0, 48.0), (float("inf"), 60.0))
+MIN_CALIBRATION_PAIRS = 3
+# Fresh matrix rows computed per step in DriveTimeMatrix.update
+FILL_CHUNK_ROWS = 256
+
+# Observed minutes between cities, used to calibrate the model and as exact values
+REFERENCE_DRIVE_TIMES = {
+    # Bay Area
+    ("San Francisco", "Oakland"): 20,
+    ("San Francisco", "Berkeley"): 25,
+    ("San Francisco", "San Jose"): 60,
+    ("San Francisco", "Palo Alto"): 45,
+    ("Oakland", "Berkeley"): 10,
+    ("Oakland", "San Jose"): 50,
+    ("Berkeley", "San Jose"): 55,
+    ("Palo Alto", "San Jose"): 20,
+
+    # Central California
+    ("San Jose", "Stockton"): 75,
+    ("Stockton", "Modesto"): 30,
+    ("Modesto", "Fresno"): 90,
+    ("Fresno", "Bakersfield"): 110,
+    ("Bakersfield", "Mojave"): 60,
+    ("Mojave", "Barstow"): 60,
+    ("Barstow", "Palm Springs"): 90,
+
+    # Coastal California
+    ("San Jose", "Monterey"): 60,
+    ("Monterey", "Big Sur"): 45,
+    ("Big Sur", "San Luis Obispo"): 90,
+    ("San Luis Obispo", "Paso Robles"): 30,
+    ("Paso Robles", "Santa Barbara"): 120,
+    ("Santa Barbara", "Ventura"): 30,
+    ("Ventura", "Los Angeles"): 60,
+
+    # Southern California
+    ("Los Angeles", "Palm Springs"): 120,
+    ("Palm Springs", "Indio"): 20,
+    ("Indio", "Niland"): 60,
+    ("Niland", "Blythe"): 45,
+    ("Blythe", "Needles"): 60,
+
+    # Arizona
+    ("Needles", "Kingman"): 90,
+    ("Kingman", "Lake Havasu City"): 60,
+    ("Lake Havasu City", "Parker"): 45,
+    ("Parker", "Quartzsite"): 30,
+}
+
+
+def shop_key(name: str) -> str:
+    return f"shop:{name.strip()}"
+
+
+def city_key(city: str, state: str = "") -> str:
+    return f"city:{city.strip()}, {state.strip()}"
+
+
+def haversine_cross(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Great-circle miles from each (lat, lng) row of ``a`` to each row of ``b``."""
+    lat1, lng1 = np.radians(a[:, :1]), np.radians(a[:, 1:])
+    lat2, lng2 = np.radians(b[:, 0])[None, :], np.radians(b[:, 1])[None, :]
+    h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+def model_minutes(miles: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    """Estimated minutes for straight-line ``miles`` (vectorized; 0 miles -> 0 minutes)."""
+    road = np.asarray(miles, dtype=float) * CIRCUITY
+    hours = np.zeros_like(road)
+    lower = 0.0
+    for upper, mph in SPEED_BANDS:
+        hours += np.clip(road - lower, 0.0, upper - lower) / mph
+        lower = upper
+    return np.where(road > 0, (hours * 60 + LEG_OVERHEAD_MINUTES) * scale, 0.0)
+
+
+def _reference_pairs(points: Dict[str, Tuple[float, float]]) -> List[Tuple[str, str, int]]:
+    """Reference pairs whose cities are both among ``points`` (matched by city name in any state)."""
+    by_name: Dict[str, List[str]] = {}
+    for key in points:
+        if key.startswith("city:"):
+            by_name.setdefault(key[5:].rpartition(", ")[0].lower(), []).append(key)
+    pairs = []
+    for (a, b), minutes in REFERENCE_DRIVE_TIMES.items():
+        for key_a in by_name.get(a.lower(), ()):
+            for key_b in by_name.get(b.lower(), ()):
+                pairs.append((key_a, key_b, minutes))
+    return pairs
+
+
+def calibrate(points: Dict[str, Tuple[float, float]]) -> float:
+    """Least-squares scale factor of the model against the reference pairs (1.0 if too few)."""
+    pairs = _reference_pairs(points)
+    if len(pairs) < MIN_CALIBRATION_PAIRS:
+        return 1.0
+    miles = np.array([
+        haversine_cross(np.array([points[a]]), np.array([points[b]]))[0, 0] for a, b, _ in pairs
+    ])
+    predicted = model_minutes(miles)
+    observed = np.array([minutes for _, _, minutes in pairs], dtype=float)
+    scale = float((predicted * observed).sum() / max((predicted ** 2).sum(), 1e-9))
+    # Rounded so small centroid shifts don't invalidate the whole stored matrix
+    return round(min(max(scale, 0.5), 2.0), 2)
+
+
+class DriveTimeMatrix:
+    """All-pairs drive minutes between named points, with O(1) lookups and incremental updates."""
+
+    def __init__(self, keys: Sequence[str], coords: np.ndarray, minutes: np.ndarray, scale: float = 1.0):
+        self.keys = list(keys)
+        self.coords = np.asarray(coords, dtype=float).reshape(-1, 2)
+        self.matrix = np.asarray(minutes, dtype=np.uint16).reshape(len(self.keys), len(self.keys))
+        self.scale = scale
+        self.index = {key: i for i, key in enumerate(self.keys)}
+
+    @staticmethod
+    def params(scale: float) -> str:
+        return json.dumps({
+            "circuity": CIRCUITY,
+            "overhead": LEG_OVERHEAD_MINUTES,
+            "bands": [[upper if upper != float("inf") else None, mph] for upper, mph in SPEED_BANDS],
+            "reference": sorted(f"{a}|{b}|{m}" for (a, b), m in REFERENCE_DRIVE_TIMES.items()),
+            "scale": scale,
+        }, sort_keys=True)
+
+    @classmethod
+    def load(cls, path: Path = DRIVE_TIME_PATH) -> Optional["DriveTimeMatrix"]:
+        """Return the stored matrix, or None if there isn't a readable one."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                params = str(data["params"])
+                matrix = cls(data["keys"].tolist(), data["coords"], data["minutes"], json.loads(params)["scale"])
+        except (OSError, KeyError, ValueError):
+            return None
+        # Stored with a different model (circuity, speeds, reference table): start over
+        return matrix if params == cls.params(matrix.scale) else None
+
+    def save(self, path: Path = DRIVE_TIME_PATH) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".npz.tmp")
+        with tmp_path.open("wb") as handle:
+            np.savez(
+                handle,
+                keys=np.array(self.keys, dtype=str),
+                coords=self.coords,
+                minutes=self.matrix,
+                params=np.array(self.params(self.scale)),
+            )
+        tmp_path.replace(path)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.index
+
+    def minutes(self, a: str, b: str) -> Optional[int]:
+        """Drive minutes from ``a`` to ``b``, or None if either point is unknown."""
+        i = self.index.get(a)
+        j = self.index.get(b)
+        if i is None or j is None:
+            return None
+        return int(self.matrix[i, j])
+
+    def submatrix(self, keys: Sequence[str]) -> np.ndarray:
+        """Minutes between ``keys`` (all must be known) as a float matrix for the route solver."""
+        idx = np.array([self.index[key] for key in keys], dtype=int)
+        return self.matrix[np.ix_(idx, idx)].astype(float)
+
+    def update(self, points: Dict[str, Tuple[float, float]]) -> Dict[str, int]:
+        """Make the matrix cover exactly ``points``, computing only rows/columns for new or moved points."""
+        keep = [
+            key for key in self.keys
+            if key in points and np.allclose(self.coords[self.index[key]], points[key], atol=1e-7)
+        ]
+        kept = set(keep)
+        fresh = [key for key in points if key not in kept]
+        keys = keep + fresh
+        coords = np.array([points[key] for key in keys], dtype=float).reshape(-1, 2)
+
+        minutes = np.zeros((len(keys), len(keys)), dtype=np.uint16)
+        if keep:
+            old = np.array([self.index[key] for key in keep], dtype=int)
+            minutes[:len(keep), :len(keep)] = self.matrix[np.ix_(old, old)]
+        # Only the new rows/columns: fresh x all, a chunk of rows at a time so the float
+        # temporaries stay small next to the uint16 matrix
+        for start in range(len(keep), len(keys), FILL_CHUNK_ROWS):
+            stop = min(start + FILL_CHUNK_ROWS, len(keys))
+            miles = haversine_cross(coords[start:stop], coords)
+            block = np.rint(np.minimum(model_minutes(miles, self.scale), 65535)).astype(np.uint16)
+            minutes[start:stop, :] = block
+            minutes[:, start:stop] = block.T
+
+        removed = len(self.keys) - len(keep)
+        self.keys, self.coords, self.matrix = keys, coords, minutes
+        self.index = {key: i for i, key in enumerate(keys)}
+        for a, b, observed in _reference_pairs(points):
+            self.matrix[self.index[a], self.index[b]] = observed
+            self.matrix[self.index[b], self.index[a]] = observed
+        return {"reused": len(keep), "added": len(fresh), "removed": removed}
+
+
+def build_drive_times(
+    points: Dict[str, Tuple[float, float]],
+    use_cache: bool = True,
+    rebuild: bool = False,
+) -> Tuple[DriveTimeMatrix, Dict[str, int]]:
+    """Return (matrix covering ``points``, update stats), reusing and refreshing the stored matrix."""
+    scale = calibrate(points)
+    matrix = DriveTimeMatrix.load() if use_cache and not rebuild else None
+    if matrix is None or matrix.scale != scale:
+        matrix = DriveTimeMatrix([], np.zeros((0, 2)), np.zeros((0, 0)), scale)
+    stats = matrix.update(points)
+    if use_cache and (stats["added"] or stats["removed"]):
+        matrix.save()
+    return matrix, stats
+
+
+def hit_list_points(rows: Iterable[Dict]) -> Dict[str, Tuple[float, float]]:
+    """Shop and city-centroid points from Hit List rows (header-keyed dicts) that have coordinates."""
+    points: Dict[str, Tuple[float, float]] = {}
+    cities: Dict[str, List[float]] = {}
+    for row in rows:
+        try:
+            lat = float(row.get("Latitude") or "")
+            lng = float(row.get("Longitude") or "")
+        except (TypeError, ValueError):
+            continue
+        name = (row.get("Shop Name") or "").strip()
+        if name:
+            points[shop_key(name)] = (lat, lng)
+        city = (row.get("City") or "").strip()
+        if city:
+            acc = cities.setdefault(city_key(city, row.get("State") or ""), [0.0, 0.0, 0])
+            acc[0] += lat
+            acc[1] += lng
+            acc[2] += 1
+    for key, acc in cities.items():
+        points[key] = (acc[0] / acc[2], acc[1] / acc[2])
+    return points
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Estimate drive times between Hit List shops and cities.")
+    parser.add_argument("origin", nargs="?", help='Shop name or "City, ST".')
+    parser.add_argument("destination", nargs="?", help='Shop name or "City, ST".')
+    parser.add_argument("--csv", type=Path, default=HIT_LIST_CSV, help="Hit List CSV (from pull_hit_list.py).")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute the stored matrix from scratch.")
+    args = parser.parse_args()
+
+    rows = load_hit_list_stops(args.csv)
+    t0 = time.perf_counter()
+    matrix, stats = build_drive_times(hit_list_points(rows), rebuild=args.rebuild)
+    elapsed = (time.perf_counter() - t0) * 1000
+    print(
+        f"🚗 {len(matrix)} points ({stats['reused']} reused, {stats['added']} new/moved, "
+        f"{stats['removed']} removed), scale {matrix.scale:.2f}, in {elapsed:.0f} ms"
+    )
+
+    if args.origin and args.destination:
+        def resolve(value):
+            key = city_key(*value.rsplit(", ", 1))
+            return key if key in matrix else shop_key(value)
+
+        minutes = matrix.minutes(resolve(args.origin), resolve(args.destination))
+        if minutes is None:
+            print("❌ Unknown shop or city (it needs coordinates in the Hit List)")
+        else:
+            print(f"{args.origin} → {args.destination}: {minutes} min")
+
+
+if __name__ == "__main__":
+    main()
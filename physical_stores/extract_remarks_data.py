@@ -3,58 +3,110 @@
 Extract structured information from a specific DApp Remarks submission
 and update the corresponding Hit List row with the extracted data.
 
+``--all-unprocessed`` does the same for every remark not yet marked Processed:
+both tabs are read once, each distinct remark is run through the extractors
+once (on a process pool for large backlogs), and every Hit List change is sent
+in a single batched update.
+
 Usage:
     python3 extract_remarks_data.py <submission_id>
     python3 extract_remarks_data.py 5f15fb03-cb19-4983-8d94-31be4e9a3956 --dry-run
+    python3 extract_remarks_data.py --all-unprocessed --dry-run
 """
 
 from __future__ import annotations
 
 import argparse
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+from google_clients import get_sheets_client, open_worksheet
+from sheet_cache import get_snapshot_cache
+from sheet_writes import SheetWriteBuffer
+from shop_resolver import resolver_for
 
-import gspread
-from google.oauth2.service_account import Credentials
+if TYPE_CHECKING:
+    import gspread
 
 SPREADSHEET_ID = "1eiqZr3LW-qEI6Hmy0Vrur_8flbRwxwA7jXVrbUnHbvc"
 HIT_LIST_SHEET = "Hit List"
 DAPP_REMARKS_SHEET = "DApp Remarks"
 
-SCOPES = [
-    "https://www.googleapis.com/auth/spreadsheets",
-    "https://www.googleapis.com/auth/drive",
+# Backlogs at least this large are extracted on a process pool
+PARALLEL_MIN_REMARKS = 5000
+
+# Hit List column for each extracted field
+FIELD_COLUMNS = {
+    'address': 'Address',
+    'city': 'City',
+    'state': 'State',
+    'phone': 'Phone',
+    'email': 'Email',
+    'website': 'Website',
+    'instagram': 'Instagram',
+    'contact_person': 'Contact Person',
+    'follow_up_date': 'Follow Up Date',
+}
+
+# Patterns are compiled once per process rather than on every extraction
+PHONE_PATTERNS = [
+    re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),  # US format
+    re.compile(r'\d{10}'),  # 10 digits
+]
+NON_DIGITS = re.compile(r'[^\d]')
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+WEBSITE_PATTERNS = [
+    re.compile(r'https?://[^\s]+'),
+    re.compile(r'www\.[^\s]+'),
+    re.compile(r'[a-zA-Z0-9-]+\.[a-zA-Z]{2,}(?:\.[a-zA-Z]{2,})?'),  # domain.com or domain.co.uk
+]
+INSTAGRAM_PATTERNS = [
+    re.compile(r'instagram\.com/([a-zA-Z0-9_.]+)', re.IGNORECASE),
+    re.compile(r'@([a-zA-Z0-9_.]+)', re.IGNORECASE),
+]
+STATE_PATTERN = re.compile(r'\b([A-Z]{2})\b')
+# Must end with a street suffix to avoid false positives
+ADDRESS_PATTERNS = [
+    re.compile(
+        r'(\d+\s+[A-Za-z0-9\s]+(?:St|Street|Ave|Avenue|Rd|Road|Blvd|Boulevard|Dr|Drive|Ln|Lane|Way|Ct|Court|Pl|Place|Blvd|Parkway|Pkwy))',
+        re.IGNORECASE,
+    ),
+]
+# Prioritize names that appear before "is", "was", "mentioned", etc.
+CONTACT_PATTERNS = [
+    re.compile(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+(?:is|was|will be|mentioned|said|still)', re.IGNORECASE),
+    re.compile(r'(?:call|contact|speak with|talk to|meet with|schedule with|to)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)', re.IGNORECASE),
+    re.compile(r'([A-Z][a-z]+)\s+(?:the|a|an)\s+(?:staff|manager|owner|contact)', re.IGNORECASE),
+]
+FOLLOW_UP_PATTERNS = [
+    re.compile(r'(?:next|this|on)\s+(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)', re.IGNORECASE),
+    re.compile(r'(?:next|this)\s+week', re.IGNORECASE),
+    re.compile(r'(?:next|this)\s+Friday', re.IGNORECASE),
+    re.compile(r'until\s+(?:this|next)\s+(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)', re.IGNORECASE),
 ]
 
 
-def get_google_sheets_client() -> gspread.Client:
-    creds_path = Path(__file__).parent / "google_credentials.json"
-    if not creds_path.exists():
-        raise FileNotFoundError(
-            f"Google credentials not found at {creds_path}. "
-            "Please add google_credentials.json with service account credentials."
-        )
+@lru_cache(maxsize=None)
+def city_pattern(state: str) -> re.Pattern:
+    """City is the capitalized word(s) right before the state abbreviation."""
+    return re.compile(rf'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?),?\s*{state}')
 
-    creds = Credentials.from_service_account_file(
-        str(creds_path),
-        scopes=SCOPES,
-    )
-    client = gspread.authorize(creds)
-    return client
+
+def get_google_sheets_client() -> "gspread.Client":
+    return get_sheets_client()
 
 
 def extract_phone(text: str) -> Optional[str]:
     """Extract phone number from text."""
     # Match various phone formats: (650) 420-5932, 650-420-5932, 650.420.5932, etc.
-    patterns = [
-        r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # US format
-        r'\d{10}',  # 10 digits
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text)
+    for pattern in PHONE_PATTERNS:
+        match = pattern.search(text)
         if match:
-            phone = re.sub(r'[^\d]', '', match.group())
+            phone = NON_DIGITS.sub('', match.group())
             if len(phone) == 10:
                 return f"({phone[:3]}) {phone[3:6]}-{phone[6:]}"
     return None
@@ -62,20 +114,14 @@ def extract_phone(text: str) -> Optional[str]:
 
 def extract_email(text: str) -> Optional[str]:
     """Extract email address from text."""
-    pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    match = re.search(pattern, text)
+    match = EMAIL_PATTERN.search(text)
     return match.group() if match else None
 
 
 def extract_website(text: str) -> Optional[str]:
     """Extract website URL from text."""
-    patterns = [
-        r'https?://[^\s]+',
-        r'www\.[^\s]+',
-        r'[a-zA-Z0-9-]+\.[a-zA-Z]{2,}(?:\.[a-zA-Z]{2,})?',  # domain.com or domain.co.uk
-    ]
-    for pattern in patterns:
-        matches = re.findall(pattern, text)
+    for pattern in WEBSITE_PATTERNS:
+        matches = pattern.findall(text)
         for match in matches:
             url = match.strip('.,;')
             if not url.startswith('http'):
@@ -88,12 +134,8 @@ def extract_website(text: str) -> Optional[str]:
 
 def extract_instagram(text: str) -> Optional[str]:
     """Extract Instagram handle or URL from text."""
-    patterns = [
-        r'instagram\.com/([a-zA-Z0-9_.]+)',
-        r'@([a-zA-Z0-9_.]+)',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in INSTAGRAM_PATTERNS:
+        match = pattern.search(text)
         if match:
             handle = match.group(1) if match.lastindex else match.group(0)
             if not handle.startswith('@'):
@@ -109,18 +151,13 @@ def extract_address(text: str) -> tuple[Optional[str], Optional[str], Optional[s
     state = None
     
     # Common state abbreviations
-    state_pattern = r'\b([A-Z]{2})\b'
-    state_match = re.search(state_pattern, text)
+    state_match = STATE_PATTERN.search(text)
     if state_match:
         state = state_match.group(1)
     
     # Try to find address patterns (number + street name with street suffix)
-    # Must end with a street suffix to avoid false positives
-    address_patterns = [
-        r'(\d+\s+[A-Za-z0-9\s]+(?:St|Street|Ave|Avenue|Rd|Road|Blvd|Boulevard|Dr|Drive|Ln|Lane|Way|Ct|Court|Pl|Place|Blvd|Parkway|Pkwy))',
-    ]
-    for pattern in address_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in ADDRESS_PATTERNS:
+        match = pattern.search(text)
         if match:
             potential_address = match.group(1).strip()
             # Filter out false positives (like "10 o'clock")
@@ -130,8 +167,7 @@ def extract_address(text: str) -> tuple[Optional[str], Optional[str], Optional[s
     
     # Try to find city (word before state or common city patterns)
     if state:
-        city_pattern = rf'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?),?\s*{state}'
-        city_match = re.search(city_pattern, text)
+        city_match = city_pattern(state).search(text)
         if city_match:
             city = city_match.group(1).strip()
     
@@ -141,15 +177,9 @@ def extract_address(text: str) -> tuple[Optional[str], Optional[str], Optional[s
 def extract_contact_person(text: str) -> Optional[str]:
     """Extract contact person name from text."""
     # Look for patterns like "[name] is", "[name] mentioned", "call [name]", etc.
-    # Prioritize names that appear before "is", "was", "mentioned", etc.
-    patterns = [
-        r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+(?:is|was|will be|mentioned|said|still)',
-        r'(?:call|contact|speak with|talk to|meet with|schedule with|to)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)',
-        r'([A-Z][a-z]+)\s+(?:the|a|an)\s+(?:staff|manager|owner|contact)',
-    ]
     found_names = []
-    for pattern in patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
+    for pattern in CONTACT_PATTERNS:
+        matches = pattern.finditer(text)
         for match in matches:
             name = match.group(1).strip()
             # Filter out common false positives
@@ -164,14 +194,8 @@ def extract_contact_person(text: str) -> Optional[str]:
 def extract_follow_up_date(text: str) -> Optional[str]:
     """Extract follow-up date information from text."""
     # Look for date patterns
-    patterns = [
-        r'(?:next|this|on)\s+(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)',
-        r'(?:next|this)\s+week',
-        r'(?:next|this)\s+Friday',
-        r'until\s+(?:this|next)\s+(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in FOLLOW_UP_PATTERNS:
+        match = pattern.search(text)
         if match:
             return match.group(0).strip()
     return None
@@ -221,16 +245,34 @@ def extract_structured_data(remarks: str) -> Dict[str, Optional[str]]:
     return extracted
 
 
-def find_submission_by_id(client: gspread.Client, submission_id: str) -> Optional[Dict]:
+def extract_all(remarks: Sequence[str], workers: Optional[int] = None) -> List[Dict[str, Optional[str]]]:
+    """Run ``extract_structured_data`` over many remarks, once per distinct text.
+
+    Backlogs of ``PARALLEL_MIN_REMARKS`` or more distinct remarks are spread over
+    a process pool (``workers`` processes, default: CPU count); pass ``workers=1``
+    to stay in-process.
+    """
+    unique = list(dict.fromkeys(remarks))
+    if workers is None:
+        workers = (os.cpu_count() or 1) if len(unique) >= PARALLEL_MIN_REMARKS else 1
+    if workers > 1 and len(unique) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(extract_structured_data, unique, chunksize=max(1, len(unique) // (workers * 4))))
+    else:
+        results = [extract_structured_data(text) for text in unique]
+    by_text = dict(zip(unique, results))
+    return [by_text[text] for text in remarks]
+
+
+def find_submission_by_id(client: "gspread.Client", submission_id: str) -> Optional[Dict]:
     """Find a submission in DApp Remarks by submission ID."""
-    spreadsheet = client.open_by_key(SPREADSHEET_ID)
-    
+    from gspread import WorksheetNotFound
+
     try:
-        remarks_ws = spreadsheet.worksheet(DAPP_REMARKS_SHEET)
-    except gspread.WorksheetNotFound:
+        remarks_values = get_snapshot_cache(client).get_all_values(SPREADSHEET_ID, DAPP_REMARKS_SHEET)
+    except WorksheetNotFound:
         raise ValueError(f'Worksheet "{DAPP_REMARKS_SHEET}" not found.')
     
-    remarks_values = remarks_ws.get_all_values()
     if len(remarks_values) < 2:
         return None
     
@@ -254,16 +296,15 @@ def find_submission_by_id(client: gspread.Client, submission_id: str) -> Optiona
     return None
 
 
-def find_shop_in_hit_list(client: gspread.Client, shop_name: str) -> Optional[Dict]:
-    """Find a shop in Hit List by name."""
-    spreadsheet = client.open_by_key(SPREADSHEET_ID)
-    
+def find_shop_in_hit_list(client: "gspread.Client", shop_name: str) -> Optional[Dict]:
+    """Find a shop in Hit List by name (exact, or a confident fuzzy match)."""
+    from gspread import WorksheetNotFound
+
     try:
-        hit_list_ws = spreadsheet.worksheet(HIT_LIST_SHEET)
-    except gspread.WorksheetNotFound:
+        hit_values = get_snapshot_cache(client).get_all_values(SPREADSHEET_ID, HIT_LIST_SHEET)
+    except WorksheetNotFound:
         raise ValueError(f'Worksheet "{HIT_LIST_SHEET}" not found.')
     
-    hit_values = hit_list_ws.get_all_values()
     if len(hit_values) < 2:
         return None
     
@@ -273,52 +314,38 @@ def find_shop_in_hit_list(client: gspread.Client, shop_name: str) -> Optional[Di
     if "Shop Name" not in headers_idx:
         raise ValueError('Missing "Shop Name" column in Hit List worksheet.')
     
-    shop_name_idx = headers_idx["Shop Name"]
-    
-    for row_num, row in enumerate(hit_values[1:], start=2):
-        if row[shop_name_idx].strip().lower() == shop_name.lower():
-            return {
-                'row_num': row_num,
-                'headers': headers,
-                'row': row,
-                'headers_idx': headers_idx,
-            }
+    # The resolver index is built once per snapshot, not scanned per call
+    match, candidates = resolver_for(hit_values).resolve(shop_name)
+    if not match:
+        if candidates:
+            print(f"  ℹ️  Closest Hit List name: '{candidates[0]['name']}' (score {candidates[0]['score']:.2f})")
+        return None
     
-    return None
+    return {
+        'row_num': match['row_num'],
+        'headers': headers,
+        'row': hit_values[match['row_num'] - 1],
+        'headers_idx': headers_idx,
+        'match': match,
+    }
 
 
-def update_hit_list_row(
-    client: gspread.Client,
+def plan_updates(
     shop_data: Dict,
     extracted_data: Dict[str, Optional[str]],
-    dry_run: bool = False
-) -> None:
-    """Update Hit List row with extracted data."""
-    spreadsheet = client.open_by_key(SPREADSHEET_ID)
-    hit_list_ws = spreadsheet.worksheet(HIT_LIST_SHEET)
-    
+    buffer: Optional[SheetWriteBuffer] = None,
+) -> List[Dict]:
+    """Return the Hit List cell changes for one shop; values already staged on ``buffer`` count as current."""
     row_num = shop_data['row_num']
     headers_idx = shop_data['headers_idx']
-    
+    row = shop_data['row']
     updates = []
-    
-    # Map extracted fields to Hit List columns
-    field_mapping = {
-        'address': 'Address',
-        'city': 'City',
-        'state': 'State',
-        'phone': 'Phone',
-        'email': 'Email',
-        'website': 'Website',
-        'instagram': 'Instagram',
-        'contact_person': 'Contact Person',
-        'follow_up_date': 'Follow Up Date',
-    }
-    
-    for field, column_name in field_mapping.items():
+    for field, column_name in FIELD_COLUMNS.items():
         if column_name in headers_idx and extracted_data[field]:
             col_idx = headers_idx[column_name] + 1  # 1-indexed
-            current_value = shop_data['row'][headers_idx[column_name]].strip()
+            current_value = row[col_idx - 1].strip() if col_idx - 1 < len(row) else ""
+            if buffer is not None:
+                current_value = str(buffer.get(row_num, col_idx, current_value)).strip()
             
             # Only update if current value is empty or different
             if not current_value or current_value != extracted_data[field]:
@@ -328,6 +355,18 @@ def update_hit_list_row(
                     'column_name': column_name,
                     'current': current_value,
                 })
+    return updates
+
+
+def update_hit_list_row(
+    client: "gspread.Client",
+    shop_data: Dict,
+    extracted_data: Dict[str, Optional[str]],
+    dry_run: bool = False
+) -> None:
+    """Update Hit List row with extracted data."""
+    row_num = shop_data['row_num']
+    updates = plan_updates(shop_data, extracted_data)
     
     if not updates:
         print("  ℹ️  No new data to update (all fields already filled or no data extracted).")
@@ -338,27 +377,122 @@ def update_hit_list_row(
         print(f"    - {update['column_name']}: '{update['current']}' → '{update['value']}'")
     
     if not dry_run:
+        buffer = SheetWriteBuffer(open_worksheet(client, SPREADSHEET_ID, HIT_LIST_SHEET))
         for update in updates:
-            hit_list_ws.update_cell(row_num, update['col'], update['value'])
+            buffer.set(row_num, update['col'], update['value'])
+        buffer.flush()
+        get_snapshot_cache(client).invalidate(SPREADSHEET_ID)
         print(f"\n  ✅ Successfully updated {len(updates)} field(s) in Hit List.")
     else:
         print(f"\n  🔍 DRY RUN: Would update {len(updates)} field(s) in Hit List.")
 
 
+def extract_all_unprocessed(client: "gspread.Client", dry_run: bool = False, workers: Optional[int] = None) -> int:
+    """Extract every remark not yet marked Processed and apply it in one batched Hit List update.
+
+    Returns the number of Hit List cells changed (or that would change on a dry run).
+    """
+    snapshots = get_snapshot_cache(client)
+    remarks_values = snapshots.get_all_values(SPREADSHEET_ID, DAPP_REMARKS_SHEET)
+    hit_values = snapshots.get_all_values(SPREADSHEET_ID, HIT_LIST_SHEET)
+    if len(remarks_values) < 2 or len(hit_values) < 2:
+        print("ℹ️  Nothing to extract (DApp Remarks or Hit List is empty).")
+        return 0
+    
+    remarks_idx = {header: idx for idx, header in enumerate(remarks_values[0])}
+    for col in ["Shop Name", "Remarks"]:
+        if col not in remarks_idx:
+            raise ValueError(f'Missing "{col}" column in DApp Remarks worksheet.')
+    hit_idx = {header: idx for idx, header in enumerate(hit_values[0])}
+    
+    def cell(row: List[str], col: str) -> str:
+        idx = remarks_idx.get(col)
+        return row[idx].strip() if idx is not None and idx < len(row) else ""
+    
+    pending = [
+        (row_num, row) for row_num, row in enumerate(remarks_values[1:], start=2)
+        if cell(row, "Processed").lower() != "yes" and cell(row, "Remarks")
+    ]
+    print(f"📋 {len(pending)} unprocessed remark(s) with text")
+    if not pending:
+        return 0
+    
+    extracted_rows = extract_all([cell(row, "Remarks") for _, row in pending], workers)
+    
+    resolver = resolver_for(hit_values)
+    # On a dry run the buffer only tracks staged values and is never flushed
+    buffer = SheetWriteBuffer(None if dry_run else open_worksheet(client, SPREADSHEET_ID, HIT_LIST_SHEET))
+    skipped = 0
+    shops_touched = set()
+    for (row_num, row), extracted in zip(pending, extracted_rows):
+        shop_name = cell(row, "Shop Name")
+        match, _ = resolver.resolve(shop_name) if shop_name else (None, [])
+        if not match:
+            print(f"  [SKIP] Row {row_num}: shop '{shop_name}' not found in Hit List.")
+            skipped += 1
+            continue
+        shop_data = {
+            'row_num': match['row_num'],
+            'row': hit_values[match['row_num'] - 1],
+            'headers_idx': hit_idx,
+        }
+        # Remarks are applied in sheet order, so a later remark for the same shop wins
+        updates = plan_updates(shop_data, extracted, buffer)
+        if not updates:
+            continue
+        shops_touched.add(match['row_num'])
+        print(f"  📝 Row {row_num} -> '{match['name']}' (Hit List row {match['row_num']}):")
+        for update in updates:
+            print(f"    - {update['column_name']}: '{update['current']}' → '{update['value']}'")
+            buffer.set(match['row_num'], update['col'], update['value'])
+    
+    if dry_run:
+        print(f"\n🔍 DRY RUN: Would update {len(buffer)} cell(s) across {len(shops_touched)} shop(s); skipped {skipped} remark(s).")
+        return len(buffer)
+    written = buffer.flush()
+    if written:
+        snapshots.invalidate(SPREADSHEET_ID)
+    print(
+        f"\n✅ Updated {written} cell(s) across {len(shops_touched)} shop(s) in "
+        f"{buffer.api_calls} API call(s); skipped {skipped} remark(s)."
+    )
+    return written
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Extract structured data from DApp Remarks submission and update Hit List."
     )
     parser.add_argument(
         "submission_id",
+        nargs="?",
         help="Submission ID to process (e.g., 5f15fb03-cb19-4983-8d94-31be4e9a3956)"
     )
+    parser.add_argument(
+        "--all-unprocessed",
+        action="store_true",
+        help="Extract every remark not yet marked Processed and apply them in one batched update."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help=f"Extraction processes for --all-unprocessed (default: CPU count for {PARALLEL_MIN_REMARKS}+ remarks, else 1)."
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
         help="Show actions without updating the sheet."
     )
     args = parser.parse_args()
+    if bool(args.submission_id) == args.all_unprocessed:
+        parser.error("pass either a submission ID or --all-unprocessed")
+    
+    if args.all_unprocessed:
+        print("=" * 80)
+        print("EXTRACTING DATA FROM ALL UNPROCESSED DAPP REMARKS")
+        print("=" * 80)
+        extract_all_unprocessed(get_google_sheets_client(), dry_run=args.dry_run, workers=args.workers)
+        return
     
     print("=" * 80)
     print("EXTRACTING DATA FROM DAPP REMARKS SUBMISSION")
@@ -401,6 +535,8 @@ def main():
         return
     
     print(f"\n✅ Found shop in Hit List (row {shop_data['row_num']})")
+    if not shop_data['match']['exact']:
+        print(f"  ℹ️  Fuzzy match: '{shop_name}' -> '{shop_data['match']['name']}' (score {shop_data['match']['score']:.2f})")
     
     # Extract structured data from remarks
     print(f"\n🔍 Extracting structured data from remarks...")
@@ -5,16 +5,11 @@ Adds shops to Google Sheet "LA Route"
 """
 
 import gspread
-from pathlib import Path
-from google.oauth2.service_account import Credentials
+from google_clients import get_sheets_client, open_spreadsheet, open_worksheet, remember_worksheet
 
 # Google Sheets configuration
 SPREADSHEET_ID = "1eiqZr3LW-qEI6Hmy0Vrur_8flbRwxwA7jXVrbUnHbvc"
 SERVICE_ACCOUNT_EMAIL = "agroverse-market-research@get-data-io.iam.gserviceaccount.com"
-SCOPES = [
-    'https://www.googleapis.com/auth/spreadsheets',
-    'https://www.googleapis.com/auth/drive'
-]
 
 # Shops along SF → LA → Slab City → Quartzite route
 # Ordered by driving route
@@ -292,33 +287,19 @@ SHOPS_LA_ROUTE = [
 ]
 
 def get_google_sheets_client():
-    """Authenticate and return Google Sheets client"""
-    creds_path = Path(__file__).parent / "google_credentials.json"
-    
-    if not creds_path.exists():
-        raise FileNotFoundError(
-            f"Google credentials not found at {creds_path}. "
-            "Please add google_credentials.json with service account credentials."
-        )
-    
-    creds = Credentials.from_service_account_file(
-        str(creds_path),
-        scopes=SCOPES
-    )
-    
-    client = gspread.authorize(creds)
-    return client
+    """Return the shared, authenticated Google Sheets client"""
+    return get_sheets_client()
 
 def create_shop_list_sheet(client, sheet_name="LA Route"):
     """Create or get shop list worksheet"""
     try:
-        spreadsheet = client.open_by_key(SPREADSHEET_ID)
+        spreadsheet = open_spreadsheet(client, SPREADSHEET_ID)
     except Exception as e:
         raise Exception(f"Could not access spreadsheet. Make sure it's shared with {SERVICE_ACCOUNT_EMAIL}. Error: {e}")
     
     # Try to get existing worksheet
     try:
-        worksheet = spreadsheet.worksheet(sheet_name)
+        worksheet = open_worksheet(client, SPREADSHEET_ID, sheet_name)
         print(f"Found existing worksheet: {sheet_name}")
     except gspread.WorksheetNotFound:
         # Create new worksheet
@@ -327,6 +308,7 @@ def create_shop_list_sheet(client, sheet_name="LA Route"):
             rows=100,
             cols=14
         )
+        remember_worksheet(client, SPREADSHEET_ID, worksheet)
         print(f"Created new worksheet: {sheet_name}")
     
     return worksheet
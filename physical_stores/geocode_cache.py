@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Durable SQLite cache for geocoding results.
+
+Keyed on a normalized "address, city, state" string so shops keep their
+coordinates even when the Hit List is cleared or a shop is renamed. Successful
+lookups are refreshed after ``ttl_days``; failures are cached too (negative
+caching) so an address Nominatim can't resolve is not retried on every run.
+
+Usage:
+    cache = GeocodeCache()
+    entry = cache.lookup(address, city, state) # None on miss / expired
+    cache.put(address, city, state, lat, lng)  # lat/lng None records a failure
+    print(cache.stats_summary())
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+DEFAULT_CACHE_PATH = Path(os.environ.get("PHYSICAL_STORES_CACHE_DIR", Path(__file__).parent / ".cache")) / "geocode.sqlite"
+
+# Coordinates rarely move; failed lookups are retried sooner in case the address was fixed.
+DEFAULT_TTL_DAYS = 180
+DEFAULT_NEGATIVE_TTL_DAYS = 14
+
+_STREET_ABBREVIATIONS = {
+    "street": "st",
+    "avenue": "ave",
+    "road": "rd",
+    "boulevard": "blvd",
+    "drive": "dr",
+    "lane": "ln",
+    "court": "ct",
+    "place": "pl",
+    "parkway": "pkwy",
+    "highway": "hwy",
+    "suite": "ste",
+    "north": "n",
+    "south": "s",
+    "east": "e",
+    "west": "w",
+}
+
+
+def normalize_address(address: str, city: str, state: str) -> str:
+    """Return a canonical lookup key for an address (case, punctuation and suffix insensitive)."""
+    text = f"{address} {city} {state}".lower()
+    text = re.sub(r"[^a-z0-9#\s]", " ", text)
+    tokens = [_STREET_ABBREVIATIONS.get(token, token) for token in text.split()]
+    return " ".join(tokens)
+
+
+class GeocodeCache:
+    """SQLite-backed geocode cache with TTL refresh, negative caching and hit/miss stats."""
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        ttl_days: float = DEFAULT_TTL_DAYS,
+        negative_ttl_days: float = DEFAULT_NEGATIVE_TTL_DAYS,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_days * 86400
+        self.negative_ttl_seconds = negative_ttl_days * 86400
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS geocodes (
+                key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                lat REAL,
+                lng REAL,
+                provider TEXT,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "stored": 0,
+        }
+
+    def lookup(self, address: str, city: str, state: str) -> Optional[Tuple[Optional[float], Optional[float]]]:
+        """Return (lat, lng) for a fresh entry, (None, None) for a fresh cached failure, or None."""
+        key = normalize_address(address, city, state)
+        row = self.conn.execute(
+            "SELECT lat, lng, fetched_at FROM geocodes WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.stats["misses"] += 1
+            return None
+
+        lat, lng, fetched_at = row
+        ttl = self.ttl_seconds if lat is not None else self.negative_ttl_seconds
+        if time.time() - fetched_at > ttl:
+            self.stats["expired"] += 1
+            return None
+
+        if lat is None or lng is None:
+            self.stats["negative_hits"] += 1
+            return None, None
+        self.stats["hits"] += 1
+        return lat, lng
+
+    def lookup_stale(self, address: str, city: str, state: str) -> Optional[Tuple[float, float]]:
+        """Return cached coordinates regardless of age (used in offline mode)."""
+        key = normalize_address(address, city, state)
+        row = self.conn.execute(
+            "SELECT lat, lng FROM geocodes WHERE key = ? AND lat IS NOT NULL", (key,)
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def put(
+        self,
+        address: str,
+        city: str,
+        state: str,
+        lat: Optional[float],
+        lng: Optional[float],
+        provider: str = "nominatim",
+    ) -> None:
+        """Store a result; pass lat/lng of None to record a failed lookup."""
+        key = normalize_address(address, city, state)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO geocodes (key, query, lat, lng, provider, fetched_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, f"{address}, {city}, {state}", lat, lng, provider, time.time()),
+        )
+        self.conn.commit()
+        self.stats["stored"] += 1
+
+    def seed(self, address: str, city: str, state: str, lat: float, lng: float, provider: str = "sheet") -> None:
+        """Record known coordinates (e.g. from the Hit List) without overwriting an existing entry."""
+        key = normalize_address(address, city, state)
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO geocodes (key, query, lat, lng, provider, fetched_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, f"{address}, {city}, {state}", lat, lng, provider, time.time()),
+        )
+        # Committed on close() - seeding runs once per shop and shouldn't fsync each row
+        self.stats["stored"] += cursor.rowcount
+
+    def stats_summary(self) -> str:
+        s = self.stats
+        lookups = s["hits"] + s["negative_hits"] + s["misses"] + s["expired"]
+        hit_rate = (s["hits"] + s["negative_hits"]) / lookups * 100 if lookups else 0.0
+        return (
+            f"geocode cache: {s['hits']} hit(s), {s['negative_hits']} cached failure(s), "
+            f"{s['misses']} miss(es), {s['expired']} expired, {s['stored']} stored "
+            f"({hit_rate:.0f}% hit rate)"
+        )
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
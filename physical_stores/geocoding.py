@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Pipelined, rate-limited geocoding for the Hit List.
+
+A ``GeocodePipeline`` runs lookups on a background worker so callers can keep
+building rows and writing the sheet while network requests are in flight.
+Each provider is throttled by its own token bucket (Nominatim allows 1 req/s)
+and providers are tried in order, so a local stand-in or a bulk geocoder can
+sit in front of (or replace) Nominatim.
+
+Usage:
+    pipeline = GeocodePipeline(build_providers("local,nominatim"))
+    pipeline.submit(shop_name, address, city, state)
+    ...                                  # do other work
+    for key, lat, lng, provider in pipeline.results():
+        ...
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from geocode_cache import normalize_address
+
+Coordinates = Tuple[float, float]
+Job = Tuple[str, str, str, str]  # (key, address, city, state)
+
+HIT_LIST_CSV = Path(__file__).parent / "data" / "hit_list.csv"
+USER_AGENT = "MarketResearchBot/1.0"  # Required by Nominatim
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``acquire()`` blocks until a request may be sent."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class GeocodeProvider:
+    """Base provider. ``geocode`` returns coordinates, None for "not found", or raises on transient errors."""
+
+    name = "provider"
+    uses_network = True
+    batch_size = 1
+
+    def __init__(self, requests_per_second: Optional[float] = None):
+        self.bucket = TokenBucket(requests_per_second) if requests_per_second else None
+
+    def throttle(self) -> None:
+        if self.bucket is not None:
+            self.bucket.acquire()
+
+    def geocode(self, address: str, city: str, state: str) -> Optional[Coordinates]:
+        raise NotImplementedError
+
+    def geocode_batch(self, jobs: Sequence[Job]) -> Dict[str, Optional[Coordinates]]:
+        """Geocode several jobs; providers with a bulk endpoint override this."""
+        results: Dict[str, Optional[Coordinates]] = {}
+        for key, address, city, state in jobs:
+            self.throttle()
+            results[key] = self.geocode(address, city, state)
+        return results
+
+
+class NominatimProvider(GeocodeProvider):
+    """OpenStreetMap Nominatim - free, no API key, 1 request per second."""
+
+    name = "nominatim"
+    url = "https://nominatim.openstreetmap.org/search"
+
+    def __init__(self, requests_per_second: float = 1.0, timeout: float = 10):
+        super().__init__(requests_per_second)
+        self.timeout = timeout
+        self._session = None
+
+    def geocode(self, address: str, city: str, state: str) -> Optional[Coordinates]:
+        import requests
+
+        if self._session is None:
+            self._session = requests.Session()
+            self._session.headers["User-Agent"] = USER_AGENT
+        response = self._session.get(
+            self.url,
+            params={"q": f"{address}, {city}, {state}", "format": "json", "limit": 1},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        data = response.json()
+        if data:
+            return float(data[0]["lat"]), float(data[0]["lon"])
+        return None
+
+
+class CensusBatchProvider(GeocodeProvider):
+    """US Census Bureau batch geocoder - up to 10,000 US addresses per request."""
+
+    name = "census"
+    batch_size = 1000
+    url = "https://geocoding.geo.census.gov/geocoder/locations/addressbatch"
+
+    def __init__(self, requests_per_second: float = 1.0, timeout: float = 300):
+        super().__init__(requests_per_second)
+        self.timeout = timeout
+
+    def geocode(self, address: str, city: str, state: str) -> Optional[Coordinates]:
+        return self.geocode_batch([("0", address, city, state)])["0"]
+
+    def geocode_batch(self, jobs: Sequence[Job]) -> Dict[str, Optional[Coordinates]]:
+        import requests
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        ids = {}
+        for idx, (key, address, city, state) in enumerate(jobs):
+            ids[str(idx)] = key
+            writer.writerow([idx, address, city, state, ""])
+
+        self.throttle()
+        response = requests.post(
+            self.url,
+            data={"benchmark": "Public_AR_Current"},
+            files={"addressFile": ("addresses.csv", buffer.getvalue(), "text/csv")},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+
+        results: Dict[str, Optional[Coordinates]] = {key: None for key in ids.values()}
+        for row in csv.reader(io.StringIO(response.text)):
+            # id, input address, Match/No_Match/Tie, match type, matched address, "lon,lat", ...
+            if len(row) >= 6 and row[0] in ids and row[2] == "Match" and row[5]:
+                lon, lat = (float(part) for part in row[5].split(","))
+                results[ids[row[0]]] = (lat, lon)
+        return results
+
+
+class LocalSnapshotProvider(GeocodeProvider):
+    """Offline stand-in that resolves addresses from coordinates in the local Hit List CSV."""
+
+    name = "local"
+    uses_network = False
+
+    def __init__(self, csv_path: Path = HIT_LIST_CSV):
+        super().__init__(None)
+        self.coordinates: Dict[str, Coordinates] = {}
+        if Path(csv_path).exists():
+            with open(csv_path, newline="", encoding="utf-8-sig") as handle:
+                for row in csv.DictReader(handle):
+                    try:
+                        lat = float(row.get("Latitude") or "")
+                        lng = float(row.get("Longitude") or "")
+                    except ValueError:
+                        continue
+                    key = normalize_address(row.get("Address", ""), row.get("City", ""), row.get("State", ""))
+                    self.coordinates[key] = (lat, lng)
+
+    def geocode(self, address: str, city: str, state: str) -> Optional[Coordinates]:
+        return self.coordinates.get(normalize_address(address, city, state))
+
+
+PROVIDERS = {
+    "local": LocalSnapshotProvider,
+    "census": CensusBatchProvider,
+    "nominatim": NominatimProvider,
+}
+
+
+def build_providers(spec: str, rates: Optional[Dict[str, float]] = None) -> List[GeocodeProvider]:
+    """Build providers from a comma-separated list such as ``"local,nominatim"``.
+
+    ``rates`` optionally overrides requests-per-second for network providers by name.
+    """
+    providers = []
+    for name in [part.strip() for part in spec.split(",") if part.strip()]:
+        if name not in PROVIDERS:
+            raise ValueError(f"Unknown geocoder '{name}'. Choose from: {', '.join(PROVIDERS)}")
+        provider_cls = PROVIDERS[name]
+        if rates and name in rates and provider_cls.uses_network:
+            providers.append(provider_cls(requests_per_second=rates[name]))
+        else:
+            providers.append(provider_cls())
+    return providers
+
+
+_STOP = object()
+
+
+class GeocodePipeline:
+    """Background geocoding worker that streams results back as they complete."""
+
+    def __init__(self, providers: Sequence[GeocodeProvider], offline: bool = False):
+        self.providers = [p for p in providers if not (offline and p.uses_network)]
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._results: "queue.Queue" = queue.Queue()
+        self._submitted = 0
+        self._received = 0
+        self._worker = threading.Thread(target=self._run, name="geocode-worker", daemon=True)
+        self._worker.start()
+
+    def submit(self, key: str, address: str, city: str, state: str) -> None:
+        self._jobs.put((key, address, city, state))
+        self._submitted += 1
+
+    @property
+    def pending(self) -> int:
+        return self._submitted - self._received
+
+    def _next_batch(self, first: Job, limit: int) -> List[Job]:
+        batch = [first]
+        while len(batch) < limit:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is _STOP:
+                self._jobs.put(_STOP)
+                break
+            batch.append(job)
+        return batch
+
+    def _run(self) -> None:
+        limit = max((p.batch_size for p in self.providers), default=1)
+        while True:
+            job = self._jobs.get()
+            if job is _STOP:
+                return
+            pending = self._next_batch(job, limit)
+            errored = set()
+            for provider in self.providers:
+                if not pending:
+                    break
+                unresolved = []
+                for start in range(0, len(pending), provider.batch_size):
+                    chunk = pending[start:start + provider.batch_size]
+                    try:
+                        found = provider.geocode_batch(chunk)
+                    except Exception as exc:  # pylint: disable=broad-except
+                        print(f"  ⚠ {provider.name} geocoding failed for {len(chunk)} address(es): {exc}")
+                        errored.update(key for key, *_ in chunk)
+                        unresolved.extend(chunk)
+                        continue
+                    for chunk_job in chunk:
+                        coords = found.get(chunk_job[0])
+                        if coords:
+                            self._results.put((chunk_job[0], coords[0], coords[1], provider.name))
+                        else:
+                            unresolved.append(chunk_job)
+                pending = unresolved
+            for key, *_ in pending:
+                # provider "error" means transient - callers shouldn't cache it as not-found
+                self._results.put((key, None, None, "error" if key in errored else None))
+
+    def results(self, timeout: Optional[float] = None) -> Iterator[Tuple[str, Optional[float], Optional[float], Optional[str]]]:
+        """Yield (key, lat, lng, provider) for every submitted job, in completion order."""
+        while self.pending > 0:
+            result = self._results.get(timeout=timeout)
+            self._received += 1
+            yield result
+
+    def poll(self) -> Iterator[Tuple[str, Optional[float], Optional[float], Optional[str]]]:
+        """Yield only the results that are already available, without blocking."""
+        while self.pending > 0:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                return
+            self._received += 1
+            yield result
+
+    def close(self) -> None:
+        self._jobs.put(_STOP)
+        self._worker.join(timeout=1)
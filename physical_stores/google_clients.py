@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Shared, lazily initialised Google API clients for the physical_stores scripts.
+
+Every script used to load the service-account file, authorize its own gspread
+client and call ``open_by_key`` / ``worksheet`` wherever it needed a handle,
+paying the token exchange and spreadsheet metadata requests again each time.
+This module keeps one set of credentials, one authorized gspread client (a
+keep-alive ``requests`` session) and one Calendar service per credentials file
+and scope set, and memoizes opened spreadsheet and worksheet handles.
+
+gspread, google-auth and googleapiclient are imported on first use, so
+``--help`` and offline code paths don't pay for them.
+
+Set ``SHEETS_EMULATOR=/path/to/sheets.sqlite`` to point every Sheets client at
+the local emulator in sheets_emulator.py instead of Google.
+
+Usage:
+    client = get_sheets_client()
+    worksheet = open_worksheet(client, SPREADSHEET_ID, "Hit List")
+    calendar = get_calendar_service(credentials_path, CALENDAR_SCOPES)
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+DEFAULT_CREDENTIALS_PATH = Path(__file__).parent / "google_credentials.json"
+
+SHEETS_SCOPES = (
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+)
+CALENDAR_SCOPES = SHEETS_SCOPES + ("https://www.googleapis.com/auth/calendar",)
+
+_credentials: Dict[Tuple[str, Tuple[str, ...]], object] = {}
+_sheets_clients: Dict[Tuple[str, Tuple[str, ...]], object] = {}
+_calendar_services: Dict[Tuple[str, Tuple[str, ...]], object] = {}
+_spreadsheets: Dict[Tuple[int, str], object] = {}
+_worksheets: Dict[Tuple[int, str], Dict[str, object]] = {}
+
+
+def _key(path: Path, scopes: Sequence[str]) -> Tuple[str, Tuple[str, ...]]:
+    return str(Path(path).resolve()), tuple(scopes)
+
+
+def get_credentials(path: Path = DEFAULT_CREDENTIALS_PATH, scopes: Sequence[str] = SHEETS_SCOPES):
+    """Return cached service-account credentials for ``path`` and ``scopes``."""
+    key = _key(path, scopes)
+    if key not in _credentials:
+        if not Path(path).exists():
+            raise FileNotFoundError(
+                f"Google credentials not found at {path}. "
+                "Please add google_credentials.json with service account credentials."
+            )
+        from google.oauth2.service_account import Credentials
+
+        _credentials[key] = Credentials.from_service_account_file(str(path), scopes=list(scopes))
+    return _credentials[key]
+
+
+def get_sheets_client(path: Path = DEFAULT_CREDENTIALS_PATH, scopes: Sequence[str] = SHEETS_SCOPES):
+    """Return the shared authorized gspread client (one HTTP session per credentials/scopes)."""
+    emulator_path = os.environ.get("SHEETS_EMULATOR")
+    if emulator_path:
+        key = ("emulator", (emulator_path,))
+        if key not in _sheets_clients:
+            from sheets_emulator import EmulatedClient
+
+            _sheets_clients[key] = EmulatedClient(emulator_path)
+        return _sheets_clients[key]
+
+    key = _key(path, scopes)
+    if key not in _sheets_clients:
+        import gspread
+
+        _sheets_clients[key] = gspread.authorize(get_credentials(path, scopes))
+    return _sheets_clients[key]
+
+
+def get_calendar_service(path: Path = DEFAULT_CREDENTIALS_PATH, scopes: Sequence[str] = CALENDAR_SCOPES):
+    """Return the shared Calendar v3 service."""
+    key = _key(path, scopes)
+    if key not in _calendar_services:
+        from googleapiclient.discovery import build
+
+        _calendar_services[key] = build("calendar", "v3", credentials=get_credentials(path, scopes))
+    return _calendar_services[key]
+
+
+def open_spreadsheet(client, spreadsheet_id: str):
+    """Return a memoized ``open_by_key`` handle."""
+    key = (id(client), spreadsheet_id)
+    if key not in _spreadsheets:
+        _spreadsheets[key] = client.open_by_key(spreadsheet_id)
+    return _spreadsheets[key]
+
+
+def open_worksheet(client, spreadsheet_id: str, title: str):
+    """Return a memoized worksheet handle, raising ``gspread.WorksheetNotFound`` if it doesn't exist.
+
+    The first lookup lists every worksheet in one request, so later titles are free.
+    """
+    key = (id(client), spreadsheet_id)
+    handles = _worksheets.get(key)
+    if handles is None or title not in handles:
+        # Unknown title: refresh once in case the worksheet was added since the last listing
+        handles = {ws.title: ws for ws in open_spreadsheet(client, spreadsheet_id).worksheets()}
+        _worksheets[key] = handles
+    if title not in handles:
+        import gspread
+
+        raise gspread.WorksheetNotFound(title)
+    return handles[title]
+
+
+def remember_worksheet(client, spreadsheet_id: str, worksheet) -> None:
+    """Record a worksheet created with ``add_worksheet`` so it needn't be looked up again."""
+    _worksheets.setdefault((id(client), spreadsheet_id), {})[worksheet.title] = worksheet
+
+
+def forget_worksheet(client, spreadsheet_id: str, title: Optional[str] = None) -> None:
+    """Drop memoized worksheet handles after a worksheet is deleted or renamed."""
+    key = (id(client), spreadsheet_id)
+    if title is None:
+        _worksheets.pop(key, None)
+    elif key in _worksheets:
+        _worksheets[key].pop(title, None)
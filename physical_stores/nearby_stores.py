@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Local nearby-store queries over the Hit List snapshot.
+
+Mirrors ``findNearbyStores`` in find_nearby_stores.gs without the Apps Script
+round trip: stores from ``data/hit_list.csv`` (written by pull_hit_list.py) are
+loaded into a KD-tree over unit-sphere coordinates, so k-nearest, radius and
+status-filtered queries run in well under a millisecond instead of scanning
+and sorting every row. ``--open-now`` / ``--open-on`` keep only stores open at
+that time or on that weekday, using the slot bitmap in opening_hours.py; stores
+with unknown hours are left out unless ``--include-unknown-hours`` is given.
+
+Usage:
+    python3 nearby_stores.py --lat 37.7749 --lng -122.4194                # 10 nearest "Contacted"
+    python3 nearby_stores.py --lat 37.7749 --lng -122.4194 --status ""    # any status
+    python3 nearby_stores.py --lat 34.05 --lng -118.24 --radius 25 --limit 50
+    python3 nearby_stores.py --lat 37.7749 --lng -122.4194 --status "" --open-now
+    python3 nearby_stores.py --lat 37.7749 --lng -122.4194 --status "" --open-on sat --at 11:00
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import heapq
+import json
+import math
+import random
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from opening_hours import OpeningHoursIndex, format_hours, parse_weekday
+
+EARTH_RADIUS_MILES = 3959  # Same constant as calculateDistance() in find_nearby_stores.gs
+HIT_LIST_CSV = Path(__file__).parent / "data" / "hit_list.csv"
+DEFAULT_STATUS = "Contacted"
+LEAF_SIZE = 16
+
+# (weekday, minute after midnight or None for "any time that day")
+OpenAt = Tuple[int, Optional[int]]
+
+# Hit List header -> store field, matching the objects returned by findNearbyStores
+FIELD_NAMES = {
+    "Shop Name": "name",
+    "Shop Type": "shop_type",
+    "Sales Process Notes": "sales_process_notes",
+}
+
+
+def _field_name(header: str) -> str:
+    return FIELD_NAMES.get(header, header.strip().lower().replace(" ", "_"))
+
+
+def to_unit_vectors(lats: Sequence[float], lngs: Sequence[float]) -> np.ndarray:
+    """Project lat/lng onto the unit sphere; chord length is monotonic in great-circle distance."""
+    lat = np.radians(np.asarray(lats, dtype=float))
+    lng = np.radians(np.asarray(lngs, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lng), cos_lat * np.sin(lng), np.sin(lat)))
+
+
+def chord_to_miles(chord: float) -> float:
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, chord / 2))
+
+
+def miles_to_chord(miles: float) -> float:
+    return 2 * math.sin(min(math.pi / 2, miles / (2 * EARTH_RADIUS_MILES)))
+
+
+class KDTree:
+    """Static 3-d KD-tree with bucketed leaves, built once per snapshot."""
+
+    def __init__(self, points: np.ndarray, leaf_size: int = LEAF_SIZE):
+        self.points = points
+        self.order = np.arange(len(points))
+        self.leaf_size = leaf_size
+        # node: [start, end, split_dim, split_value, left, right]; leaves have left == -1
+        self.nodes: List[List] = []
+        if len(points):
+            self._build(0, len(points))
+
+    def _build(self, start: int, end: int) -> int:
+        node_id = len(self.nodes)
+        self.nodes.append([start, end, -1, 0.0, -1, -1])
+        if end - start <= self.leaf_size:
+            return node_id
+        idx = self.order[start:end]
+        pts = self.points[idx]
+        dim = int(np.argmax(pts.max(axis=0) - pts.min(axis=0)))
+        mid = (end - start) // 2
+        part = np.argpartition(pts[:, dim], mid)
+        self.order[start:end] = idx[part]
+        split = float(self.points[self.order[start + mid], dim])
+        left = self._build(start, start + mid)
+        right = self._build(start + mid, end)
+        self.nodes[node_id][2:] = [dim, split, left, right]
+        return node_id
+
+    def _leaf_d2(self, node: List, target: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        idx = self.order[node[0]:node[1]]
+        diff = self.points[idx] - target
+        return idx, np.einsum("ij,ij->i", diff, diff)
+
+    def knn(self, target: np.ndarray, k: int) -> List[Tuple[float, int]]:
+        """Return up to k (squared chord, point index) pairs, nearest first."""
+        if not self.nodes or k <= 0:
+            return []
+        heap: List[Tuple[float, int]] = []  # max-heap via negated distances
+
+        def visit(node_id: int) -> None:
+            node = self.nodes[node_id]
+            if node[4] == -1:
+                idx, d2 = self._leaf_d2(node, target)
+                for dist2, point in zip(d2.tolist(), idx.tolist()):
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-dist2, point))
+                    elif dist2 < -heap[0][0]:
+                        heapq.heapreplace(heap, (-dist2, point))
+                return
+            delta = target[node[2]] - node[3]
+            near, far = (node[4], node[5]) if delta < 0 else (node[5], node[4])
+            visit(near)
+            if len(heap) < k or delta * delta < -heap[0][0]:
+                visit(far)
+
+        visit(0)
+        return sorted((-neg, point) for neg, point in heap)
+
+    def within(self, target: np.ndarray, radius_chord: float) -> List[Tuple[float, int]]:
+        """Return (squared chord, point index) pairs within the radius, nearest first."""
+        if not self.nodes:
+            return []
+        r2 = radius_chord * radius_chord
+        found: List[Tuple[float, int]] = []
+        stack = [0]
+        while stack:
+            node = self.nodes[stack.pop()]
+            if node[4] == -1:
+                idx, d2 = self._leaf_d2(node, target)
+                mask = d2 <= r2
+                found.extend(zip(d2[mask].tolist(), idx[mask].tolist()))
+                continue
+            delta = target[node[2]] - node[3]
+            near, far = (node[4], node[5]) if delta < 0 else (node[5], node[4])
+            stack.append(near)
+            if delta * delta <= r2:
+                stack.append(far)
+        found.sort()
+        return found
+
+
+class StoreIndex:
+    """Spatial index over Hit List stores with per-status sub-indexes."""
+
+    def __init__(self, stores: List[Dict]):
+        self.stores = stores
+        self._trees: Dict[Tuple, Tuple[KDTree, List[int]]] = {}
+        self._hours: Optional[OpeningHoursIndex] = None
+        self._hours_rows: Optional[np.ndarray] = None
+
+    @property
+    def hours(self) -> OpeningHoursIndex:
+        """Opening hours per store, built on first use (the Opening Hours column, else the notes)."""
+        if self._hours is None:
+            self._hours = OpeningHoursIndex.from_rows(self.stores)
+            self._hours_rows = np.array(
+                [self._hours.position.get(store.get("name", "").strip(), -1) for store in self.stores], dtype=int
+            )
+        return self._hours
+
+    def open_mask(self, open_at: OpenAt, include_unknown: bool = False) -> np.ndarray:
+        """Bool per store: open at ``open_at`` (stores with unknown hours count as ``include_unknown``)."""
+        hours = self.hours
+        rows = self._hours_rows
+        known = rows >= 0
+        mask = np.full(len(self.stores), include_unknown)
+        mask[known] = np.where(hours.known[rows[known]], hours.open_mask(*open_at)[rows[known]], include_unknown)
+        return mask
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Dict[str, str]]) -> "StoreIndex":
+        stores = []
+        for row in rows:
+            try:
+                lat = float(row.get("Latitude") or "")
+                lng = float(row.get("Longitude") or "")
+            except ValueError:
+                continue  # Same as the Apps Script: skip rows without coordinates
+            if math.isnan(lat) or math.isnan(lng):
+                continue
+            store = {_field_name(header): (value or "") for header, value in row.items() if header}
+            store["status"] = (row.get("Status") or "").strip()
+            store["latitude"] = lat
+            store["longitude"] = lng
+            stores.append(store)
+        return cls(stores)
+
+    @classmethod
+    def from_csv(cls, path: Path = HIT_LIST_CSV) -> "StoreIndex":
+        with open(path, newline="", encoding="utf-8-sig") as handle:
+            return cls.from_rows(list(csv.DictReader(handle)))
+
+    def _tree(
+        self, status: Optional[str], open_at: Optional[OpenAt] = None, include_unknown: bool = False
+    ) -> Tuple[KDTree, List[int]]:
+        status = status.strip() if status is not None else None
+        if open_at is not None and open_at[1] is not None:
+            open_at = (open_at[0], open_at[1] - open_at[1] % 15)  # one sub-index per bitmap slot
+        key = (status, open_at, include_unknown if open_at is not None else False)
+        if key not in self._trees:
+            is_open = self.open_mask(open_at, include_unknown) if open_at is not None else None
+            members = [
+                i for i, s in enumerate(self.stores)
+                if (status is None or s["status"] == status) and (is_open is None or is_open[i])
+            ]
+            points = to_unit_vectors(
+                [self.stores[i]["latitude"] for i in members],
+                [self.stores[i]["longitude"] for i in members],
+            ) if members else np.empty((0, 3))
+            self._trees[key] = (KDTree(points), members)
+        return self._trees[key]
+
+    def _results(self, hits: List[Tuple[float, int]], members: List[int], open_at: Optional[OpenAt]) -> List[Dict]:
+        results = []
+        for dist2, point in hits:
+            store = dict(self.stores[members[point]])
+            store["distance"] = round(chord_to_miles(math.sqrt(dist2)), 1)
+            if open_at is not None and not store.get("opening_hours"):
+                store["opening_hours"] = format_hours(self.hours.get(store.get("name", "").strip()))
+            results.append(store)
+        return results
+
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        limit: int = 10,
+        status: Optional[str] = DEFAULT_STATUS,
+        open_at: Optional[OpenAt] = None,
+        include_unknown: bool = False,
+    ) -> List[Dict]:
+        """k nearest stores, optionally filtered by exact status (None = any status) and opening hours."""
+        tree, members = self._tree(status, open_at, include_unknown)
+        target = to_unit_vectors([lat], [lng])[0]
+        return self._results(tree.knn(target, limit), members, open_at)
+
+    def within_radius(
+        self,
+        lat: float,
+        lng: float,
+        radius_miles: float,
+        status: Optional[str] = DEFAULT_STATUS,
+        limit: Optional[int] = None,
+        open_at: Optional[OpenAt] = None,
+        include_unknown: bool = False,
+    ) -> List[Dict]:
+        """Stores within ``radius_miles``, nearest first, optionally filtered by status and opening hours."""
+        tree, members = self._tree(status, open_at, include_unknown)
+        target = to_unit_vectors([lat], [lng])[0]
+        hits = tree.within(target, miles_to_chord(radius_miles))
+        return self._results(hits[:limit] if limit else hits, members, open_at)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Find nearby stores from the local Hit List snapshot.")
+    parser.add_argument("--lat", type=float, required=True)
+    parser.add_argument("--lng", type=float, required=True)
+    parser.add_argument("--limit", type=int, default=10, help="Maximum number of results (default: 10).")
+    parser.add_argument(
+        "--status",
+        default=DEFAULT_STATUS,
+        help='Status filter (default: "Contacted"). Pass an empty string for all statuses.',
+    )
+    parser.add_argument("--radius", type=float, help="Only return stores within this many miles.")
+    parser.add_argument("--csv", type=Path, default=HIT_LIST_CSV, help="Hit List CSV (from pull_hit_list.py).")
+    parser.add_argument("--open-now", action="store_true", help="Only stores open right now.")
+    parser.add_argument("--open-on", metavar="DAY", help="Only stores open on this weekday (e.g. sat).")
+    parser.add_argument("--at", metavar="HH:MM", help="With --open-on, only stores open at this time.")
+    parser.add_argument(
+        "--include-unknown-hours",
+        action="store_true",
+        help="Keep stores whose hours aren't known when filtering by opening hours.",
+    )
+    parser.add_argument("--benchmark", type=int, default=0, metavar="N", help="Time N random queries and exit.")
+    args = parser.parse_args()
+
+    status = args.status if args.status.strip() else None
+    index = StoreIndex.from_csv(args.csv)
+
+    open_at = None
+    if args.open_now:
+        now = datetime.now()
+        open_at = (now.weekday(), now.hour * 60 + now.minute)
+    elif args.open_on:
+        try:
+            weekday = parse_weekday(args.open_on)
+        except ValueError:
+            parser.error(f"--open-on: unknown weekday {args.open_on!r}")
+        minute = None
+        if args.at:
+            hours, _, minutes = args.at.partition(":")
+            minute = int(hours) * 60 + int(minutes or 0)
+        open_at = (weekday, minute)
+
+    if args.benchmark:
+        index.nearest(args.lat, args.lng, args.limit, status, open_at, args.include_unknown_hours)  # build the sub-index
+        t0 = time.perf_counter()
+        for _ in range(args.benchmark):
+            index.nearest(
+                args.lat + random.uniform(-2, 2), args.lng + random.uniform(-2, 2), args.limit, status,
+                open_at, args.include_unknown_hours,
+            )
+        per_query = (time.perf_counter() - t0) / args.benchmark * 1000
+        print(f"{len(index.stores)} stores indexed; {per_query:.3f} ms per {args.limit}-nearest query")
+        return
+
+    if args.radius is not None:
+        stores = index.within_radius(
+            args.lat, args.lng, args.radius, status, args.limit, open_at, args.include_unknown_hours
+        )
+    else:
+        stores = index.nearest(args.lat, args.lng, args.limit, status, open_at, args.include_unknown_hours)
+
+    print(json.dumps({
+        "user_location": {"lat": args.lat, "lng": args.lng},
+        "status_filter": status,
+        "open_filter": {"weekday": open_at[0], "minute": open_at[1]} if open_at else None,
+        "count": len(stores),
+        "stores": stores,
+    }, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
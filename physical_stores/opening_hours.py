@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Structured opening hours parsed from free-text shop notes.
+
+Shop hours live in prose in the catalog and Hit List notes ("Open Tue-Sat
+12pm-7pm", "Open 11am-7pm daily (closed Christmas...)", "Open Sun-Thurs
+11am-6pm, Fri-Sat 11am-7pm"). ``parse_hours`` turns them into weekly
+intervals, and ``format_hours`` writes the canonical form stored in the Hit
+List "Opening Hours" column ("Mon-Sat 08:00-20:00; Sun 08:00-19:00"). The
+canonical form parses back with the same function.
+
+``OpeningHoursIndex`` loads hours once per set of rows, preferring the column
+and falling back to the notes. It keeps a (shops x 7 days x 15-minute slots)
+bitmap, so "open now" and "open on day X" checks over every shop are a
+single array lookup:
+
+    index = OpeningHoursIndex.from_rows(rows)
+    index.is_open("Ancient Ways", datetime.now())
+    index.window("Ancient Ways", 2)          # (open, close) minutes on Wednesday
+    index.open_mask(weekday=5, minute=14 * 60)
+
+Usage:
+    python3 opening_hours.py "Open Tue-Thu 10am-5pm, Fri 10am-7pm"
+    python3 opening_hours.py --csv data/hit_list.csv      # parse every Hit List row
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import re
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+HIT_LIST_CSV = Path(__file__).parent / "data" / "hit_list.csv"
+HOURS_COLUMN = "Opening Hours"
+
+DAY_ABBREVIATIONS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+# weekday (0 = Monday) -> [(open, close)] in minutes after midnight; closed days map to []
+WeeklyHours = Dict[int, List[Tuple[int, int]]]
+
+_DAY = (
+    r"(?:mon(?:day)?|tue(?:s(?:day)?)?|wed(?:s|nesday)?|thu(?:r(?:s(?:day)?)?)?"
+    r"|fri(?:day)?|sat(?:urday)?|sun(?:day)?)s?"
+)
+_MERIDIEM = r"(?:a\.?m\.?|p\.?m\.?)"
+_CLOCK = rf"(?:noon|midnight|\d{{1,2}}(?::\d{{2}})?\s*{_MERIDIEM}?)"
+# Named day groups; "Mon-Fri" itself is an ordinary day range
+DAY_GROUPS = {"weekday": list(range(5)), "weekend": [5, 6]}
+_DAY_GROUP = r"(?:week\s*days?|weekends?|m\s*(?:-|–|—)\s*f)"
+TOKEN_PATTERN = re.compile(
+    rf"(?P<group>\b{_DAY_GROUP}\b)"
+    rf"|(?P<days>\b{_DAY}\b\.?(?:\s*(?:-|–|—|to|through|thru)\s*\b{_DAY}\b\.?)?)"
+    rf"|(?P<daily>\b(?:daily|every\s*day|7\s+days(?:\s+a\s+week)?|mon(?:day)?\s*-\s*sun(?:day)?)\b)"
+    rf"|(?P<always>\b(?:24\s*/\s*7|24\s+hours)\b)"
+    rf"|(?P<time>\b{_CLOCK}\s*(?:-|–|—|to|until)\s*{_CLOCK}(?![\w:]))",
+    re.IGNORECASE,
+)
+CLOSED_BEFORE = re.compile(r"closed(?:\s+on)?(?:\s+(?:all|every))?\s*$", re.IGNORECASE)
+# Text allowed between a day list and its times ("Tue-Sat: 12pm-7pm", "Fri from 10am-7pm")
+BINDING_GAP = re.compile(r"^[\s,:&/]*(?:and|from|open|hours)?[\s,:]*$", re.IGNORECASE)
+DAY_LIST_GAP = re.compile(r"^\s*(?:,|&|/|and|\+)?\s*$", re.IGNORECASE)
+CLOCK_PATTERN = re.compile(rf"(?:(noon|midnight)|(\d{{1,2}})(?::(\d{{2}}))?\s*({_MERIDIEM})?)", re.IGNORECASE)
+CANONICAL_PATTERN = re.compile(r"\b\d{1,2}:\d{2}\s*-\s*\d{1,2}:\d{2}\b")
+# Day-like words after a time range that aren't recognised ("holidays", "except Sundays")
+UNKNOWN_TRAILING_DAYS = re.compile(
+    r"^[\s,:(]*(?:(?:on|except|excluding|but|not)\s+)?(?:[a-z]*days?|week\w*|wknds?)\b", re.IGNORECASE
+)
+
+
+def _day_index(token: str) -> int:
+    return DAY_ABBREVIATIONS.index(token.strip(". ")[:3].title())
+
+
+def _token_days(token: re.Match) -> List[int]:
+    """Weekdays covered by a "days", "group" or "daily" token."""
+    if token.lastgroup == "daily":
+        return list(range(7))
+    if token.lastgroup == "group":
+        text = token.group().lower()
+        return list(DAY_GROUPS["weekend" if text.startswith("weekend") else "weekday"])
+    return _day_span(token.group())
+
+
+def _day_span(text: str) -> List[int]:
+    """'Tue-Sat' -> [1..5]; 'Wed-Mon' wraps past Sunday; 'Fri' -> [4]."""
+    parts = re.split(r"\s*(?:-|–|—|\bto\b|\bthrough\b|\bthru\b)\s*", text.strip(), maxsplit=1, flags=re.IGNORECASE)
+    first = _day_index(parts[0])
+    last = _day_index(parts[1]) if len(parts) > 1 and parts[1] else first
+    return [(first + offset) % 7 for offset in range((last - first) % 7 + 1)]
+
+
+def _clock(match: re.Match) -> Tuple[Optional[int], Optional[str]]:
+    word, hours, minutes, meridiem = match.groups()
+    if word:
+        return (12 * 60 if word.lower() == "noon" else 24 * 60), "fixed"
+    hours = int(hours)
+    minutes = int(minutes or 0)
+    if hours > 24 or minutes > 59:
+        return None, None
+    return hours * 60 + minutes, (meridiem or "").replace(".", "").lower() or None
+
+
+def _apply_meridiem(minutes: int, meridiem: Optional[str]) -> int:
+    hours, rest = divmod(minutes, 60)
+    if meridiem == "am":
+        hours = 0 if hours == 12 else hours
+    elif meridiem == "pm":
+        hours = hours if hours == 12 else hours + 12
+    return hours * 60 + rest
+
+
+def _time_range(text: str, canonical: bool) -> Optional[Tuple[int, int]]:
+    clocks = list(CLOCK_PATTERN.finditer(text))
+    if len(clocks) != 2:
+        return None
+    (start, start_mer), (end, end_mer) = _clock(clocks[0]), _clock(clocks[1])
+    if start is None or end is None:
+        return None
+    has_minutes = ":" in clocks[0].group(0) and ":" in clocks[1].group(0)
+    if not (end_mer or start_mer or canonical or has_minutes):
+        return None  # bare numbers like "3-4" aren't hours
+    if end_mer not in (None, "fixed"):
+        end = _apply_meridiem(end, end_mer)
+    if start_mer not in (None, "fixed"):
+        start = _apply_meridiem(start, start_mer)
+    elif start_mer is None and end_mer in ("am", "pm"):
+        # "11-7pm": inherit the closing meridiem unless that puts opening after closing
+        inherited = _apply_meridiem(start, end_mer)
+        start = inherited if inherited < end else _apply_meridiem(start, "am")
+    if end == 0:
+        end = 24 * 60
+    if end <= start:
+        end = 24 * 60  # past midnight: treat as open until the end of the day
+    return start, min(end, 24 * 60)
+
+
+def _following_days(text: str, tokens: List[re.Match], position: int, day_first: bool) -> Tuple[List[int], int]:
+    """Days listed right after a time range ("11am-7pm daily", "11-7pm Mon, Wed & Fri"), and the tokens used.
+
+    In a time-first string the first day after a time range always belongs to it; in a day-first
+    one even that day may lead the next times instead.
+    """
+    days: List[int] = []
+    end = tokens[position].end()
+    used = 0
+    for token in tokens[position + 1:]:
+        if token.lastgroup not in ("days", "group", "daily"):
+            break
+        gap = text[end:token.start()]
+        if not (BINDING_GAP.match(gap) if not days else DAY_LIST_GAP.match(gap)):
+            break
+        following = tokens[position + used + 2] if position + used + 2 < len(tokens) else None
+        leads = (
+            following is not None
+            and following.lastgroup == "time"
+            and BINDING_GAP.match(text[token.end():following.start()])
+        )
+        if leads and (day_first or used):
+            break  # "11am-7pm daily, Sat 10am-5pm": Sat leads its own times
+        days.extend(_token_days(token))
+        end = token.end()
+        used += 1
+    return days, used
+
+
+@lru_cache(maxsize=8192)
+def _parse(text: str) -> Optional[Tuple[Tuple[Tuple[int, int], ...], ...]]:
+    canonical = bool(CANONICAL_PATTERN.search(text))
+    weekly: Dict[int, List[Tuple[int, int]]] = {day: [] for day in range(7)}
+    closed = set()
+    generic = set()
+    pending: List[int] = []
+    bound: List[int] = []
+    pending_end = 0
+    closed_end = -1
+    day_first: Optional[bool] = None
+    found = False
+    tokens = list(TOKEN_PATTERN.finditer(text))
+    skip_until = -1
+    for position, token in enumerate(tokens):
+        if position <= skip_until:
+            continue
+        kind = token.lastgroup
+        gap = text[pending_end:token.start()]
+        if kind in ("days", "group", "daily"):
+            days = _token_days(token)
+            if kind != "daily" and (
+                CLOSED_BEFORE.search(text[max(0, token.start() - 20):token.start()])
+                or (closed_end >= 0 and DAY_LIST_GAP.match(text[closed_end:token.start()]))
+            ):
+                # "Closed on Sundays and Mondays": the whole day list is closed
+                closed.update(days)
+                closed_end = token.end()
+                pending = []
+                continue
+            bound = []
+            if pending and DAY_LIST_GAP.match(gap):
+                pending.extend(days)
+            else:
+                pending = days
+            pending_end = token.end()
+        elif kind == "always":
+            for day in range(7):
+                weekly[day].append((0, 24 * 60))
+            found = True
+        elif kind == "time":
+            span = _time_range(token.group(), canonical)
+            if span is None:
+                continue
+            if day_first is None:
+                # The first binding fixes the layout: "Mon-Fri 10am-6pm, ..." or "10am-6pm Mon-Fri, ..."
+                day_first = bool(pending and BINDING_GAP.match(gap))
+            following, used = _following_days(text, tokens, position, day_first)
+            if pending and BINDING_GAP.match(gap):
+                days = pending
+            elif following and not day_first:
+                days = following  # "10am-6pm Mon-Fri, 11am-4pm Sat"
+            elif bound and DAY_LIST_GAP.match(gap):
+                days = bound  # split shifts: "Mon-Fri 9am-1pm, 2pm-6pm"
+            elif following:
+                days = following  # "Mon-Fri 9am-5pm; 11am-7pm daily"
+            elif UNKNOWN_TRAILING_DAYS.match(text[token.end():]):
+                return None  # "9am-5pm except holidays": don't guess every day
+            else:
+                days = list(range(7))
+            if days is following:
+                skip_until = position + used
+            everyday = len(set(days)) == 7
+            for day in days:
+                if not everyday and day in generic:
+                    # a named day overrides "daily" hours: "Open daily 10am-6pm, Sun 12pm-5pm"
+                    weekly[day] = []
+                    generic.discard(day)
+                weekly[day].append(span)
+            if everyday:
+                generic.update(days)
+            bound = days
+            pending = []
+            pending_end = token.end()
+            found = True
+    if not found:
+        return None
+    for day in closed:
+        weekly[day] = []
+    return tuple(tuple(sorted(set(weekly[day]))) for day in range(7))
+
+
+def parse_hours(text: str) -> Optional[WeeklyHours]:
+    """Weekly intervals from notes or the canonical column, or None when no hours are mentioned."""
+    parsed = _parse(" ".join((text or "").split()))
+    if parsed is None:
+        return None
+    return {day: list(intervals) for day, intervals in enumerate(parsed)}
+
+
+def _format_clock(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def format_intervals(intervals: Sequence[Tuple[int, int]]) -> str:
+    """[(600, 1080)] -> '10:00-18:00'."""
+    return ", ".join(f"{_format_clock(start)}-{_format_clock(end)}" for start, end in intervals)
+
+
+def format_hours(weekly: Optional[WeeklyHours]) -> str:
+    """Canonical text for the Opening Hours column, grouping consecutive days with the same hours."""
+    if not weekly:
+        return ""
+    parts = []
+    day = 0
+    while day < 7:
+        intervals = weekly.get(day, [])
+        last = day
+        while last + 1 < 7 and weekly.get(last + 1, []) == intervals:
+            last += 1
+        if intervals:
+            days = DAY_ABBREVIATIONS[day] if day == last else f"{DAY_ABBREVIATIONS[day]}-{DAY_ABBREVIATIONS[last]}"
+            parts.append(f"{days} {format_intervals(intervals)}")
+        day = last + 1
+    return "; ".join(parts)
+
+
+def next_open_day(weekly: WeeklyHours, after: date) -> Optional[date]:
+    """First date after ``after`` on which the shop opens, or None if it never does."""
+    for offset in range(1, 8):
+        day = after + timedelta(days=offset)
+        if weekly.get(day.weekday()):
+            return day
+    return None
+
+
+def hours_from_row(row: Dict) -> Optional[WeeklyHours]:
+    """Hours for a Hit List row (header-keyed) or catalog shop: the column first, then the notes."""
+    column = (row.get(HOURS_COLUMN) or row.get("opening_hours") or "").strip()
+    if column:
+        return parse_hours(column)
+    return parse_hours(row.get("Notes") or row.get("notes") or "")
+
+
+class OpeningHoursIndex:
+    """Shop name -> weekly hours, with a slot bitmap for vectorized open-now queries."""
+
+    def __init__(self, hours: Dict[str, Optional[WeeklyHours]]):
+        self.names = list(hours)
+        self.hours = hours
+        self.position = {name: i for i, name in enumerate(self.names)}
+        self.known = np.array([hours[name] is not None for name in self.names], dtype=bool)
+        self.bitmap = np.zeros((len(self.names), 7, SLOTS_PER_DAY), dtype=bool)
+        for i, name in enumerate(self.names):
+            for day, intervals in (hours[name] or {}).items():
+                for start, end in intervals:
+                    self.bitmap[i, day, start // SLOT_MINUTES:-(-end // SLOT_MINUTES)] = True
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Dict]) -> "OpeningHoursIndex":
+        hours = {}
+        for row in rows:
+            name = (row.get("Shop Name") or row.get("name") or "").strip()
+            if name and name not in hours:
+                hours[name] = hours_from_row(row)
+        return cls(hours)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def get(self, name: str) -> Optional[WeeklyHours]:
+        return self.hours.get(name)
+
+    def window(self, name: str, weekday: int) -> Optional[Tuple[int, int]]:
+        """(first opening, last closing) on ``weekday``; (0, 0) when closed, None when unknown."""
+        weekly = self.hours.get(name)
+        if weekly is None:
+            return None
+        intervals = weekly.get(weekday, [])
+        if not intervals:
+            return 0, 0
+        return min(start for start, _ in intervals), max(end for _, end in intervals)
+
+    def is_open(self, name: str, when: datetime) -> Optional[bool]:
+        """Whether ``name`` is open at ``when`` (None if its hours are unknown)."""
+        i = self.position.get(name)
+        if i is None or not self.known[i]:
+            return None
+        return bool(self.bitmap[i, when.weekday(), (when.hour * 60 + when.minute) // SLOT_MINUTES])
+
+    def open_mask(self, weekday: int, minute: Optional[int] = None) -> np.ndarray:
+        """Bool per shop (in ``names`` order): open at ``minute`` on ``weekday``, or at any time that day."""
+        if minute is None:
+            return self.bitmap[:, weekday, :].any(axis=1)
+        return self.bitmap[:, weekday, minute // SLOT_MINUTES]
+
+
+def parse_weekday(value: str) -> int:
+    """'tue' / 'Tuesday' -> 1."""
+    return _day_index(value)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Parse shop opening hours from free-text notes.")
+    parser.add_argument("text", nargs="?", help="Notes text to parse.")
+    parser.add_argument("--csv", type=Path, help="Parse the Notes of every row in a Hit List CSV instead.")
+    args = parser.parse_args()
+
+    if args.text:
+        weekly = parse_hours(args.text)
+        print(format_hours(weekly) if weekly else "No opening hours found")
+        return
+
+    with open(args.csv or HIT_LIST_CSV, newline="", encoding="utf-8-sig") as handle:
+        index = OpeningHoursIndex.from_rows(list(csv.DictReader(handle)))
+    for name in index.names:
+        if index.get(name) is not None:
+            print(f"{name}: {format_hours(index.get(name))}")
+    print(f"\n🕘 Hours found for {int(index.known.sum())} of {len(index)} shops")
+
+
+if __name__ == "__main__":
+    main()
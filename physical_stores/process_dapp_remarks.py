@@ -3,49 +3,55 @@
 Process unhandled DApp remarks and apply them to the Hit List sheet.
 
 For each unprocessed entry in the "DApp Remarks" worksheet:
+  * Resolve the submitted shop name against the Hit List (exact, or a confident
+    fuzzy match via shop_resolver.py, so typos from the field DApp still land)
   * Update the matching shop's status (if provided)
   * Append the remark to the "Sales Process Notes" field with a timestamp
   * Mark the remark row as processed with the current timestamp
 
+All cell changes are buffered in memory and flushed as one batched update per
+worksheet, so a large backlog costs a handful of API calls instead of ~7 per remark.
+
+Runs are incremental: the last scanned row and its Submission ID are kept in
+``.cache/dapp_remarks_state.json`` and the next run reads only the rows after it
+(plus any earlier rows that were skipped), so latency stays flat as the tab
+grows. Every ``FULL_SCAN_EVERY`` runs, or whenever the stored mark no longer
+matches the sheet, the whole tab is re-read to catch out-of-order edits.
+
 Usage:
-    python3 process_dapp_remarks.py                # process all pending entries
+    python3 process_dapp_remarks.py                # process new entries since the last run
+    python3 process_dapp_remarks.py --full-scan    # re-read every remark row
     python3 process_dapp_remarks.py --dry-run      # show actions without modifying the sheet
+    python3 process_dapp_remarks.py --match-threshold 1   # exact names only
 """
 
 from __future__ import annotations
 
 import argparse
+import json
+import os
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from google_clients import get_sheets_client, open_worksheet
+from sheet_cache import get_snapshot_cache
+from sheet_writes import SheetWriteBuffer, column_letter
+from shop_resolver import AUTO_APPLY_THRESHOLD, resolver_for
 
-import gspread
-from google.oauth2.service_account import Credentials
+if TYPE_CHECKING:
+    import gspread
 
 SPREADSHEET_ID = "1eiqZr3LW-qEI6Hmy0Vrur_8flbRwxwA7jXVrbUnHbvc"
 HIT_LIST_SHEET = "Hit List"
 DAPP_REMARKS_SHEET = "DApp Remarks"
 
-SCOPES = [
-    "https://www.googleapis.com/auth/spreadsheets",
-    "https://www.googleapis.com/auth/drive",
-]
+STATE_PATH = Path(os.environ.get("PHYSICAL_STORES_CACHE_DIR", Path(__file__).parent / ".cache")) / "dapp_remarks_state.json"
+FULL_SCAN_EVERY = 20  # incremental runs between full verification scans
 
 
-def get_google_sheets_client() -> gspread.Client:
-    creds_path = Path(__file__).parent / "google_credentials.json"
-    if not creds_path.exists():
-        raise FileNotFoundError(
-            f"Google credentials not found at {creds_path}. "
-            "Please add google_credentials.json with service account credentials."
-        )
-
-    creds = Credentials.from_service_account_file(
-        str(creds_path),
-        scopes=SCOPES,
-    )
-    client = gspread.authorize(creds)
-    return client
+def get_google_sheets_client() -> "gspread.Client":
+    return get_sheets_client()
 
 
 def build_header_index(headers: List[str]) -> Dict[str, int]:
@@ -59,32 +65,175 @@ def append_sales_note(existing_notes: str, note_line: str) -> str:
     return f"{existing_notes.strip()}\n\n{note_line}"
 
 
-def process_remarks(dry_run: bool = False) -> Tuple[int, int]:
-    client = get_google_sheets_client()
-    spreadsheet = client.open_by_key(SPREADSHEET_ID)
+def report_api_savings(buffers: List[SheetWriteBuffer], reads_saved: int) -> None:
+    """Print how many Sheets API calls batching avoided."""
+    cell_writes = sum(buffer.cell_writes for buffer in buffers)
+    api_calls = sum(buffer.api_calls for buffer in buffers)
+    if not cell_writes:
+        return
+    unbatched = cell_writes + reads_saved
+    print(
+        f"[API] {api_calls} batched write call(s) instead of {unbatched} "
+        f"({cell_writes} update_cell + {reads_saved} cell reads); saved {unbatched - api_calls}."
+    )
 
+
+def load_remarks_state(path: Path = STATE_PATH) -> Optional[Dict]:
+    """Return the saved high-water mark for this spreadsheet, or None."""
     try:
-        hit_list_ws = spreadsheet.worksheet(HIT_LIST_SHEET)
-    except gspread.WorksheetNotFound:
-        raise ValueError(f'Worksheet "{HIT_LIST_SHEET}" not found.')
+        with path.open("r", encoding="utf-8") as handle:
+            state = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if state.get("spreadsheet_id") != SPREADSHEET_ID:
+        return None
+    return state
+
+
+def save_remarks_state(state: Dict, path: Path = STATE_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    with tmp_path.open("w", encoding="utf-8") as handle:
+        json.dump(state, handle, indent=2)
+    tmp_path.replace(path)
+
+
+def _trim(row: List[str]) -> List[str]:
+    end = len(row)
+    while end and not str(row[end - 1]).strip():
+        end -= 1
+    return list(row[:end])
+
+
+def _pad(row: List[str], width: int) -> List[str]:
+    return row + [""] * (width - len(row)) if len(row) < width else row
+
+
+def read_remark_tail(remarks_ws, state: Dict) -> Optional[Tuple[List[str], List[Tuple[int, List[str]]]]]:
+    """Read the header, the rows from the high-water mark onward and any pending rows in one call.
+
+    Returns (headers, [(row_num, row), ...]) for rows after the mark, or None when the
+    sheet no longer matches the saved state and a full scan is needed.
+    """
+    headers = state.get("headers") or []
+    mark = int(state.get("scanned_through", 1))
+    if not headers or "Submission ID" not in headers or mark < 1:
+        return None
+    last_col = column_letter(len(headers))
+    id_col = headers.index("Submission ID")
+    pending = [entry for entry in state.get("pending", []) if entry["row"] < mark]
+
+    ranges = ["1:1", f"A{mark}:{last_col}"] + [f"A{entry['row']}:{last_col}{entry['row']}" for entry in pending]
+    results = remarks_ws.batch_get(ranges)
+    current_headers = _trim(results[0][0]) if results[0] else []
+    if current_headers != headers:
+        print("[INFO] DApp Remarks header changed since the last run; doing a full scan.")
+        return None
+
+    tail = [_pad(row, len(headers)) for row in results[1]]
+    mark_id = tail[0][id_col].strip() if tail else ""
+    if mark > 1 and mark_id != state.get("mark_submission_id", ""):
+        print(f"[INFO] DApp Remarks row {mark} no longer matches the saved mark; doing a full scan.")
+        return None
+
+    rows: List[Tuple[int, List[str]]] = []
+    for entry, values in zip(pending, results[2:]):
+        row = _pad(values[0] if values else [], len(headers))
+        if row[id_col].strip() != entry["submission_id"]:
+            print(f"[INFO] Pending remark row {entry['row']} moved; doing a full scan.")
+            return None
+        rows.append((entry["row"], row))
+    if tail and any(entry["row"] == mark for entry in state.get("pending", [])):
+        rows.append((mark, tail[0]))  # the mark row itself was skipped last time
+    rows.extend((mark + offset, row) for offset, row in enumerate(tail[1:], start=1))
+    return headers, rows
+
+
+def process_remarks(
+    dry_run: bool = False,
+    full_scan: bool = False,
+    match_threshold: float = AUTO_APPLY_THRESHOLD,
+) -> Tuple[int, int]:
+    from gspread import WorksheetNotFound
+
+    client = get_google_sheets_client()
 
     try:
-        remarks_ws = spreadsheet.worksheet(DAPP_REMARKS_SHEET)
-    except gspread.WorksheetNotFound:
+        remarks_ws = open_worksheet(client, SPREADSHEET_ID, DAPP_REMARKS_SHEET)
+    except WorksheetNotFound:
         raise ValueError(
             f'Worksheet "{DAPP_REMARKS_SHEET}" not found. '
             "Run generate_shop_list.py first to initialise it."
         )
 
-    hit_values = hit_list_ws.get_all_values()
-    if len(hit_values) < 2:
-        raise ValueError("Hit List worksheet is empty; nothing to update.")
+    snapshots = get_snapshot_cache(client)
+    state = None if full_scan else load_remarks_state()
+    runs_since_full_scan = 0
+    incremental = None
+    if state and state.get("runs_since_full_scan", 0) < FULL_SCAN_EVERY:
+        incremental = read_remark_tail(remarks_ws, state)
+
+    if incremental is not None:
+        remarks_headers, remark_rows = incremental
+        runs_since_full_scan = state.get("runs_since_full_scan", 0) + 1
+        scanned_through = max([row_num for row_num, _ in remark_rows] + [int(state["scanned_through"])])
+        print(
+            f"[INFO] Incremental scan from row {state['scanned_through']}: "
+            f"{len(remark_rows)} row(s) to check (new + previously skipped)."
+        )
+    else:
+        remarks_values = snapshots.get_all_values(SPREADSHEET_ID, DAPP_REMARKS_SHEET, worksheet=remarks_ws)
+        if len(remarks_values) < 2:
+            print("No remarks to process.")
+            return 0, 0
+        remarks_headers = remarks_values[0]
+        remark_rows = list(enumerate(remarks_values[1:], start=2))
+        scanned_through = len(remarks_values)
 
-    remarks_values = remarks_ws.get_all_values()
-    if len(remarks_values) < 2:
-        print("No remarks to process.")
+    remarks_index = build_header_index(remarks_headers)
+    for col in ["Submission ID", "Shop Name", "Status", "Remarks", "Submitted By", "Processed", "Processed At"]:
+        if col not in remarks_index:
+            raise ValueError(f'Missing column "{col}" in DApp Remarks worksheet.')
+
+    pending_rows = [
+        (row_num, row) for row_num, row in remark_rows
+        if row[remarks_index["Processed"]].strip().lower() != "yes"
+    ]
+
+    def record_state(skipped_rows: List[Tuple[int, List[str]]]) -> None:
+        if dry_run:
+            return
+        id_col = remarks_index["Submission ID"]
+        if incremental is not None and scanned_through == int(state["scanned_through"]):
+            mark_id = state.get("mark_submission_id", "")
+        else:
+            mark_row = dict(remark_rows).get(scanned_through, [])
+            mark_id = mark_row[id_col].strip() if len(mark_row) > id_col else ""
+        save_remarks_state({
+            "spreadsheet_id": SPREADSHEET_ID,
+            "headers": _trim(remarks_headers),
+            "scanned_through": scanned_through,
+            "mark_submission_id": mark_id,
+            "pending": [{"row": row_num, "submission_id": row[id_col].strip()} for row_num, row in skipped_rows],
+            "runs_since_full_scan": runs_since_full_scan,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        })
+
+    if not pending_rows:
+        # Nothing new: the Hit List isn't read at all.
+        record_state([])
+        print("No new remarks to process.")
         return 0, 0
 
+    try:
+        hit_list_ws = open_worksheet(client, SPREADSHEET_ID, HIT_LIST_SHEET)
+    except WorksheetNotFound:
+        raise ValueError(f'Worksheet "{HIT_LIST_SHEET}" not found.')
+
+    hit_values = snapshots.get_all_values(SPREADSHEET_ID, HIT_LIST_SHEET, worksheet=hit_list_ws)
+    if len(hit_values) < 2:
+        raise ValueError("Hit List worksheet is empty; nothing to update.")
+
     hit_headers = hit_values[0]
     hit_index = build_header_index(hit_headers)
     required_columns = ["Shop Name", "Status", "Sales Process Notes", "Status Updated By", "Status Updated Date"]
@@ -92,29 +241,21 @@ def process_remarks(dry_run: bool = False) -> Tuple[int, int]:
         if col not in hit_index:
             raise ValueError(f'Missing column "{col}" in Hit List worksheet.')
 
-    remarks_headers = remarks_values[0]
-    remarks_index = build_header_index(remarks_headers)
-    for col in ["Submission ID", "Shop Name", "Status", "Remarks", "Submitted By", "Processed", "Processed At"]:
-        if col not in remarks_index:
-            raise ValueError(f'Missing column "{col}" in DApp Remarks worksheet.')
-
-    # Build lookup for shop rows (exact match on Shop Name)
-    shop_row_lookup: Dict[str, int] = {}
-    for row_num, row in enumerate(hit_values[1:], start=2):  # 1-indexed rows
-        name = row[hit_index["Shop Name"]].strip()
-        if name:
-            shop_row_lookup[name.lower()] = row_num
+    resolver = resolver_for(hit_values)
 
     processed_count = 0
     skipped_count = 0
+    notes_reads_saved = 0
 
     now_iso = datetime.now(timezone.utc).isoformat()
 
-    for row_num, row in enumerate(remarks_values[1:], start=2):
-        processed_flag = row[remarks_index["Processed"]].strip()
-        if processed_flag.lower() == "yes":
-            continue  # already processed
+    hit_buffer = SheetWriteBuffer(hit_list_ws)
+    remarks_buffer = SheetWriteBuffer(remarks_ws)
+    notes_col = hit_index["Sales Process Notes"] + 1
 
+    skipped_rows: List[Tuple[int, List[str]]] = []
+
+    for row_num, row in pending_rows:
         shop_name = row[remarks_index["Shop Name"]].strip()
         status = row[remarks_index["Status"]].strip()
         remarks = row[remarks_index["Remarks"]].strip()
@@ -124,20 +265,27 @@ def process_remarks(dry_run: bool = False) -> Tuple[int, int]:
         if not shop_name:
             print(f"[SKIP] Row {row_num}: Missing shop name.")
             skipped_count += 1
+            skipped_rows.append((row_num, row))
             continue
 
-        lookup_key = shop_name.lower()
-        target_row = shop_row_lookup.get(lookup_key)
-        if not target_row:
-            print(f"[SKIP] Row {row_num}: Shop '{shop_name}' not found in Hit List.")
+        match, candidates = resolver.resolve(shop_name, threshold=match_threshold)
+        if not match:
+            suggestion = ""
+            if candidates:
+                suggestion = f" Closest: '{candidates[0]['name']}' (score {candidates[0]['score']:.2f})."
+            print(f"[SKIP] Row {row_num}: Shop '{shop_name}' not found in Hit List.{suggestion}")
             skipped_count += 1
+            skipped_rows.append((row_num, row))
             continue
+        target_row = match["row_num"]
+        if not match["exact"]:
+            print(f"[FUZZY] Row {row_num}: '{shop_name}' -> '{match['name']}' (score {match['score']:.2f}).")
 
         print(f"[INFO] Updating '{shop_name}' (Hit List row {target_row}) with status '{status}' and remarks.")
 
         if not dry_run:
             if status:
-                hit_list_ws.update_cell(target_row, hit_index["Status"] + 1, status)
+                hit_buffer.set(target_row, hit_index["Status"] + 1, status)
 
             status_note = remarks or ""
             if status_note:
@@ -145,20 +293,34 @@ def process_remarks(dry_run: bool = False) -> Tuple[int, int]:
                 if submitted_at:
                     note_prefix = f"[{submitted_at} | {submitted_by}]"
                 note_line = f"{note_prefix} {status_note}"
-                existing_notes = hit_list_ws.cell(target_row, hit_index["Sales Process Notes"] + 1).value or ""
+                # Read from the snapshot (or an earlier staged note for the same shop)
+                # instead of a per-remark cell() round trip.
+                snapshot_row = hit_values[target_row - 1]
+                snapshot_notes = snapshot_row[notes_col - 1] if notes_col - 1 < len(snapshot_row) else ""
+                existing_notes = hit_buffer.get(target_row, notes_col, snapshot_notes) or ""
+                notes_reads_saved += 1
                 new_notes = append_sales_note(existing_notes, note_line)
-                hit_list_ws.update_cell(target_row, hit_index["Sales Process Notes"] + 1, new_notes)
+                hit_buffer.set(target_row, notes_col, new_notes)
 
             if "Status Updated By" in hit_index:
-                hit_list_ws.update_cell(target_row, hit_index["Status Updated By"] + 1, submitted_by)
+                hit_buffer.set(target_row, hit_index["Status Updated By"] + 1, submitted_by)
             if "Status Updated Date" in hit_index:
-                hit_list_ws.update_cell(target_row, hit_index["Status Updated Date"] + 1, now_iso)
+                hit_buffer.set(target_row, hit_index["Status Updated Date"] + 1, now_iso)
 
-            remarks_ws.update_cell(row_num, remarks_index["Processed"] + 1, "Yes")
-            remarks_ws.update_cell(row_num, remarks_index["Processed At"] + 1, now_iso)
+            remarks_buffer.set(row_num, remarks_index["Processed"] + 1, "Yes")
+            remarks_buffer.set(row_num, remarks_index["Processed At"] + 1, now_iso)
 
         processed_count += 1
 
+    if not dry_run:
+        # Hit List first: if it fails, the remarks stay unprocessed and are retried next run.
+        hit_buffer.flush()
+        remarks_buffer.flush()
+        snapshots.invalidate(SPREADSHEET_ID)
+        report_api_savings([hit_buffer, remarks_buffer], notes_reads_saved)
+    # Skipped rows stay unprocessed and are re-read on the next run.
+    record_state(skipped_rows)
+
     if processed_count == 0:
         print("No new remarks to process.")
     else:
@@ -170,9 +332,20 @@ def process_remarks(dry_run: bool = False) -> Tuple[int, int]:
 def main():
     parser = argparse.ArgumentParser(description="Process DApp remarks into Hit List.")
     parser.add_argument("--dry-run", action="store_true", help="Show actions without updating the sheet.")
+    parser.add_argument(
+        "--full-scan",
+        action="store_true",
+        help="Ignore the saved high-water mark and re-read every DApp Remarks row.",
+    )
+    parser.add_argument(
+        "--match-threshold",
+        type=float,
+        default=AUTO_APPLY_THRESHOLD,
+        help=f"Minimum fuzzy-match score to apply a remark to a differently spelled shop (default: {AUTO_APPLY_THRESHOLD}; 1 = exact only).",
+    )
     args = parser.parse_args()
 
-    process_remarks(dry_run=args.dry_run)
+    process_remarks(dry_run=args.dry_run, full_scan=args.full_scan, match_threshold=args.match_threshold)
 
 
 if __name__ == "__main__":
@@ -13,17 +13,14 @@ import os
 from datetime import datetime
 from pathlib import Path
 
-import gspread
 import pandas as pd
-from google.oauth2.service_account import Credentials
+
+from google_clients import get_sheets_client
+from sheet_cache import get_snapshot_cache
 
 SPREADSHEET_ID = "1eiqZr3LW-qEI6Hmy0Vrur_8flbRwxwA7jXVrbUnHbvc"
 WORKSHEET_NAME = "Hit List"
 OUTPUT_PATH = Path("data/hit_list.csv")
-SCOPES = [
-    "https://www.googleapis.com/auth/spreadsheets",
-    "https://www.googleapis.com/auth/drive",
-]
 
 
 def ensure_output_directory(path: Path) -> None:
@@ -47,14 +44,14 @@ def fetch_hit_list() -> pd.DataFrame:
             "credentials in the repository root."
         )
 
-    creds = Credentials.from_service_account_file(str(creds_path), scopes=SCOPES)
-    client = gspread.authorize(creds)
-    worksheet = client.open_by_key(SPREADSHEET_ID).worksheet(WORKSHEET_NAME)
+    client = get_sheets_client(creds_path)
+    snapshots = get_snapshot_cache(client)
 
     print(f"✅ Connected to spreadsheet: {SPREADSHEET_ID}")
     print(f"   Worksheet: {WORKSHEET_NAME}")
 
-    values = worksheet.get_all_values()
+    values = snapshots.get_all_values(SPREADSHEET_ID, WORKSHEET_NAME)
+    print(f"   ({snapshots.summary()})")
     if len(values) < 1:
         raise ValueError("Worksheet is empty.")
 
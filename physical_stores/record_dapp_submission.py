@@ -12,39 +12,21 @@ Usage:
 import argparse
 import uuid
 from datetime import datetime, timezone
-from pathlib import Path
 
 import gspread
-from google.oauth2.service_account import Credentials
+
+from google_clients import get_sheets_client, open_spreadsheet, open_worksheet, remember_worksheet
 
 SPREADSHEET_ID = "1eiqZr3LW-qEI6Hmy0Vrur_8flbRwxwA7jXVrbUnHbvc"
 SERVICE_ACCOUNT_EMAIL = "agroverse-market-research@get-data-io.iam.gserviceaccount.com"
 DAPP_REMARKS_SHEET = "DApp Remarks"
 
-SCOPES = [
-    "https://www.googleapis.com/auth/spreadsheets",
-    "https://www.googleapis.com/auth/drive",
-]
-
 
 def get_google_sheets_client():
-    creds_path = Path(__file__).parent / "google_credentials.json"
-    if not creds_path.exists():
-        raise FileNotFoundError(
-            f"Google credentials not found at {creds_path}. "
-            "Please add google_credentials.json with service account credentials."
-        )
-
-    creds = Credentials.from_service_account_file(
-        str(creds_path),
-        scopes=SCOPES,
-    )
-
-    return gspread.authorize(creds)
+    return get_sheets_client()
 
 
 def ensure_dapp_remarks_sheet(client):
-    spreadsheet = client.open_by_key(SPREADSHEET_ID)
     headers = [
         "Submission ID",
         "Shop Name",
@@ -57,13 +39,14 @@ def ensure_dapp_remarks_sheet(client):
     ]
 
     try:
-        worksheet = spreadsheet.worksheet(DAPP_REMARKS_SHEET)
+        worksheet = open_worksheet(client, SPREADSHEET_ID, DAPP_REMARKS_SHEET)
     except gspread.WorksheetNotFound:
-        worksheet = spreadsheet.add_worksheet(
+        worksheet = open_spreadsheet(client, SPREADSHEET_ID).add_worksheet(
             title=DAPP_REMARKS_SHEET,
             rows=1000,
             cols=len(headers),
         )
+        remember_worksheet(client, SPREADSHEET_ID, worksheet)
         worksheet.append_row(headers)
         return worksheet
 
@@ -4,94 +4,77 @@ Route Optimizer for Market Research Store Visits
 Enhances the itinerary with route optimization suggestions and travel time estimates
 """
 
-import gspread
-from google.oauth2.service_account import Credentials
-from pathlib import Path
-from generate_shop_list import (
-    get_google_sheets_client,
-    SPREADSHEET_ID,
-    SHOPS
+import argparse
+from datetime import date
+
+from drive_times import build_drive_times, city_key, hit_list_points
+from google_clients import get_sheets_client, open_spreadsheet, open_worksheet, remember_worksheet
+from routing import group_centroids, haversine_matrix, solve_visit_order
+from sheet_cache import get_snapshot_cache
+from sheet_writes import a1_range
+from trip_planner import (
+    DAY_END,
+    DAY_START,
+    DEFAULT_HOME,
+    DRIVE_BUDGET_MINUTES,
+    VISIT_MINUTES,
+    day_label,
+    format_clock,
+    parse_clock,
+    plan_trip,
 )
 
-# Approximate driving times between major cities (in minutes)
-# Based on typical traffic conditions
-CITY_DRIVE_TIMES = {
-    # Bay Area
-    ("San Francisco", "Oakland"): 20,
-    ("San Francisco", "Berkeley"): 25,
-    ("San Francisco", "San Jose"): 60,
-    ("San Francisco", "Palo Alto"): 45,
-    ("Oakland", "Berkeley"): 10,
-    ("Oakland", "San Jose"): 50,
-    ("Berkeley", "San Jose"): 55,
-    ("Palo Alto", "San Jose"): 20,
-    
-    # Central California
-    ("San Jose", "Stockton"): 75,
-    ("Stockton", "Modesto"): 30,
-    ("Modesto", "Fresno"): 90,
-    ("Fresno", "Bakersfield"): 110,
-    ("Bakersfield", "Mojave"): 60,
-    ("Mojave", "Barstow"): 60,
-    ("Barstow", "Palm Springs"): 90,
-    
-    # Coastal California
-    ("San Jose", "Monterey"): 60,
-    ("Monterey", "Big Sur"): 45,
-    ("Big Sur", "San Luis Obispo"): 90,
-    ("San Luis Obispo", "Paso Robles"): 30,
-    ("Paso Robles", "Santa Barbara"): 120,
-    ("Santa Barbara", "Ventura"): 30,
-    ("Ventura", "Los Angeles"): 60,
-    
-    # Southern California
-    ("Los Angeles", "Palm Springs"): 120,
-    ("Palm Springs", "Indio"): 20,
-    ("Indio", "Niland"): 60,
-    ("Niland", "Blythe"): 45,
-    ("Blythe", "Needles"): 60,
-    
-    # Arizona
-    ("Needles", "Kingman"): 90,
-    ("Kingman", "Lake Havasu City"): 60,
-    ("Lake Havasu City", "Parker"): 45,
-    ("Parker", "Quartzsite"): 30,
-}
+# Same spreadsheet as generate_shop_list.py. Defined here rather than imported so
+# loading the optimizer doesn't pull in the geocoding stack.
+SPREADSHEET_ID = "1eiqZr3LW-qEI6Hmy0Vrur_8flbRwxwA7jXVrbUnHbvc"
 
-def get_drive_time(city1, city2):
-    """Get estimated drive time between two cities"""
-    # Try direct lookup
-    key1 = (city1, city2)
-    key2 = (city2, city1)
-    
-    if key1 in CITY_DRIVE_TIMES:
-        return CITY_DRIVE_TIMES[key1]
-    elif key2 in CITY_DRIVE_TIMES:
-        return CITY_DRIVE_TIMES[key2]
-    else:
-        # Estimate based on distance (rough: 1 mile ≈ 1 minute in city, 0.75 min on highway)
-        return None  # Could implement distance-based estimation
+def get_drive_time(drive_times, city1, state1, city2, state2):
+    """Get estimated drive time in minutes between two cities (None if either has no coordinates)"""
+    return drive_times.minutes(city_key(city1, state1), city_key(city2, state2))
+
+def load_hit_list_rows(client):
+    """Return Hit List rows as dicts keyed by header (read through the snapshot cache)"""
+    values = get_snapshot_cache(client).get_all_values(SPREADSHEET_ID, "Hit List")
+    if len(values) < 2:
+        return []
+    headers = values[0]
+    return [dict(zip(headers, row)) for row in values[1:]]
 
-def calculate_optimal_route_segment(cities):
+def calculate_optimal_route_segment(cities, city_coords):
     """
     Calculate optimal visit order for a segment of cities
-    Uses simple heuristics: prioritize high-priority cities, minimize backtracking
+    
+    Solves an open-path TSP over the cities' Hit List centroids, starting from the
+    first city so the segment keeps its direction of travel. Cities without
+    coordinates keep their relative order at the end.
+    Returns (ordered_cities, total_miles).
     """
-    # This is a simplified version - full TSP would require more complex algorithm
-    # For now, we'll use the existing route order but suggest improvements
+    located = [city for city in cities if city in city_coords]
+    unlocated = [city for city in cities if city not in city_coords]
     
-    if len(cities) <= 2:
-        return cities
+    if len(located) <= 2:
+        ordered = located
+        total = 0.0
+        if len(located) == 2:
+            dist = haversine_matrix(*zip(*(city_coords[c] for c in located)))
+            total = float(dist[0, 1])
+        return ordered + unlocated, total
     
-    # Group by priority (if we had priority data)
-    # For now, return cities in order
-    return cities
+    lats, lngs = zip(*(city_coords[city] for city in located))
+    order, total = solve_visit_order(haversine_matrix(lats, lngs), start=0)
+    return [located[idx] for idx in order] + unlocated, total
+
+ROUTING_COLUMNS = ["Drive Time from Prev", "Est. Total Time", "Visit Order"]
 
-def enhance_itinerary_with_routing(client):
-    """Add route optimization columns to the Itinerary sheet"""
+def enhance_itinerary_with_routing(client, recompute=False):
+    """
+    Add route optimization columns to the Itinerary sheet
+    
+    All computed values (and the new headers) are written with one batched
+    update. With recompute=True, existing routing columns are refreshed in place.
+    """
     try:
-        spreadsheet = client.open_by_key(SPREADSHEET_ID)
-        worksheet = spreadsheet.worksheet("Itinerary")
+        worksheet = open_worksheet(client, SPREADSHEET_ID, "Itinerary")
     except Exception as e:
         print(f"Error accessing itinerary sheet: {e}")
         return
@@ -106,32 +89,72 @@ def enhance_itinerary_with_routing(client):
         headers = existing_data[0]
         
         # Check if routing columns already exist
+        value_ranges = []
         if "Drive Time from Prev" in headers:
-            print("✅ Routing columns already exist")
-            return
+            if not recompute:
+                print("✅ Routing columns already exist (use --recompute to refresh them)")
+                return
+            missing = [col for col in ROUTING_COLUMNS if col not in headers]
+            if missing:
+                headers = headers + missing
+                value_ranges.append({
+                    'range': a1_range(1, len(headers) - len(missing) + 1, 1, len(headers)),
+                    'values': [missing],
+                })
+        else:
+            # Add new columns after the existing ones
+            headers = headers + ROUTING_COLUMNS
+            value_ranges.append({
+                'range': a1_range(1, len(headers) - len(ROUTING_COLUMNS) + 1, 1, len(headers)),
+                'values': [ROUTING_COLUMNS],
+            })
+        routing_cols = [headers.index(col) + 1 for col in ROUTING_COLUMNS]  # 1-indexed
+        column_values = {col: [] for col in routing_cols}
         
-        # Add new columns
-        new_headers = headers + ["Drive Time from Prev", "Est. Total Time", "Visit Order"]
-        
-        # Update headers
-        worksheet.update('A1', [new_headers])
+        # Solve the visit order of each region's cities from Hit List coordinates.
+        # Region names only appear on a segment's first row, so carry them forward.
+        hit_list_rows = load_hit_list_rows(client)
+        city_coords = group_centroids(hit_list_rows, "City")
+        drive_times, drive_stats = build_drive_times(hit_list_points(hit_list_rows))
+        print(
+            f"  🚗 Drive-time matrix: {len(drive_times)} shops/cities "
+            f"({drive_stats['reused']} reused, {drive_stats['added']} new/moved)"
+        )
+        city_states = {}
+        region_cities = {}
+        row_regions = {}
+        current_region = ""
+        for i, row in enumerate(existing_data[1:], start=2):
+            current_region = (row[0] if row else "") or current_region
+            city = row[1] if len(row) > 1 else ""
+            row_regions[i] = current_region
+            if city:
+                city_states[city] = row[2] if len(row) > 2 else ""
+                region_cities.setdefault(current_region, []).append(city)
         
-        # Calculate drive times and visit order
-        rows_to_update = []
-        prev_city = None
-        prev_region = None
+        visit_orders = {}
+        prev_in_route = {}
+        for region, cities in region_cities.items():
+            ordered, total_miles = calculate_optimal_route_segment(cities, city_coords)
+            for position, city in enumerate(ordered, start=1):
+                visit_orders[(region, city)] = position
+                prev_in_route[(region, city)] = ordered[position - 2] if position > 1 else None
+            print(f"  🧭 {region}: {' → '.join(ordered)} ({total_miles:.0f} mi straight-line)")
         
         for i, row in enumerate(existing_data[1:], start=2):  # Start from row 2 (after header)
             if len(row) < 3:
+                for col in routing_cols:
+                    column_values[col].append([""])
                 continue
             
-            region = row[0] if len(row) > 0 else ""
+            region = row_regions[i]
             city = row[1] if len(row) > 1 else ""
             
-            # Calculate drive time from previous city
+            # Calculate drive time from the previous city in visit order
             drive_time = ""
-            if prev_city and prev_region == region:  # Only calculate if same region
-                time = get_drive_time(prev_city, city)
+            prev_city = prev_in_route.get((region, city))
+            if prev_city:
+                time = get_drive_time(drive_times, prev_city, city_states.get(prev_city, ""), city, city_states.get(city, ""))
                 if time:
                     drive_time = f"{time} min"
             
@@ -147,187 +170,125 @@ def enhance_itinerary_with_routing(client):
             total_time = visit_time + (int(drive_time.split()[0]) if drive_time else 0)
             est_total = f"{total_time} min" if total_time > 0 else "30 min"
             
-            # Visit order (simple: 1, 2, 3... within each region)
+            # Visit order within the region from the route solver
             visit_order = ""
             if city and region:
-                # This is simplified - would need more logic for optimal ordering
-                visit_order = "1"  # Placeholder
+                visit_order = str(visit_orders.get((region, city), ""))
             
-            # Extend row with new data
-            new_row = row + [drive_time, est_total, visit_order]
-            
-            # Update the row
-            range_name = f"A{i}:{chr(ord('A') + len(new_row) - 1)}{i}"
-            worksheet.update(range_name, [new_row])
-            
-            prev_city = city if city else prev_city
-            prev_region = region if region else prev_region
+            for col, value in zip(routing_cols, [drive_time, est_total, visit_order]):
+                column_values[col].append([value])
+        
+        # One values.batchUpdate for the headers and every routing column
+        last_row = len(existing_data)
+        for col in routing_cols:
+            value_ranges.append({
+                'range': a1_range(2, col, last_row, col),
+                'values': column_values[col],
+            })
+        if len(headers) > worksheet.col_count:
+            worksheet.resize(cols=len(headers))  # the Itinerary sheet is created with 7 columns
+        worksheet.batch_update(value_ranges)
         
-        print("✅ Enhanced itinerary with routing information")
-        print("📝 Note: Drive times are estimates. Use Google Maps for actual routing.")
+        print(f"✅ Enhanced itinerary with routing information ({last_row - 1} rows in 1 batched update)")
+        print("📝 Note: Drive times are modelled from straight-line distance (see drive_times.py). Use Google Maps for actual routing.")
         
     except Exception as e:
         print(f"Error enhancing itinerary: {e}")
 
-def create_route_suggestions(client):
-    """Create a new sheet with suggested multi-day routes"""
+def create_route_suggestions(client, home=DEFAULT_HOME, max_days=None, drive_budget=DRIVE_BUDGET_MINUTES,
+                             visit_minutes=VISIT_MINUTES, day_start=DAY_START, day_end=DAY_END, start_date=None):
+    """
+    Plan day-by-day routes for the actionable Hit List shops (see trip_planner.py),
+    starting on start_date (default today) so each day respects the shops' opening
+    hours, and write them to the Route Suggestions sheet in one append
+    """
+    from gspread import WorksheetNotFound
+
     try:
-        spreadsheet = client.open_by_key(SPREADSHEET_ID)
+        spreadsheet = open_spreadsheet(client, SPREADSHEET_ID)
     except Exception as e:
         print(f"Error accessing spreadsheet: {e}")
         return
     
-    sheet_name = "Route Suggestions"
-    
-    # Try to get existing worksheet or create new
     try:
-        worksheet = spreadsheet.worksheet(sheet_name)
-        print(f"Found existing worksheet: {sheet_name}")
-        worksheet.clear()
-    except gspread.WorksheetNotFound:
-        worksheet = spreadsheet.add_worksheet(
-            title=sheet_name,
-            rows=100,
-            cols=8
+        plan = plan_trip(
+            load_hit_list_rows(client), home, max_days, drive_budget, visit_minutes, day_start, day_end, start_date
         )
-        print(f"Created new worksheet: {sheet_name}")
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
     
     headers = [
-        "Trip",
         "Day",
-        "Cities",
-        "Total Shops",
-        "High Priority",
-        "Est. Drive Time",
-        "Est. Visit Time",
-        "Total Time"
-    ]
-    
-    # Define suggested trips
-    trips = [
-        {
-            "trip": "Trip 1: Bay Area Loop",
-            "days": [
-                {
-                    "day": "Day 1",
-                    "cities": ["San Francisco", "Oakland", "Berkeley"],
-                    "description": "Start in SF, hit East Bay, end in Berkeley"
-                },
-                {
-                    "day": "Day 2",
-                    "cities": ["Berkeley", "Palo Alto", "San Jose"],
-                    "description": "South Bay route"
-                }
-            ]
-        },
-        {
-            "trip": "Trip 2: Central Valley + Desert",
-            "days": [
-                {
-                    "day": "Day 1",
-                    "cities": ["Stockton", "Modesto", "Fresno"],
-                    "description": "I-5 South"
-                },
-                {
-                    "day": "Day 2",
-                    "cities": ["Fresno", "Bakersfield", "Mojave"],
-                    "description": "Continue south"
-                },
-                {
-                    "day": "Day 3",
-                    "cities": ["Mojave", "Barstow", "Palm Springs", "Indio"],
-                    "description": "Desert route"
-                }
-            ]
-        },
-        {
-            "trip": "Trip 3: Coastal Route",
-            "days": [
-                {
-                    "day": "Day 1",
-                    "cities": ["Monterey", "Big Sur", "San Luis Obispo"],
-                    "description": "Coastal Highway 1"
-                },
-                {
-                    "day": "Day 2",
-                    "cities": ["San Luis Obispo", "Paso Robles", "Santa Barbara", "Ventura"],
-                    "description": "Continue south"
-                }
-            ]
-        },
-        {
-            "trip": "Trip 4: LA + Arizona",
-            "days": [
-                {
-                    "day": "Day 1",
-                    "cities": ["Los Angeles"],
-                    "description": "LA metro area"
-                },
-                {
-                    "day": "Day 2",
-                    "cities": ["Los Angeles", "Palm Springs", "Indio"],
-                    "description": "Desert transition"
-                },
-                {
-                    "day": "Day 3",
-                    "cities": ["Indio", "Niland", "Blythe", "Needles"],
-                    "description": "Arizona border"
-                },
-                {
-                    "day": "Day 4",
-                    "cities": ["Needles", "Kingman", "Lake Havasu City"],
-                    "description": "Arizona route"
-                },
-                {
-                    "day": "Day 5",
-                    "cities": ["Lake Havasu City", "Parker", "Quartzsite"],
-                    "description": "Final Arizona stops"
-                }
-            ]
-        }
+        "Stop",
+        "Arrive",
+        "Depart",
+        "Shop",
+        "City",
+        "Priority",
+        "Status",
+        "Drive from Prev",
+        "Notes"
     ]
     
     rows = []
-    for trip_data in trips:
-        trip_name = trip_data["trip"]
-        for day_data in trip_data["days"]:
-            cities_str = " → ".join(day_data["cities"])
-            # Count shops in these cities (simplified)
-            total_shops = 0
-            high_priority = 0
-            
-            for city in day_data["cities"]:
-                for shop in SHOPS:
-                    if shop.get("city", "").lower() == city.lower():
-                        if shop.get("status") not in ["Partnered", "Rejected"]:
-                            total_shops += 1
-                            if shop.get("priority") == "High":
-                                high_priority += 1
-            
-            # Estimate drive time (simplified)
-            est_drive = len(day_data["cities"]) * 45  # Rough estimate
-            est_visit = total_shops * 30
-            total_time = est_drive + est_visit
-            
+    for day in plan["days"]:
+        first_travel = day["number"] - day["travel_days"]
+        if day["rest_days"]:
+            label = day_label(first_travel - day["rest_days"], first_travel - 1)
+            rows.append([label, "", "", "", "Rest day", "", "", "", "", "Shops on the route are closed"])
+        if day["travel_days"]:
+            label = day_label(first_travel, day["number"] - 1)
+            rows.append([label, "", "", "", "Travel day", "", "", "", f"{day['travel_minutes']:.0f} min", "Drive toward the next stop"])
+        for position, stop in enumerate(day["stops"], start=1):
             rows.append([
-                trip_name,
-                day_data["day"],
-                cities_str,
-                total_shops,
-                high_priority,
-                f"{est_drive} min",
-                f"{est_visit} min",
-                f"{total_time} min ({total_time // 60}h {total_time % 60}m)"
+                f"Day {day['number']} ({day['date']:%a %b %d})" if position == 1 else "",
+                position,
+                format_clock(stop["arrive"]),
+                format_clock(stop["depart"]),
+                stop["name"],
+                stop["city"],
+                stop["priority"],
+                stop["status"],
+                f"{stop['drive']:.0f} min",
+                f"Waits {stop['begin'] - stop['arrive']:.0f} min for opening" if stop["begin"] > stop["arrive"] + 0.5 else ""
             ])
+        cities = " → ".join(dict.fromkeys(stop["city"] for stop in day["stops"]))
+        total = day["drive"] + day["visit"]
+        rows.append([
+            "", "", "", "", f"Day {day['number']} total", cities, "", "",
+            f"{day['drive']:.0f} min",
+            f"{len(day['stops'])} visits, {day['visit']:.0f} min visiting, {int(total) // 60}h {int(total) % 60}m total"
+        ])
+    for shop in plan["unscheduled"]:
+        rows.append(["Not scheduled", "", "", "", shop["name"], shop["city"], shop["priority"], "", "", shop["reason"]])
+    
+    visits = sum(len(day["stops"]) for day in plan["days"])
+    days = plan["days"][-1]["number"] if plan["days"] else 0
+    print(f"  🧭 {visits} visits over {days} days from {home}; {len(plan['unscheduled'])} not scheduled")
+    
+    sheet_name = "Route Suggestions"
+    
+    # Try to get existing worksheet or create new
+    try:
+        worksheet = open_worksheet(client, SPREADSHEET_ID, sheet_name)
+        print(f"Found existing worksheet: {sheet_name}")
+        worksheet.clear()
+    except WorksheetNotFound:
+        worksheet = spreadsheet.add_worksheet(
+            title=sheet_name,
+            rows=max(100, len(rows) + 1),
+            cols=len(headers)
+        )
+        remember_worksheet(client, SPREADSHEET_ID, worksheet)
+        print(f"Created new worksheet: {sheet_name}")
     
     # Update sheet
     try:
-        worksheet.append_row(headers)
-        if rows:
-            worksheet.append_rows(rows)
+        worksheet.append_rows([headers] + rows)
         
         # Format headers
-        worksheet.format('A1:H1', {
+        worksheet.format('A1:J1', {
             'textFormat': {'bold': True},
             'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9}
         })
@@ -340,23 +301,41 @@ def create_route_suggestions(client):
 
 def main():
     """Main execution"""
+    parser = argparse.ArgumentParser(description="Add routing estimates to the Itinerary and build route suggestions.")
+    parser.add_argument(
+        "--recompute",
+        action="store_true",
+        help="Refresh the routing columns even if they already exist on the Itinerary sheet.",
+    )
+    parser.add_argument("--home", default=DEFAULT_HOME, help='Trip home base: "City, ST", a shop name or "lat,lng".')
+    parser.add_argument("--days", type=int, help="Maximum trip length in days (default: as many as needed).")
+    parser.add_argument("--drive-budget", type=float, default=DRIVE_BUDGET_MINUTES, help="Driving minutes per day.")
+    parser.add_argument("--visit-minutes", type=float, default=VISIT_MINUTES, help="Minutes spent at each shop.")
+    parser.add_argument("--day-start", default=format_clock(DAY_START), help="Departure time, e.g. 09:00.")
+    parser.add_argument("--day-end", default=format_clock(DAY_END), help="Latest finish time, e.g. 18:00.")
+    parser.add_argument("--start-date", type=date.fromisoformat, help="Date of day 1, YYYY-MM-DD (default: today).")
+    args = parser.parse_args()
+
     print("🛣️  Route Optimizer for Market Research")
     print("=" * 50)
     
     try:
-        client = get_google_sheets_client()
+        client = get_sheets_client()
         
         print("\n1️⃣  Enhancing itinerary with routing information...")
-        enhance_itinerary_with_routing(client)
+        enhance_itinerary_with_routing(client, recompute=args.recompute)
         
         print("\n2️⃣  Creating route suggestions...")
-        create_route_suggestions(client)
+        create_route_suggestions(
+            client, args.home, args.days, args.drive_budget, args.visit_minutes,
+            parse_clock(args.day_start), parse_clock(args.day_end), args.start_date,
+        )
         
         print("\n✅ Route optimization complete!")
         print("\n📝 Next Steps:")
         print("1. Review the 'Route Suggestions' sheet")
         print("2. Use Google Maps to verify actual drive times")
-        print("3. Adjust visit order based on store hours and availability")
+        print("3. Confirm availability for each day's stops (hours come from the Opening Hours column)")
         print("4. Export to Google My Maps for mobile navigation")
         
     except Exception as e:
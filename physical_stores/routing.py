@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Visit-order solver for shop and city routes.
+
+Builds a vectorized haversine distance matrix from latitude/longitude and
+orders stops as an open path (start at the first stop, end anywhere):
+
+  * nearest-neighbour construction
+  * 2-opt and Or-opt local improvement
+  * exact Held-Karp dynamic programming for small segments
+
+A 500-stop list solves in well under a second, so routes can be re-planned
+interactively.
+
+Usage:
+    python3 routing.py                                # all Hit List shops with coordinates
+    python3 routing.py --city "San Francisco"         # one city's shops
+    python3 routing.py --status Research --status Shortlisted
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_MILES = 3958.8
+EXACT_SOLVER_MAX_STOPS = 10
+
+HIT_LIST_CSV = Path(__file__).parent / "data" / "hit_list.csv"
+
+
+def haversine_matrix(lats: Sequence[float], lngs: Sequence[float]) -> np.ndarray:
+    """Return the all-pairs great-circle distance matrix in miles."""
+    lat = np.radians(np.asarray(lats, dtype=float))
+    lng = np.radians(np.asarray(lngs, dtype=float))
+    dlat = lat[:, None] - lat[None, :]
+    dlng = lng[:, None] - lng[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def path_length(order: Sequence[int], dist: np.ndarray) -> float:
+    """Total length of an open path through ``order``."""
+    if len(order) < 2:
+        return 0.0
+    idx = np.asarray(order)
+    return float(dist[idx[:-1], idx[1:]].sum())
+
+
+def nearest_neighbor(dist: np.ndarray, start: int = 0) -> List[int]:
+    """Greedy construction: always drive to the closest unvisited stop."""
+    n = len(dist)
+    visited = np.zeros(n, dtype=bool)
+    order = [start]
+    visited[start] = True
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, dist[order[-1]])
+        nxt = int(np.argmin(row))
+        order.append(nxt)
+        visited[nxt] = True
+    return order
+
+
+def two_opt(order: List[int], dist: np.ndarray, max_passes: int = 50) -> List[int]:
+    """Reverse sub-paths while that shortens the route. The first stop stays fixed."""
+    tour = np.asarray(order)
+    n = len(tour)
+    if n < 4:
+        return list(tour)
+    for _ in range(max_passes):
+        improved = False
+        for i in range(1, n - 1):
+            a, b = tour[i - 1], tour[i]
+            js = np.arange(i + 1, n)
+            c = tour[js]
+            # Edge after j (absent when j is the last stop of an open path)
+            nxt = np.where(js + 1 < n, tour[np.minimum(js + 1, n - 1)], -1)
+            has_next = nxt >= 0
+            safe_next = np.where(has_next, nxt, 0)
+            delta = dist[a, c] - dist[a, b]
+            delta += np.where(has_next, dist[b, safe_next] - dist[c, safe_next], 0.0)
+            best = int(np.argmin(delta))
+            if delta[best] < -1e-9:
+                j = js[best]
+                tour[i:j + 1] = tour[i:j + 1][::-1]
+                improved = True
+        if not improved:
+            break
+    return list(tour)
+
+
+def or_opt(order: List[int], dist: np.ndarray, max_segment: int = 3, max_passes: int = 50) -> List[int]:
+    """Relocate short segments (optionally reversed) to their cheapest position. First stop stays fixed."""
+    tour = list(order)
+    n = len(tour)
+    if n < 4:
+        return tour
+    for _ in range(max_passes):
+        improved = False
+        for seg_len in range(1, max_segment + 1):
+            i = 1
+            while i + seg_len <= n:
+                seg = tour[i:i + seg_len]
+                rest = tour[:i] + tour[i + seg_len:]
+                prev = tour[i - 1]
+                nxt = tour[i + seg_len] if i + seg_len < n else None
+                removal_gain = dist[prev, seg[0]] - (dist[prev, nxt] if nxt is not None else 0.0)
+                if nxt is not None:
+                    removal_gain += dist[seg[-1], nxt]
+
+                rest_arr = np.asarray(rest)
+                a = rest_arr
+                b = np.append(rest_arr[1:], -1)
+                has_b = b >= 0
+                safe_b = np.where(has_b, b, 0)
+                best_cost, best_pos, best_rev = 0.0, -1, False
+                for reverse in (False, True):
+                    first, last = (seg[-1], seg[0]) if reverse else (seg[0], seg[-1])
+                    cost = dist[a, first] + np.where(has_b, dist[last, safe_b] - dist[a, safe_b], 0.0)
+                    pos = int(np.argmin(cost))
+                    if best_pos < 0 or cost[pos] < best_cost:
+                        best_cost, best_pos, best_rev = float(cost[pos]), pos, reverse
+                if best_cost < removal_gain - 1e-9:
+                    moved = seg[::-1] if best_rev else seg
+                    tour = rest[:best_pos + 1] + moved + rest[best_pos + 1:]
+                    improved = True
+                i += 1
+        if not improved:
+            break
+    return tour
+
+
+def held_karp(dist: np.ndarray, start: int = 0) -> List[int]:
+    """Exact shortest open path from ``start`` visiting every stop (O(2^n · n^2), small n only)."""
+    n = len(dist)
+    others = [k for k in range(n) if k != start]
+    m = len(others)
+    if m == 0:
+        return [start]
+    size = 1 << m
+    cost = np.full((size, m), np.inf)
+    parent = np.full((size, m), -1, dtype=int)
+    for j, node in enumerate(others):
+        cost[1 << j, j] = dist[start, node]
+    for mask in range(1, size):
+        for j in range(m):
+            if not (mask >> j) & 1 or cost[mask, j] == np.inf:
+                continue
+            for k in range(m):
+                if (mask >> k) & 1:
+                    continue
+                nxt_mask = mask | (1 << k)
+                candidate = cost[mask, j] + dist[others[j], others[k]]
+                if candidate < cost[nxt_mask, k]:
+                    cost[nxt_mask, k] = candidate
+                    parent[nxt_mask, k] = j
+    mask = size - 1
+    j = int(np.argmin(cost[mask]))
+    path = []
+    while j >= 0:
+        path.append(others[j])
+        prev = parent[mask, j]
+        mask &= ~(1 << j)
+        j = prev
+    return [start] + path[::-1]
+
+
+def solve_visit_order(
+    dist: np.ndarray,
+    start: int = 0,
+    exact_max_stops: int = EXACT_SOLVER_MAX_STOPS,
+) -> Tuple[List[int], float]:
+    """Return (visit order, total miles) for an open path starting at ``start``."""
+    n = len(dist)
+    if n == 0:
+        return [], 0.0
+    if n <= 3 or n <= exact_max_stops:
+        order = held_karp(dist, start) if n > 2 else [start] + [k for k in range(n) if k != start]
+        return order, path_length(order, dist)
+    order = nearest_neighbor(dist, start)
+    best = path_length(order, dist)
+    while True:
+        order = or_opt(two_opt(order, dist), dist)
+        length = path_length(order, dist)
+        if length >= best - 1e-9:
+            break
+        best = length
+    return order, best
+
+
+def plan_stops(
+    stops: Sequence[Dict],
+    start: Optional[int] = None,
+    exact_max_stops: int = EXACT_SOLVER_MAX_STOPS,
+) -> Tuple[List[Dict], float]:
+    """Order dicts with ``lat``/``lng`` keys. Starts at ``start`` or the westernmost stop."""
+    if not stops:
+        return [], 0.0
+    lats = [float(stop["lat"]) for stop in stops]
+    lngs = [float(stop["lng"]) for stop in stops]
+    dist = haversine_matrix(lats, lngs)
+    if start is None:
+        start = int(np.argmin(lngs))
+    order, total = solve_visit_order(dist, start, exact_max_stops)
+    return [stops[idx] for idx in order], total
+
+
+def group_centroids(rows: Sequence[Dict], key: str) -> Dict[str, Tuple[float, float]]:
+    """Mean lat/lng of rows grouped by ``key`` (e.g. City), skipping rows without coordinates."""
+    sums: Dict[str, List[float]] = {}
+    for row in rows:
+        try:
+            lat = float(row.get("Latitude") or row.get("lat") or "")
+            lng = float(row.get("Longitude") or row.get("lng") or "")
+        except (TypeError, ValueError):
+            continue
+        name = (row.get(key) or "").strip()
+        if not name:
+            continue
+        acc = sums.setdefault(name, [0.0, 0.0, 0])
+        acc[0] += lat
+        acc[1] += lng
+        acc[2] += 1
+    return {name: (acc[0] / acc[2], acc[1] / acc[2]) for name, acc in sums.items()}
+
+
+def load_hit_list_stops(path: Path = HIT_LIST_CSV) -> List[Dict]:
+    """Read Hit List rows that have coordinates from the local CSV snapshot."""
+    stops = []
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        for row in csv.DictReader(handle):
+            try:
+                row["lat"] = float(row.get("Latitude") or "")
+                row["lng"] = float(row.get("Longitude") or "")
+            except ValueError:
+                continue
+            stops.append(row)
+    return stops
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Order Hit List shops into a short driving route.")
+    parser.add_argument("--csv", type=Path, default=HIT_LIST_CSV, help="Hit List CSV (from pull_hit_list.py).")
+    parser.add_argument("--city", action="append", default=[], help="Only include shops in this city (repeatable).")
+    parser.add_argument("--status", action="append", default=[], help="Only include shops with this status (repeatable).")
+    parser.add_argument("--start", help="Shop name to start from (default: westernmost stop).")
+    args = parser.parse_args()
+
+    stops = load_hit_list_stops(args.csv)
+    if args.city:
+        cities = {city.lower() for city in args.city}
+        stops = [s for s in stops if s.get("City", "").strip().lower() in cities]
+    if args.status:
+        statuses = {status.lower() for status in args.status}
+        stops = [s for s in stops if s.get("Status", "").strip().lower() in statuses]
+    if not stops:
+        print("No shops with coordinates match the filters.")
+        return
+
+    start = None
+    if args.start:
+        names = [s.get("Shop Name", "").lower() for s in stops]
+        if args.start.lower() in names:
+            start = names.index(args.start.lower())
+
+    t0 = time.perf_counter()
+    ordered, total = plan_stops(stops, start)
+    elapsed = (time.perf_counter() - t0) * 1000
+
+    for position, stop in enumerate(ordered, start=1):
+        print(f"{position:>4}. {stop.get('Shop Name', '')} ({stop.get('City', '')}, {stop.get('State', '')})")
+    print(f"\n🛣️  {len(ordered)} stops, {total:.1f} miles straight-line; solved in {elapsed:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Revision-aware on-disk snapshot cache for worksheet values.
+
+Every physical_stores script reads the same Hit List / DApp Remarks tabs with
+``get_all_values()``. This module keeps the last download of each worksheet on
+disk, keyed by spreadsheet ID + worksheet title + the spreadsheet's Drive
+revision (``version`` / ``modifiedTime``). A read first asks Drive for the
+revision (one small metadata request, memoized per process) and only downloads
+the worksheet when the cached snapshot is older than that revision.
+
+Usage:
+    cache = get_snapshot_cache(client)
+    values = cache.get_all_values(SPREADSHEET_ID, "Hit List")
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from google_clients import open_worksheet
+
+DRIVE_FILES_URL = "https://www.googleapis.com/drive/v3/files"
+DEFAULT_CACHE_DIR = Path(os.environ.get("PHYSICAL_STORES_CACHE_DIR", Path(__file__).parent / ".cache")) / "sheets"
+
+# Set SHEET_SNAPSHOT_CACHE=0 to always download worksheets directly.
+CACHE_ENABLED = os.environ.get("SHEET_SNAPSHOT_CACHE", "1") != "0"
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", value).strip("_") or "sheet"
+
+
+class WorksheetSnapshotCache:
+    """Serve ``get_all_values()`` from disk while the spreadsheet revision is unchanged."""
+
+    def __init__(self, client, cache_dir: Path = DEFAULT_CACHE_DIR, enabled: bool = CACHE_ENABLED):
+        self.client = client
+        self.cache_dir = Path(cache_dir)
+        self.enabled = enabled
+        self._revisions: Dict[str, Optional[str]] = {}
+        self._memory: Dict[tuple, List[List[str]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.metadata_calls = 0
+
+    def revision(self, spreadsheet_id: str) -> Optional[str]:
+        """Return the Drive revision marker for a spreadsheet (memoized for this process)."""
+        if spreadsheet_id in self._revisions:
+            return self._revisions[spreadsheet_id]
+
+        revision = None
+        try:
+            response = self.client.request(
+                "get",
+                f"{DRIVE_FILES_URL}/{spreadsheet_id}",
+                params={"fields": "version,modifiedTime", "supportsAllDrives": True},
+            )
+            self.metadata_calls += 1
+            metadata = response.json()
+            revision = f"{metadata.get('version', '')}:{metadata.get('modifiedTime', '')}"
+        except Exception as exc:  # pylint: disable=broad-except
+            print(f"⚠️  Could not read Drive revision for {spreadsheet_id}; bypassing snapshot cache: {exc}")
+
+        self._revisions[spreadsheet_id] = revision
+        return revision
+
+    def _path(self, spreadsheet_id: str, worksheet_name: str) -> Path:
+        return self.cache_dir / f"{spreadsheet_id}__{_slug(worksheet_name)}.json"
+
+    def _load(self, spreadsheet_id: str, worksheet_name: str, revision: str) -> Optional[List[List[str]]]:
+        path = self._path(spreadsheet_id, worksheet_name)
+        if not path.exists():
+            return None
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if payload.get("revision") != revision or payload.get("worksheet") != worksheet_name:
+            return None
+        return payload.get("values")
+
+    def _store(self, spreadsheet_id: str, worksheet_name: str, revision: str, values: List[List[str]]) -> None:
+        path = self._path(spreadsheet_id, worksheet_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "spreadsheet_id": spreadsheet_id,
+            "worksheet": worksheet_name,
+            "revision": revision,
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+            "values": values,
+        }
+        tmp_path = path.with_suffix(".json.tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump(payload, handle, ensure_ascii=False)
+        tmp_path.replace(path)
+
+    def get_all_values(self, spreadsheet_id: str, worksheet_name: str, worksheet=None) -> List[List[str]]:
+        """Return worksheet values, downloading only when the cached revision is stale.
+
+        ``worksheet`` is an optional already-open handle; without it the worksheet is
+        opened only on a cache miss.
+        """
+        key = (spreadsheet_id, worksheet_name)
+        if key in self._memory:
+            self.hits += 1
+            return self._memory[key]
+
+        revision = self.revision(spreadsheet_id) if self.enabled else None
+        if revision:
+            values = self._load(spreadsheet_id, worksheet_name, revision)
+            if values is not None:
+                self.hits += 1
+                self._memory[key] = values
+                return values
+
+        self.misses += 1
+        if worksheet is None:
+            worksheet = open_worksheet(self.client, spreadsheet_id, worksheet_name)
+        values = worksheet.get_all_values()
+        if revision:
+            try:
+                self._store(spreadsheet_id, worksheet_name, revision, values)
+            except OSError as exc:
+                print(f"⚠️  Could not write snapshot cache for {worksheet_name}: {exc}")
+        self._memory[key] = values
+        return values
+
+    def invalidate(self, spreadsheet_id: str, worksheet_name: Optional[str] = None) -> None:
+        """Forget snapshots after this process writes to the spreadsheet."""
+        self._revisions.pop(spreadsheet_id, None)
+        for key in list(self._memory):
+            if key[0] == spreadsheet_id and (worksheet_name is None or key[1] == worksheet_name):
+                del self._memory[key]
+
+    def summary(self) -> str:
+        return (
+            f"snapshot cache: {self.hits} hit(s), {self.misses} download(s), "
+            f"{self.metadata_calls} revision check(s)"
+        )
+
+
+_CACHES: Dict[int, WorksheetSnapshotCache] = {}
+
+
+def get_snapshot_cache(client) -> WorksheetSnapshotCache:
+    """Return the process-wide snapshot cache for an authorized gspread client."""
+    cache = _CACHES.get(id(client))
+    if cache is None or cache.client is not client:
+        cache = WorksheetSnapshotCache(client)
+        _CACHES[id(client)] = cache
+    return cache
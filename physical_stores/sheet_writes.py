@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Buffered worksheet writes for the physical_stores scripts.
+
+Scripts that used to call ``update_cell`` once per field can instead stage
+every change on a ``SheetWriteBuffer`` and flush it as a single
+``values.batchUpdate`` request per worksheet.
+
+Usage:
+    buffer = SheetWriteBuffer(worksheet)
+    buffer.set(row, col, value)        # 1-indexed, like update_cell
+    buffer.flush()                     # one API call for everything staged
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+
+def column_letter(col: int) -> str:
+    """Return the A1 column letters for a 1-indexed column number (1 -> A, 27 -> AA)."""
+    if col < 1:
+        raise ValueError(f"Column number must be >= 1, got {col}")
+    letters = ""
+    while col:
+        col, remainder = divmod(col - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def a1_range(start_row: int, start_col: int, end_row: int, end_col: int) -> str:
+    """Return an A1 range such as ``B2:D9`` for 1-indexed row/column bounds."""
+    start = f"{column_letter(start_col)}{start_row}"
+    end = f"{column_letter(end_col)}{end_row}"
+    return start if start == end else f"{start}:{end}"
+
+
+class SheetWriteBuffer:
+    """Collect cell writes in memory and flush them in one batched request."""
+
+    def __init__(self, worksheet, value_input_option: str = "USER_ENTERED"):
+        self.worksheet = worksheet
+        self.value_input_option = value_input_option
+        self._cells: Dict[Tuple[int, int], Any] = {}
+        self.cell_writes = 0
+        self.api_calls = 0
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def set(self, row: int, col: int, value: Any) -> None:
+        """Stage a write to a 1-indexed cell. Later writes to the same cell win."""
+        self._cells[(row, col)] = "" if value is None else value
+        self.cell_writes += 1
+
+    def get(self, row: int, col: int, default: Any = None) -> Any:
+        """Return the staged value for a cell, or ``default`` if nothing is pending."""
+        return self._cells.get((row, col), default)
+
+    def build_ranges(self) -> List[Dict[str, Any]]:
+        """Group staged cells into contiguous per-row runs for ``batch_update``."""
+        by_row: Dict[int, Dict[int, Any]] = {}
+        for (row, col), value in self._cells.items():
+            by_row.setdefault(row, {})[col] = value
+
+        ranges: List[Dict[str, Any]] = []
+        for row in sorted(by_row):
+            cols = by_row[row]
+            run: List[int] = []
+            for col in sorted(cols):
+                if run and col != run[-1] + 1:
+                    ranges.append(self._range_for(row, run, cols))
+                    run = []
+                run.append(col)
+            if run:
+                ranges.append(self._range_for(row, run, cols))
+        return ranges
+
+    @staticmethod
+    def _range_for(row: int, run: List[int], cols: Dict[int, Any]) -> Dict[str, Any]:
+        return {
+            "range": a1_range(row, run[0], row, run[-1]),
+            "values": [[cols[col] for col in run]],
+        }
+
+    def flush(self) -> int:
+        """Send all staged writes in one request. Returns the number of cells written."""
+        if not self._cells:
+            return 0
+        ranges = self.build_ranges()
+        self.worksheet.batch_update(ranges, value_input_option=self.value_input_option)
+        self.api_calls += 1
+        written = len(self._cells)
+        self._cells.clear()
+        return written
+
+    @property
+    def api_calls_saved(self) -> int:
+        """API calls avoided compared with one ``update_cell`` per staged write."""
+        return max(self.cell_writes - self.api_calls, 0)
@@ -0,0 +1,625 @@
+#!/usr/bin/env python3
+"""
+Local, gspread-compatible stand-in for Google Sheets.
+
+Implements the subset of gspread's Client / Spreadsheet / Worksheet API the
+market-research scripts use (``get_all_values``, ``update``, ``update_cell``,
+``batch_update``, ``batch_get``, ``append_row(s)``, ``clear``, ``delete_rows``,
+``format``, structural ``Spreadsheet.batch_update`` ...) on top of SQLite, so
+Sheets-driven scripts can be run, benchmarked and regression-tested offline.
+
+Every emulated API request is counted with the bytes sent and received. A
+per-call latency can be injected (slept or only accounted), as can a
+requests-per-minute quota and random errors; both surface as gspread
+``APIError`` 429/503 responses, like the real service.
+
+Usage:
+    client = EmulatedClient(latency=0.2, quota_per_minute=60)
+    client.seed(SPREADSHEET_ID, {"Hit List": rows})
+    ...                                   # run code against client
+    print(client.stats.summary())
+
+    SHEETS_EMULATOR=/tmp/sheets.sqlite python3 process_dapp_remarks.py
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import sqlite3
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import gspread
+from gspread.utils import a1_range_to_grid_range
+
+Grid = List[List[str]]
+
+
+class _Response:
+    """Minimal requests.Response look-alike for gspread exceptions and client.request()."""
+
+    def __init__(self, status_code: int, payload: Dict):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = json.dumps(payload)
+
+    def json(self) -> Dict:
+        return self._payload
+
+
+def _api_error(code: int, status: str, message: str) -> gspread.exceptions.APIError:
+    return gspread.exceptions.APIError(
+        _Response(code, {"error": {"code": code, "message": message, "status": status}})
+    )
+
+
+def _cell(value: Any) -> str:
+    """Render a written value the way formatted reads return it."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _trim(grid: Grid) -> Grid:
+    """Drop trailing empty cells and rows, as the Sheets values API does."""
+    rows = []
+    for row in grid:
+        end = len(row)
+        while end and row[end - 1] == "":
+            end -= 1
+        rows.append(row[:end])
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+
+class EmulatorStats:
+    """Per-client request accounting."""
+
+    def __init__(self):
+        self.calls: Counter = Counter()
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.simulated_seconds = 0.0
+        self.errors: Counter = Counter()
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def reset(self) -> None:
+        self.__init__()
+
+    def as_dict(self) -> Dict:
+        return {
+            "total_calls": self.total_calls,
+            "calls": dict(self.calls),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "simulated_seconds": round(self.simulated_seconds, 3),
+            "errors": dict(self.errors),
+        }
+
+    def summary(self) -> str:
+        by_method = ", ".join(f"{name}={count}" for name, count in self.calls.most_common())
+        return (
+            f"sheets emulator: {self.total_calls} call(s) ({by_method or 'none'}), "
+            f"{self.bytes_sent} B sent, {self.bytes_received} B received, "
+            f"{self.simulated_seconds:.2f}s simulated latency"
+        )
+
+
+class EmulatedClient:
+    """Stands in for ``gspread.Client``; spreadsheets live in one SQLite database."""
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ":memory:",
+        latency: float = 0.0,
+        sleep: bool = False,
+        quota_per_minute: Optional[int] = None,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            path: SQLite file (or ":memory:") holding the spreadsheets.
+            latency: Seconds charged per API call.
+            sleep: Actually sleep for ``latency``; otherwise it is only added to the stats.
+            quota_per_minute: Raise 429 once more calls than this land in a 60s window.
+            error_rate: Probability that a call fails with a 503 backend error.
+            seed: Seed for ``error_rate``.
+        """
+        self.path = str(path)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS worksheets (
+                spreadsheet_id TEXT NOT NULL,
+                sheet_id INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                row_count INTEGER NOT NULL,
+                col_count INTEGER NOT NULL,
+                cells TEXT NOT NULL,
+                formats TEXT NOT NULL,
+                PRIMARY KEY (spreadsheet_id, sheet_id)
+            )
+            """
+        )
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS spreadsheets (
+                spreadsheet_id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                modified_at TEXT NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+        self.latency = latency
+        self.sleep = sleep
+        self.quota_per_minute = quota_per_minute
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.stats = EmulatorStats()
+        self._clock = 0.0  # virtual time, advanced by latency when not sleeping
+        self._window: deque = deque()
+
+    # -- request accounting -------------------------------------------------
+
+    def _now(self) -> float:
+        return time.monotonic() if self.sleep else self._clock
+
+    def _call(self, method: str, sent: Any = None, received: Any = None) -> None:
+        """Account one API round trip; raises APIError for injected quota/backend failures."""
+        now = self._now()
+        if self.quota_per_minute is not None:
+            while self._window and now - self._window[0] >= 60:
+                self._window.popleft()
+            if len(self._window) >= self.quota_per_minute:
+                self.stats.errors["quota"] += 1
+                raise _api_error(429, "RESOURCE_EXHAUSTED", "Quota exceeded for quota metric 'Requests per minute'")
+            self._window.append(now)
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.stats.errors["backend"] += 1
+            raise _api_error(503, "UNAVAILABLE", "The service is currently unavailable.")
+
+        self.stats.calls[method] += 1
+        if sent is not None:
+            self.stats.bytes_sent += len(json.dumps(sent, default=str))
+        if received is not None:
+            self.stats.bytes_received += len(json.dumps(received, default=str))
+        if self.latency:
+            self.stats.simulated_seconds += self.latency
+            if self.sleep:
+                time.sleep(self.latency)
+            else:
+                self._clock += self.latency
+
+    def advance(self, seconds: float) -> None:
+        """Move the virtual clock forward (e.g. to let a quota window expire)."""
+        self._clock += seconds
+
+    # -- storage ----------------------------------------------------------
+
+    def _touch(self, spreadsheet_id: str) -> None:
+        self.conn.execute(
+            "UPDATE spreadsheets SET version = version + 1, modified_at = ? WHERE spreadsheet_id = ?",
+            (datetime.now(timezone.utc).isoformat(), spreadsheet_id),
+        )
+        self.conn.commit()
+
+    def _sheet_rows(self, spreadsheet_id: str):
+        return self.conn.execute(
+            "SELECT sheet_id, title, row_count, col_count FROM worksheets WHERE spreadsheet_id = ? ORDER BY position",
+            (spreadsheet_id,),
+        ).fetchall()
+
+    def create(self, title: str, spreadsheet_id: Optional[str] = None) -> "EmulatedSpreadsheet":
+        """Create an empty spreadsheet with a single "Sheet1" worksheet."""
+        spreadsheet_id = spreadsheet_id or f"emu{self.random.getrandbits(64):016x}"
+        self.conn.execute(
+            "INSERT INTO spreadsheets (spreadsheet_id, title, version, modified_at) VALUES (?, ?, 1, ?)",
+            (spreadsheet_id, title, datetime.now(timezone.utc).isoformat()),
+        )
+        self.conn.commit()
+        spreadsheet = EmulatedSpreadsheet(self, spreadsheet_id)
+        spreadsheet._add_worksheet("Sheet1", 1000, 26)
+        return spreadsheet
+
+    def seed(
+        self,
+        spreadsheet_id: str,
+        worksheets: Dict[str, Grid],
+        title: Optional[str] = None,
+    ) -> "EmulatedSpreadsheet":
+        """Create (or replace) a spreadsheet with the given worksheet values, without counting calls."""
+        self.conn.execute("DELETE FROM worksheets WHERE spreadsheet_id = ?", (spreadsheet_id,))
+        self.conn.execute("DELETE FROM spreadsheets WHERE spreadsheet_id = ?", (spreadsheet_id,))
+        self.conn.execute(
+            "INSERT INTO spreadsheets (spreadsheet_id, title, version, modified_at) VALUES (?, ?, 1, ?)",
+            (spreadsheet_id, title or spreadsheet_id, datetime.now(timezone.utc).isoformat()),
+        )
+        spreadsheet = EmulatedSpreadsheet(self, spreadsheet_id)
+        for name, values in worksheets.items():
+            rows = max(len(values), 1000)
+            cols = max([len(row) for row in values] + [26])
+            worksheet = spreadsheet._add_worksheet(name, rows, cols)
+            worksheet._save([[_cell(v) for v in row] for row in values])
+        self.conn.commit()
+        return spreadsheet
+
+    # -- gspread.Client API -------------------------------------------------
+
+    def open_by_key(self, key: str) -> "EmulatedSpreadsheet":
+        row = self.conn.execute("SELECT 1 FROM spreadsheets WHERE spreadsheet_id = ?", (key,)).fetchone()
+        self._call("open_by_key", received={"spreadsheetId": key})
+        if row is None:
+            raise gspread.SpreadsheetNotFound(key)
+        return EmulatedSpreadsheet(self, key)
+
+    def open(self, title: str) -> "EmulatedSpreadsheet":
+        row = self.conn.execute("SELECT spreadsheet_id FROM spreadsheets WHERE title = ?", (title,)).fetchone()
+        self._call("open", received={"title": title})
+        if row is None:
+            raise gspread.SpreadsheetNotFound(title)
+        return EmulatedSpreadsheet(self, row[0])
+
+    def request(self, method: str, endpoint: str, params: Optional[Dict] = None, **kwargs) -> _Response:
+        """Answer the Drive ``files.get`` revision lookup used by sheet_cache."""
+        file_id = endpoint.rstrip("/").rsplit("/", 1)[-1]
+        row = self.conn.execute(
+            "SELECT version, modified_at FROM spreadsheets WHERE spreadsheet_id = ?", (file_id,)
+        ).fetchone()
+        if row is None:
+            self._call(f"request:{method}")
+            raise _api_error(404, "NOT_FOUND", f"File not found: {file_id}")
+        payload = {"version": str(row[0]), "modifiedTime": row[1]}
+        self._call(f"request:{method}", sent=params, received=payload)
+        return _Response(200, payload)
+
+
+class EmulatedSpreadsheet:
+    """Stands in for ``gspread.Spreadsheet``."""
+
+    def __init__(self, client: EmulatedClient, spreadsheet_id: str):
+        self.client = client
+        self.id = spreadsheet_id
+
+    @property
+    def title(self) -> str:
+        row = self.client.conn.execute(
+            "SELECT title FROM spreadsheets WHERE spreadsheet_id = ?", (self.id,)
+        ).fetchone()
+        return row[0] if row else ""
+
+    def _add_worksheet(self, title: str, rows: int, cols: int) -> "EmulatedWorksheet":
+        conn = self.client.conn
+        next_id, position = conn.execute(
+            "SELECT COALESCE(MAX(sheet_id), -1) + 1, COUNT(*) FROM worksheets WHERE spreadsheet_id = ?",
+            (self.id,),
+        ).fetchone()
+        conn.execute(
+            "INSERT INTO worksheets VALUES (?, ?, ?, ?, ?, ?, '[]', '{}')",
+            (self.id, next_id, title, position, rows, cols),
+        )
+        conn.commit()
+        return EmulatedWorksheet(self, next_id)
+
+    def worksheets(self) -> List["EmulatedWorksheet"]:
+        rows = self.client._sheet_rows(self.id)
+        self.client._call("worksheets", received=[list(row) for row in rows])
+        return [EmulatedWorksheet(self, row[0]) for row in rows]
+
+    def worksheet(self, title: str) -> "EmulatedWorksheet":
+        rows = self.client._sheet_rows(self.id)
+        self.client._call("worksheet", received=[list(row) for row in rows])
+        for sheet_id, sheet_title, _, _ in rows:
+            if sheet_title == title:
+                return EmulatedWorksheet(self, sheet_id)
+        raise gspread.WorksheetNotFound(title)
+
+    def add_worksheet(self, title: str, rows: int, cols: int, index: Optional[int] = None) -> "EmulatedWorksheet":
+        self.client._call("add_worksheet", sent={"title": title, "rows": rows, "cols": cols})
+        if any(row[1] == title for row in self.client._sheet_rows(self.id)):
+            raise _api_error(400, "INVALID_ARGUMENT", f'A sheet with the name "{title}" already exists.')
+        worksheet = self._add_worksheet(title, int(rows), int(cols))
+        self.client._touch(self.id)
+        return worksheet
+
+    def del_worksheet(self, worksheet: "EmulatedWorksheet") -> None:
+        self.client._call("del_worksheet", sent={"sheetId": worksheet.id})
+        self.client.conn.execute(
+            "DELETE FROM worksheets WHERE spreadsheet_id = ? AND sheet_id = ?", (self.id, worksheet.id)
+        )
+        self.client._touch(self.id)
+
+    def batch_update(self, body: Dict) -> Dict:
+        """Apply structural requests. Row insert/delete/append change the grid; formatting is recorded only."""
+        self.client._call("spreadsheet.batch_update", sent=body)
+        replies = []
+        for request in body.get("requests", []):
+            kind, spec = next(iter(request.items()))
+            if kind in ("insertDimension", "deleteDimension") and spec["range"].get("dimension") == "ROWS":
+                worksheet = EmulatedWorksheet(self, spec["range"]["sheetId"])
+                grid = worksheet._load()
+                start, end = spec["range"]["startIndex"], spec["range"]["endIndex"]
+                if kind == "insertDimension":
+                    grid[start:start] = [[] for _ in range(end - start)]
+                    worksheet._resize(rows=worksheet.row_count + end - start)
+                else:
+                    del grid[start:end]
+                    worksheet._resize(rows=max(1, worksheet.row_count - (end - start)))
+                worksheet._save(grid)
+            elif kind == "appendDimension":
+                worksheet = EmulatedWorksheet(self, spec["sheetId"])
+                if spec["dimension"] == "ROWS":
+                    worksheet._resize(rows=worksheet.row_count + spec["length"])
+                else:
+                    worksheet._resize(cols=worksheet.col_count + spec["length"])
+            elif "range" in spec and "sheetId" in spec.get("range", {}):
+                worksheet = EmulatedWorksheet(self, spec["range"]["sheetId"])
+                worksheet._record_format(kind, spec)
+            replies.append({})
+        self.client._touch(self.id)
+        return {"spreadsheetId": self.id, "replies": replies}
+
+
+class EmulatedWorksheet:
+    """Stands in for ``gspread.Worksheet``; cell values are stored as strings."""
+
+    def __init__(self, spreadsheet: EmulatedSpreadsheet, sheet_id: int):
+        self.spreadsheet = spreadsheet
+        self.client = spreadsheet.client
+        self.id = sheet_id
+
+    def __repr__(self) -> str:
+        return f"<EmulatedWorksheet {self.title!r} id:{self.id}>"
+
+    # -- storage ----------------------------------------------------------
+
+    def _meta(self):
+        row = self.client.conn.execute(
+            "SELECT title, row_count, col_count FROM worksheets WHERE spreadsheet_id = ? AND sheet_id = ?",
+            (self.spreadsheet.id, self.id),
+        ).fetchone()
+        if row is None:
+            raise gspread.WorksheetNotFound(str(self.id))
+        return row
+
+    @property
+    def title(self) -> str:
+        return self._meta()[0]
+
+    @property
+    def row_count(self) -> int:
+        return self._meta()[1]
+
+    @property
+    def col_count(self) -> int:
+        return self._meta()[2]
+
+    def _load(self) -> Grid:
+        row = self.client.conn.execute(
+            "SELECT cells FROM worksheets WHERE spreadsheet_id = ? AND sheet_id = ?",
+            (self.spreadsheet.id, self.id),
+        ).fetchone()
+        return json.loads(row[0]) if row else []
+
+    def _save(self, grid: Grid) -> None:
+        self.client.conn.execute(
+            "UPDATE worksheets SET cells = ? WHERE spreadsheet_id = ? AND sheet_id = ?",
+            (json.dumps(_trim(grid)), self.spreadsheet.id, self.id),
+        )
+        self.client._touch(self.spreadsheet.id)
+
+    def _resize(self, rows: Optional[int] = None, cols: Optional[int] = None) -> None:
+        _, row_count, col_count = self._meta()
+        self.client.conn.execute(
+            "UPDATE worksheets SET row_count = ?, col_count = ? WHERE spreadsheet_id = ? AND sheet_id = ?",
+            (rows or row_count, cols or col_count, self.spreadsheet.id, self.id),
+        )
+
+    def _record_format(self, kind: str, spec: Any) -> None:
+        row = self.client.conn.execute(
+            "SELECT formats FROM worksheets WHERE spreadsheet_id = ? AND sheet_id = ?",
+            (self.spreadsheet.id, self.id),
+        ).fetchone()
+        formats = json.loads(row[0]) if row else {}
+        formats.setdefault(kind, []).append(spec)
+        self.client.conn.execute(
+            "UPDATE worksheets SET formats = ? WHERE spreadsheet_id = ? AND sheet_id = ?",
+            (json.dumps(formats), self.spreadsheet.id, self.id),
+        )
+        self.client.conn.commit()
+
+    @property
+    def formats(self) -> Dict[str, List]:
+        row = self.client.conn.execute(
+            "SELECT formats FROM worksheets WHERE spreadsheet_id = ? AND sheet_id = ?",
+            (self.spreadsheet.id, self.id),
+        ).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def _bounds(self, range_name: str) -> Dict[str, int]:
+        if "!" in range_name:
+            range_name = range_name.rsplit("!", 1)[1]
+        grid_range = a1_range_to_grid_range(range_name)
+        grid_range.setdefault("startRowIndex", 0)
+        grid_range.setdefault("startColumnIndex", 0)
+        return grid_range
+
+    def _write(self, grid: Grid, start_row: int, start_col: int, values: Sequence[Sequence[Any]]) -> int:
+        """Write a block of values at 0-based (start_row, start_col); returns cells written."""
+        written = 0
+        for r, row_values in enumerate(values):
+            target = start_row + r
+            while len(grid) <= target:
+                grid.append([])
+            row = grid[target]
+            end = start_col + len(row_values)
+            if len(row) < end:
+                row.extend([""] * (end - len(row)))
+            for c, value in enumerate(row_values):
+                row[start_col + c] = _cell(value)
+                written += 1
+        needed_rows = start_row + len(values)
+        needed_cols = start_col + max((len(v) for v in values), default=0)
+        if needed_rows > self.row_count or needed_cols > self.col_count:
+            if needed_cols > self.col_count:
+                raise _api_error(400, "INVALID_ARGUMENT", f"Range exceeds grid limits. Max columns: {self.col_count}")
+            raise _api_error(400, "INVALID_ARGUMENT", f"Range exceeds grid limits. Max rows: {self.row_count}")
+        return written
+
+    def _read(self, grid_range: Dict[str, int], grid: Optional[Grid] = None) -> Grid:
+        grid = self._load() if grid is None else grid
+        rows = grid[grid_range["startRowIndex"]:grid_range.get("endRowIndex")]
+        start_col = grid_range["startColumnIndex"]
+        end_col = grid_range.get("endColumnIndex")
+        return _trim([row[start_col:end_col] for row in rows])
+
+    # -- gspread.Worksheet API ------------------------------------------------
+
+    def get_all_values(self, **kwargs) -> Grid:
+        rows = _trim(self._load())
+        width = max((len(row) for row in rows), default=0)
+        values = [row + [""] * (width - len(row)) for row in rows]
+        self.client._call("get_all_values", received=values)
+        return values
+
+    def get_values(self, range_name: Optional[str] = None, **kwargs) -> Grid:
+        values = self._read(self._bounds(range_name)) if range_name else _trim(self._load())
+        width = max((len(row) for row in values), default=0)
+        values = [row + [""] * (width - len(row)) for row in values]
+        self.client._call("get_values", received=values)
+        return values
+
+    def row_values(self, row: int, **kwargs) -> List[str]:
+        grid = self._load()
+        values = _trim([grid[row - 1]]) if row - 1 < len(grid) else []
+        values = values[0] if values else []
+        self.client._call("row_values", received=values)
+        return values
+
+    def col_values(self, col: int, **kwargs) -> List[str]:
+        grid = _trim(self._load())
+        values = [row[col - 1] if col - 1 < len(row) else "" for row in grid]
+        while values and values[-1] == "":
+            values.pop()
+        self.client._call("col_values", received=values)
+        return values
+
+    def batch_get(self, ranges: Sequence[str], **kwargs) -> List[Grid]:
+        grid = self._load()
+        results = [self._read(self._bounds(range_name), grid) for range_name in ranges]
+        self.client._call("batch_get", sent=list(ranges), received=results)
+        return results
+
+    def update(self, range_name: Any = None, values: Any = None, **kwargs) -> Dict:
+        """gspread 5 signature: ``update(range, values)``, ``update(values)`` or keyword arguments."""
+        if values is None and not isinstance(range_name, str):
+            range_name, values = "A1", range_name
+        if not isinstance(values, (list, tuple)):
+            values = [[values]]
+        elif values and not isinstance(values[0], (list, tuple)):
+            values = [values]
+        self.client._call("update", sent={"range": range_name, "values": values})
+        bounds = self._bounds(range_name or "A1")
+        grid = self._load()
+        written = self._write(grid, bounds["startRowIndex"], bounds["startColumnIndex"], values)
+        self._save(grid)
+        return {"updatedCells": written}
+
+    def update_cell(self, row: int, col: int, value: Any) -> Dict:
+        self.client._call("update_cell", sent={"row": row, "col": col, "value": value})
+        grid = self._load()
+        self._write(grid, row - 1, col - 1, [[value]])
+        self._save(grid)
+        return {"updatedCells": 1}
+
+    def batch_update(self, data: Sequence[Dict], **kwargs) -> Dict:
+        self.client._call("batch_update", sent=list(data))
+        grid = self._load()
+        written = 0
+        for entry in data:
+            bounds = self._bounds(entry["range"])
+            written += self._write(grid, bounds["startRowIndex"], bounds["startColumnIndex"], entry["values"])
+        self._save(grid)
+        return {"totalUpdatedCells": written}
+
+    def append_rows(self, values: Sequence[Sequence[Any]], **kwargs) -> Dict:
+        self.client._call("append_rows", sent=list(values))
+        grid = _trim(self._load())
+        start = len(grid)
+        if start + len(values) > self.row_count:
+            self._resize(rows=start + len(values))
+        width = max((len(row) for row in values), default=0)
+        if width > self.col_count:
+            self._resize(cols=width)
+        self._write(grid, start, 0, values)
+        self._save(grid)
+        return {"updates": {"updatedRows": len(values)}}
+
+    def append_row(self, values: Sequence[Any], **kwargs) -> Dict:
+        return self.append_rows([values], **kwargs)
+
+    def clear(self) -> Dict:
+        self.client._call("clear")
+        self._save([])
+        return {}
+
+    def delete_rows(self, start_index: int, end_index: Optional[int] = None) -> Dict:
+        end_index = end_index or start_index
+        self.client._call("delete_rows", sent={"start": start_index, "end": end_index})
+        grid = self._load()
+        del grid[start_index - 1:end_index]
+        self._resize(rows=max(1, self.row_count - (end_index - start_index + 1)))
+        self._save(grid)
+        return {}
+
+    def resize(self, rows: Optional[int] = None, cols: Optional[int] = None) -> Dict:
+        self.client._call("resize", sent={"rows": rows, "cols": cols})
+        grid = self._load()
+        if rows is not None:
+            del grid[rows:]
+        if cols is not None:
+            grid = [row[:cols] for row in grid]
+        self._resize(rows, cols)
+        self._save(grid)
+        return {}
+
+    def format(self, ranges: Union[str, Sequence[str]], format: Dict) -> Dict:
+        self.client._call("format", sent={"ranges": ranges, "format": format})
+        self._record_format("format", {"ranges": ranges, "format": format})
+        return {}
+
+    def columns_auto_resize(self, start_column_index: int, end_column_index: int) -> Dict:
+        self.client._call("columns_auto_resize", sent=[start_column_index, end_column_index])
+        return {}
+
+
+@contextmanager
+def emulate_gspread(client: EmulatedClient) -> Iterator[EmulatedClient]:
+    """Route ``gspread.authorize`` and service-account loading to ``client`` for scripts with their own auth code."""
+    from google.oauth2 import service_account
+
+    original_authorize = gspread.authorize
+    original_loader = service_account.Credentials.__dict__["from_service_account_file"]
+    gspread.authorize = lambda *args, **kwargs: client
+    service_account.Credentials.from_service_account_file = classmethod(lambda cls, *args, **kwargs: object())
+    try:
+        yield client
+    finally:
+        gspread.authorize = original_authorize
+        service_account.Credentials.from_service_account_file = original_loader
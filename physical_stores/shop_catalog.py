@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Lazily loaded shop catalog backed by data/shops.jsonl.
+
+The consolidated Hit List targets used to live as a ~700 line ``SHOPS``
+literal inside generate_shop_list.py, so anything that wanted the list
+(route_optimizer, ad-hoc analytics) had to import that module and, with it,
+gspread, the geocoding providers and the Google auth stack. The catalog is now
+one JSON object per line, read on first use with the standard library only and
+memoized per path. Lookups by name, city and status go through case-insensitive
+indexes built once at load time.
+
+Edit data/shops.jsonl to add or update shops; key order within a record is
+preserved, as is record order (partners first, then by region along the route).
+
+Usage:
+    catalog = load_catalog()
+    shop = catalog.by_name("Kiki's Cocoa")
+    for shop in catalog.in_city("Oakland"):
+        ...
+    active = catalog.with_status("Research", "Contacted")
+    shops = load_shops()  # plain list of dicts, same shape as the old SHOPS
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, TypedDict
+
+DEFAULT_CATALOG_PATH = Path(__file__).parent / "data" / "shops.jsonl"
+
+REQUIRED_FIELDS = ("name", "address", "city", "state", "type", "notes", "priority", "status")
+
+
+class Shop(TypedDict, total=False):
+    """One catalog record. The required fields are always present; the rest only when known."""
+
+    name: str
+    address: str
+    city: str
+    state: str
+    type: str
+    notes: str
+    priority: str
+    status: str
+    phone: str
+    website: str
+    email: str
+    instagram: str
+    outcome: str
+    contact_date: str
+    contact_method: str
+    sales_notes: str
+
+
+def _fold(value: str) -> str:
+    return " ".join(str(value or "").split()).casefold()
+
+
+class ShopCatalog:
+    """In-memory shop list with case-insensitive name, city and status indexes."""
+
+    def __init__(self, shops: List[Shop]):
+        self.shops = shops
+        self._by_name: Dict[str, Shop] = {}
+        self._by_city: Dict[str, List[Shop]] = {}
+        self._by_status: Dict[str, List[Shop]] = {}
+        for shop in shops:
+            # First record wins on duplicate names, matching a top-down scan of the list
+            self._by_name.setdefault(_fold(shop.get("name", "")), shop)
+            self._by_city.setdefault(_fold(shop.get("city", "")), []).append(shop)
+            self._by_status.setdefault(_fold(shop.get("status", "")), []).append(shop)
+
+    @classmethod
+    def from_jsonl(cls, path: Path = DEFAULT_CATALOG_PATH) -> "ShopCatalog":
+        """Parse a JSONL catalog, raising ValueError with the line number on a bad record."""
+        shops: List[Shop] = []
+        with open(path, encoding="utf-8") as handle:
+            for line_num, line in enumerate(handle, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{line_num}: invalid JSON ({e})") from e
+                missing = [field for field in REQUIRED_FIELDS if field not in record]
+                if missing:
+                    raise ValueError(f"{path}:{line_num}: missing {', '.join(missing)}")
+                shops.append(record)
+        return cls(shops)
+
+    def __len__(self) -> int:
+        return len(self.shops)
+
+    def __iter__(self) -> Iterator[Shop]:
+        return iter(self.shops)
+
+    def by_name(self, name: str) -> Optional[Shop]:
+        """Return the shop called ``name`` (case and whitespace insensitive), or None."""
+        return self._by_name.get(_fold(name))
+
+    def in_city(self, city: str) -> List[Shop]:
+        """Return every shop in ``city``, in catalog order."""
+        return list(self._by_city.get(_fold(city), ()))
+
+    def with_status(self, *statuses: str) -> List[Shop]:
+        """Return shops whose status is any of ``statuses``, in catalog order."""
+        wanted = {_fold(status) for status in statuses}
+        if len(wanted) == 1:
+            return list(self._by_status.get(next(iter(wanted)), ()))
+        return [shop for shop in self.shops if _fold(shop.get("status", "")) in wanted]
+
+    def cities(self) -> List[str]:
+        """Return the distinct cities in first-seen order."""
+        return [shops[0]["city"] for shops in self._by_city.values()]
+
+    def status_counts(self) -> Dict[str, int]:
+        return {shops[0].get("status", ""): len(shops) for shops in self._by_status.values()}
+
+
+_catalogs: Dict[str, ShopCatalog] = {}
+
+
+def load_catalog(path: Path = DEFAULT_CATALOG_PATH) -> ShopCatalog:
+    """Return the memoized catalog for ``path``, reading the file on first use."""
+    key = str(Path(path).resolve())
+    if key not in _catalogs:
+        _catalogs[key] = ShopCatalog.from_jsonl(path)
+    return _catalogs[key]
+
+
+def load_shops(path: Path = DEFAULT_CATALOG_PATH) -> List[Shop]:
+    """Return the catalog as a list of shop dicts (the shape ``SHOPS`` used to have)."""
+    return load_catalog(path).shops
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Fuzzy shop-name resolution over the Hit List snapshot.
+
+DApp submissions name shops by hand, so "Love of Ganesh" or "Annies Tea House"
+used to be skipped by the exact, lower-cased lookups in process_dapp_remarks.py
+and extract_remarks_data.py. ``ShopResolver`` indexes every Hit List row once:
+
+  * exact keys on the normalized name, and store keys built like
+    ``createStoreKey_`` in find_nearby_stores.gs (name, address, city, state)
+  * character-trigram postings over the normalized name
+  * address and city tokens, used to rank shops that share a name
+
+``resolve`` returns ranked candidates scored 0-1 (Dice similarity of the
+trigram sets, nudged by address overlap) and the best candidate when it clears
+the auto-apply confidence threshold and is clearly ahead of the runner-up.
+Queries only touch the rarer trigram postings of the name, so lookups stay
+well under a millisecond at 100k shops.
+
+Usage:
+    python3 shop_resolver.py "Love of Ganesh"
+    python3 shop_resolver.py "Spirit Stone Gems" --address "1210 W Main St" --city Quartzsite
+    python3 shop_resolver.py "x" --benchmark 2000 --synthetic 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import random
+import re
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+HIT_LIST_CSV = Path(__file__).parent / "data" / "hit_list.csv"
+
+AUTO_APPLY_THRESHOLD = 0.8  # minimum score to apply a fuzzy match without review
+AUTO_APPLY_MARGIN = 0.05  # ... and how far it must lead the runner-up
+ADDRESS_WEIGHT = 0.1  # score bonus for a full address/city token overlap
+CANDIDATE_POOL = 32  # shops re-scored exactly per query
+COMMON_GRAM_SHARE = 0.02  # trigrams in more than this share of shops are skipped ...
+MIN_QUERY_GRAMS = 4  # ... unless fewer than this many rarer ones remain
+
+STREET_ABBREVIATIONS = {
+    "street": "st", "avenue": "ave", "road": "rd", "boulevard": "blvd", "drive": "dr", "lane": "ln",
+    "court": "ct", "place": "pl", "parkway": "pkwy", "highway": "hwy", "suite": "ste",
+    "north": "n", "south": "s", "east": "e", "west": "w",
+}
+
+_WHITESPACE = re.compile(r"\s+")
+_NON_KEY_CHARS = re.compile(r"[^a-z0-9\-]")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_for_key(value: str) -> str:
+    """Same normalization as ``normalizeForKey_`` in find_nearby_stores.gs."""
+    if not value:
+        return ""
+    text = _WHITESPACE.sub("-", str(value).strip().lower())
+    return _NON_KEY_CHARS.sub("", text)
+
+
+def create_store_key(name: str, address: str = "", city: str = "", state: str = "") -> str:
+    """Deterministic store key, identical to ``createStoreKey_`` in find_nearby_stores.gs."""
+    parts = [normalize_for_key(part) for part in (name, address, city, state)]
+    return "__".join(part for part in parts if part)
+
+
+def normalize_name(value: str) -> str:
+    """Fold case, accents and punctuation: "The Annie's Café & Tea" -> "annies cafe and tea"."""
+    text = str(value or "")
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    text = text.lower().replace("&", " and ").replace("'", "")
+    words = _NON_ALNUM.sub(" ", text).split()
+    if len(words) > 1 and words[0] == "the":
+        words = words[1:]
+    return " ".join(words)
+
+
+def name_trigrams(normalized: str) -> Set[str]:
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def address_tokens(*parts: str) -> Set[str]:
+    tokens = set()
+    for part in parts:
+        for word in normalize_name(part).split():
+            tokens.add(STREET_ABBREVIATIONS.get(word, word))
+    return tokens
+
+
+class ShopResolver:
+    """Name/trigram/address index over Hit List rows."""
+
+    def __init__(self, shops: List[Dict]):
+        """``shops``: dicts with ``row_num``, ``name`` and optional ``address``/``city``/``state``."""
+        self.shops = shops
+        self._names: Dict[str, List[int]] = {}
+        self._grams: List[Set[str]] = []
+        # Store keys and address tokens are only needed for some queries; built on first use
+        self._store_keys: Optional[Dict[str, int]] = None
+        self._addresses: Dict[int, Set[str]] = {}
+        self._postings: Dict[str, List[int]] = {}
+        self._arrays: Dict[str, np.ndarray] = {}  # postings converted on first query
+        postings = self._postings
+        for idx, shop in enumerate(shops):
+            normalized = normalize_name(shop["name"])
+            self._names.setdefault(normalized, []).append(idx)
+            grams = name_trigrams(normalized)
+            self._grams.append(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(idx)
+        self._common = max(64, int(len(shops) * COMMON_GRAM_SHARE))
+
+    @classmethod
+    def from_values(cls, values: Sequence[Sequence[str]]) -> "ShopResolver":
+        """Build from ``get_all_values()`` output (header row first); row numbers are 1-indexed sheet rows."""
+        if not values:
+            return cls([])
+        headers = {header.strip(): idx for idx, header in enumerate(values[0])}
+        if "Shop Name" not in headers:
+            raise ValueError('Missing "Shop Name" column in Hit List worksheet.')
+
+        def cell(row: Sequence[str], header: str) -> str:
+            idx = headers.get(header)
+            return row[idx].strip() if idx is not None and idx < len(row) else ""
+
+        shops = []
+        for row_num, row in enumerate(values[1:], start=2):
+            name = cell(row, "Shop Name")
+            if name:
+                shops.append({
+                    "row_num": row_num,
+                    "name": name,
+                    "address": cell(row, "Address"),
+                    "city": cell(row, "City"),
+                    "state": cell(row, "State"),
+                })
+        return cls(shops)
+
+    @classmethod
+    def from_csv(cls, path: Path = HIT_LIST_CSV) -> "ShopResolver":
+        with open(path, newline="", encoding="utf-8-sig") as handle:
+            return cls.from_values(list(csv.reader(handle)))
+
+    def _candidate(self, idx: int, score: float, exact: bool) -> Dict:
+        shop = self.shops[idx]
+        return {
+            "row_num": shop["row_num"],
+            "name": shop["name"],
+            "address": shop.get("address", ""),
+            "city": shop.get("city", ""),
+            "score": round(min(score, 1.0), 3),
+            "exact": exact,
+        }
+
+    def _address_bonus(self, idx: int, query_tokens: Set[str]) -> float:
+        if not query_tokens:
+            return 0.0
+        tokens = self._addresses.get(idx)
+        if tokens is None:
+            shop = self.shops[idx]
+            tokens = self._addresses[idx] = address_tokens(shop.get("address", ""), shop.get("city", ""))
+        return ADDRESS_WEIGHT * len(query_tokens & tokens) / len(query_tokens)
+
+    def _posting_array(self, gram: str) -> np.ndarray:
+        rows = self._arrays.get(gram)
+        if rows is None:
+            rows = self._arrays[gram] = np.asarray(self._postings[gram], dtype=np.int32)
+        return rows
+
+    def _store_key_index(self) -> Dict[str, int]:
+        if self._store_keys is None:
+            self._store_keys = {
+                create_store_key(s["name"], s.get("address", ""), s.get("city", ""), s.get("state", "")): idx
+                for idx, s in enumerate(self.shops)
+            }
+        return self._store_keys
+
+    def candidates(self, name: str, address: str = "", city: str = "", state: str = "", limit: int = 5) -> List[Dict]:
+        """Ranked candidates for a submitted shop name (best first)."""
+        if not self.shops or not (name or "").strip():
+            return []
+        query_tokens = address_tokens(address, city)
+
+        # Exact store key (name + address), then exact normalized name
+        if address or city or state:
+            idx = self._store_key_index().get(create_store_key(name, address, city, state))
+            if idx is not None:
+                return [self._candidate(idx, 1.0, True)]
+        normalized = normalize_name(name)
+        exact = self._names.get(normalized, [])
+        if exact:
+            # Same name on several rows: address overlap decides, later rows win ties (as the old dict lookup did)
+            ranked = sorted(exact, key=lambda i: (self._address_bonus(i, query_tokens), i), reverse=True)
+            return [self._candidate(idx, 1.0, True) for idx in ranked[:limit]]
+
+        grams = name_trigrams(normalized)
+        lists = sorted((g for g in grams if g in self._postings), key=lambda g: len(self._postings[g]))
+        if not lists:
+            return []
+        selected = [g for g in lists if len(self._postings[g]) <= self._common]
+        if len(selected) < MIN_QUERY_GRAMS:
+            selected = lists[:max(MIN_QUERY_GRAMS, len(selected))]
+        counts = np.bincount(np.concatenate([self._posting_array(g) for g in selected]))
+        pool = min(CANDIDATE_POOL, int(np.count_nonzero(counts)))
+        top = np.argpartition(counts, -pool)[-pool:]
+
+        scored = []
+        for idx in top.tolist():
+            shop_grams = self._grams[idx]
+            dice = 2 * len(grams & shop_grams) / (len(grams) + len(shop_grams))
+            scored.append((dice + self._address_bonus(idx, query_tokens), idx))
+        scored.sort(reverse=True)
+        return [self._candidate(idx, score, False) for score, idx in scored[:limit]]
+
+    def resolve(
+        self,
+        name: str,
+        address: str = "",
+        city: str = "",
+        state: str = "",
+        threshold: float = AUTO_APPLY_THRESHOLD,
+    ) -> Tuple[Optional[Dict], List[Dict]]:
+        """Return (auto-applicable match or None, ranked candidates)."""
+        ranked = self.candidates(name, address, city, state)
+        if not ranked:
+            return None, ranked
+        best = ranked[0]
+        if best["exact"]:
+            return best, ranked
+        runner_up = ranked[1]["score"] if len(ranked) > 1 else 0.0
+        if best["score"] >= threshold and best["score"] - runner_up >= AUTO_APPLY_MARGIN:
+            return best, ranked
+        return None, ranked
+
+
+_resolver_cache: List = []  # [(values, resolver)] for the current snapshot
+
+
+def resolver_for(values: List[List[str]]) -> ShopResolver:
+    """Return a resolver for a Hit List snapshot, rebuilt only when the snapshot object changes."""
+    if _resolver_cache and _resolver_cache[0][0] is values:
+        return _resolver_cache[0][1]
+    resolver = ShopResolver.from_values(values)
+    _resolver_cache[:] = [(values, resolver)]
+    return resolver
+
+
+def _synthetic_shops(count: int, rng: random.Random) -> List[Dict]:
+    first = ["Golden", "Cosmic", "Sacred", "Green", "Lotus", "Crystal", "Moon", "Sun", "Wild", "Blue", "Harmony", "Sage"]
+    second = ["Leaf", "Temple", "Garden", "Spirit", "River", "Stone", "Path", "Heart", "Grove", "Light", "Mountain"]
+    kind = ["Tea House", "Gems", "Apothecary", "Cafe", "Books", "Market", "Chocolates", "Wellness", "Botanica"]
+    return [{
+        "row_num": i + 2,
+        "name": f"{rng.choice(first)} {rng.choice(second)} {rng.choice(kind)} {rng.randint(1, 9999)}",
+        "address": f"{rng.randint(1, 9999)} {rng.choice(['Main', 'Haight', 'Market', 'Ocean'])} St",
+        "city": rng.choice(["San Francisco", "Oakland", "Los Angeles", "Quartzsite"]),
+    } for i in range(count)]
+
+
+def _typo(name: str, rng: random.Random) -> str:
+    pos = rng.randrange(len(name))
+    return name[:pos] + name[pos + 1:] if rng.random() < 0.5 else name[:pos] + rng.choice("aeiou") + name[pos:]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Resolve a (possibly misspelled) shop name against the Hit List snapshot.")
+    parser.add_argument("name", help="Shop name as submitted.")
+    parser.add_argument("--address", default="")
+    parser.add_argument("--city", default="")
+    parser.add_argument("--state", default="")
+    parser.add_argument("--threshold", type=float, default=AUTO_APPLY_THRESHOLD, help="Auto-apply confidence (default: 0.8).")
+    parser.add_argument("--csv", type=Path, default=HIT_LIST_CSV, help="Hit List CSV (from pull_hit_list.py).")
+    parser.add_argument("--benchmark", type=int, default=0, metavar="N", help="Time N misspelled lookups and exit.")
+    parser.add_argument("--synthetic", type=int, default=0, metavar="COUNT", help="Benchmark against COUNT synthetic shops.")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    if args.synthetic:
+        resolver = ShopResolver(_synthetic_shops(args.synthetic, rng))
+    else:
+        resolver = ShopResolver.from_csv(args.csv)
+
+    if args.benchmark:
+        queries = [_typo(rng.choice(resolver.shops)["name"], rng) for _ in range(args.benchmark)]
+        t0 = time.perf_counter()
+        applied = sum(1 for query in queries if resolver.resolve(query, threshold=args.threshold)[0])
+        per_query = (time.perf_counter() - t0) / len(queries) * 1000
+        print(
+            f"{len(resolver.shops)} shops indexed; {per_query:.3f} ms per misspelled lookup; "
+            f"{applied}/{len(queries)} auto-applied at threshold {args.threshold}"
+        )
+        return
+
+    match, ranked = resolver.resolve(args.name, args.address, args.city, args.state, args.threshold)
+    print(json.dumps({"query": args.name, "match": match, "candidates": ranked}, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Regression tests for clustering.cluster_within_radius (run with ``python3 -m pytest``)."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from clustering import cluster_within_radius, project_miles
+
+
+def _assert_within_radius(lats, lngs, labels, radius_miles):
+    points = project_miles(lats, lngs)
+    for label in np.unique(labels):
+        members = points[labels == label]
+        spread = np.sqrt(((members - members.mean(axis=0)) ** 2).sum(axis=1))
+        assert spread.max() <= radius_miles
+
+
+def test_coincident_points_terminate():
+    # Shops sharing a city centroid are coincident points; this used to loop forever
+    lats = [37, 37, 37, 34, 33, 32]
+    lngs = [-122, -122, -122, -118, -112, -115]
+    labels = cluster_within_radius(lats, lngs, 20, [10, 10, 10, 1, 1, 1], max_weight=12)
+
+    assert len(labels) == 6
+    assert labels[0] == labels[1] == labels[2]
+    assert len(set(labels[3:].tolist()) | {labels[0]}) == 4
+    _assert_within_radius(lats, lngs, labels, 20)
+
+
+def test_all_points_coincident():
+    labels = cluster_within_radius([40.0] * 5, [-75.0] * 5, 10, [20] * 5, max_weight=12)
+    assert labels.tolist() == [0] * 5
+
+
+def test_max_weight_splits_distinct_points():
+    lats = [37.0, 37.05, 37.1, 37.15]
+    lngs = [-122.0, -122.0, -122.0, -122.0]
+    weights = [6, 6, 6, 6]
+    labels = cluster_within_radius(lats, lngs, 20, weights, max_weight=12)
+
+    mass = np.bincount(labels, weights)
+    assert mass.max() <= 12
+    _assert_within_radius(lats, lngs, labels, 20)
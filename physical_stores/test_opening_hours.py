@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""Regression tests for opening_hours.parse_hours (run with ``python3 -m pytest``)."""
+
+from __future__ import annotations
+
+import pytest
+
+from opening_hours import format_hours, parse_hours
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Open 9am-5pm weekdays", "Mon-Fri 09:00-17:00"),
+        ("Open 9am-5pm weekends", "Sat-Sun 09:00-17:00"),
+        ("M-F 9am-5pm", "Mon-Fri 09:00-17:00"),
+        ("Weekdays 8am-6pm, weekends 10am-4pm", "Mon-Fri 08:00-18:00; Sat-Sun 10:00-16:00"),
+        ("Open 10am-6pm, closed weekends", "Mon-Fri 10:00-18:00"),
+        ("Open 11am-7pm daily (closed Christmas)", "Mon-Sun 11:00-19:00"),
+        ("Mon-Sat 08:00-20:00; Sun 08:00-19:00", "Mon-Sat 08:00-20:00; Sun 08:00-19:00"),
+        ("Open 10am-6pm Mon-Fri, 11am-4pm Sat", "Mon-Fri 10:00-18:00; Sat 11:00-16:00"),
+        ("Open 9am-5pm Mon-Fri, Sat 10am-2pm", "Mon-Fri 09:00-17:00; Sat 10:00-14:00"),
+        ("Open 11am-7pm daily, Sat 10am-5pm", "Mon-Fri 11:00-19:00; Sat 10:00-17:00; Sun 11:00-19:00"),
+        ("Closed on Sundays and Mondays; open 10am-6pm", "Tue-Sat 10:00-18:00"),
+        ("Closed Mon, Tue & Wed. Open 12pm-8pm", "Thu-Sun 12:00-20:00"),
+    ],
+)
+def test_day_groups(text, expected):
+    assert format_hours(parse_hours(text)) == expected
+
+
+@pytest.mark.parametrize("text", ["Open 9am-5pm holidays", "Open 9am-5pm except Sundays"])
+def test_unknown_trailing_days_are_not_daily(text):
+    assert parse_hours(text) is None
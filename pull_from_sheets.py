@@ -5,7 +5,7 @@ This is the reverse of sync - Google Sheets becomes source of truth
 """
 
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from google.oauth2.service_account import Credentials
 import pandas as pd
 import sys
 
@@ -26,7 +26,7 @@ def pull_from_sheets():
     try:
         # Connect to Google Sheets
         print("\n📡 Connecting to Google Sheets...")
-        creds = ServiceAccountCredentials.from_json_keyfile_name(CREDS_FILE, SCOPE)
+        creds = Credentials.from_service_account_file(CREDS_FILE, scopes=SCOPE)
         client = gspread.authorize(creds)
         spreadsheet = client.open(SPREADSHEET_NAME)
         worksheet = spreadsheet.worksheet(WORKSHEET_NAME)